@@ -1,2 +1,10 @@
 from django.contrib import admin
-# Placeholder - will be implemented in later phases
\ No newline at end of file
+from .models import AttendanceEvent
+
+
+@admin.register(AttendanceEvent)
+class AttendanceEventAdmin(admin.ModelAdmin):
+    list_display = ['school', 'date', 'class_name', 'marked', 'absent', 'late', 'created_at']
+    list_filter = ['school', 'date']
+    list_select_related = ['school']
+    readonly_fields = [field.name for field in AttendanceEvent._meta.fields]
@@ -1,9 +1,15 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from . import api_views, async_views
 
 router = DefaultRouter()
 # Will add viewsets when implementing
 
 urlpatterns = [
     path('', include(router.urls)),
-]
\ No newline at end of file
+    path('classes/', api_views.ClassListView.as_view(), name='class_list'),
+    path('class/', api_views.ClassAttendanceView.as_view(), name='class_attendance'),
+    path('stats/', async_views.attendance_stats, name='attendance_stats'),
+    path('progress/', async_views.attendance_progress, name='attendance_progress'),
+    path('events/', async_views.attendance_events, name='attendance_events'),
+]
@@ -0,0 +1,100 @@
+import datetime
+
+from django.utils import timezone
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from schools.models import School
+from .services import AttendanceError, class_roster, mark_attendance, school_classes
+
+MARKING_ROLES = ['SUPER_ADMIN', 'SCHOOL_ADMIN', 'TEACHER']
+
+
+def parse_date(value):
+    if not value:
+        return timezone.localdate()
+    return datetime.date.fromisoformat(value)
+
+
+def requested_school(user, school_id):
+    """The user's school, or for super admins the school ``school_id``; None if there is none."""
+    if user.role != 'SUPER_ADMIN':
+        return user.school
+    try:
+        return School.objects.filter(id=int(school_id)).first()
+    except (TypeError, ValueError):
+        return None
+
+
+class ClassListView(APIView):
+    """The classes of the user's school (``?school=`` for super admins) with their sizes."""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        school = requested_school(request.user, request.query_params.get('school'))
+        if school is None:
+            return Response({'error': 'A valid school is required'}, status=400)
+        return Response({'school': school.id, 'classes': school_classes(school.id)})
+
+
+class ClassAttendanceView(APIView):
+    """
+    Attendance sheet for one class on one day.
+
+    GET returns the roster, with each student's roster thumbnail, primary
+    guardian and status (null when not yet marked). POST records the whole sheet in one request:
+    {"grade": ..., "class_name": ..., "date": "YYYY-MM-DD",
+     "records": {"<student id>": "PRESENT" | "ABSENT" | "LATE" | "EXCUSED"}}
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_school(self, data):
+        return requested_school(self.request.user, data.get('school'))
+
+    def get(self, request):
+        school = self.get_school(request.query_params)
+        if school is None:
+            return Response({'error': 'A valid school is required'}, status=400)
+        grade = request.query_params.get('grade')
+        class_name = request.query_params.get('class_name')
+        if not grade or not class_name:
+            return Response({'error': 'grade and class_name are required'}, status=400)
+        try:
+            date = parse_date(request.query_params.get('date'))
+        except ValueError:
+            return Response({'error': 'date must be YYYY-MM-DD'}, status=400)
+
+        return Response({
+            'school': school.id,
+            'grade': grade,
+            'class_name': class_name,
+            'date': date.isoformat(),
+            'students': class_roster(school, grade, class_name, date),
+        })
+
+    def post(self, request):
+        if request.user.role not in MARKING_ROLES:
+            return Response({'error': 'Permission denied'}, status=403)
+        school = self.get_school(request.data)
+        if school is None:
+            return Response({'error': 'A valid school is required'}, status=400)
+        try:
+            date = parse_date(request.data.get('date'))
+        except (TypeError, ValueError):
+            return Response({'error': 'date must be YYYY-MM-DD'}, status=400)
+        if date > timezone.localdate():
+            return Response({'error': 'Attendance cannot be marked for a future date'}, status=400)
+
+        raw = request.data.get('records')
+        if not isinstance(raw, dict) or not raw:
+            return Response({'error': 'records must map student ids to statuses'}, status=400)
+        try:
+            records = {int(student_id): status for student_id, status in raw.items()}
+            marked = mark_attendance(school, date, records)
+        except ValueError:
+            return Response({'error': 'student ids must be integers'}, status=400)
+        except AttendanceError as e:
+            return Response({'error': str(e)}, status=400)
+
+        return Response({'date': date.isoformat(), 'marked': marked})
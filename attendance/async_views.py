@@ -0,0 +1,236 @@
+"""
+Async endpoints for long-lived dashboards.
+
+These are plain Django async views rather than DRF views, so under the
+ASGI server (``SERVER_MODE=asgi``) a dashboard waiting on the event
+stream holds a coroutine, not a worker thread. Under WSGI they still
+work: the event stream then returns what was missed and closes, and the
+browser's EventSource reconnects after the ``retry`` interval.
+"""
+import asyncio
+import functools
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Count
+from django.http import HttpResponseNotAllowed, JsonResponse, StreamingHttpResponse
+
+from schools.statistics import school_statistics
+from students.models import AttendanceRecord
+from .api_views import MARKING_ROLES, parse_date
+from .events import close_connection, fetch_events, format_sse, get_broadcaster, latest_event_id
+from .services import school_classes
+
+ATTENDANCE_STREAM_KEEPALIVE_SECONDS = getattr(settings, 'ATTENDANCE_STREAM_KEEPALIVE_SECONDS', 15)
+# Streams end after this long and the browser reconnects with Last-Event-ID,
+# which also bounds how long a vanished client's stream can linger
+ATTENDANCE_STREAM_MAX_SECONDS = getattr(settings, 'ATTENDANCE_STREAM_MAX_SECONDS', 300)
+ATTENDANCE_STREAM_RETRY_MS = getattr(settings, 'ATTENDANCE_STREAM_RETRY_MS', 3000)
+# Reconnect delay when the stream cannot stay open (WSGI)
+ATTENDANCE_STREAM_WSGI_RETRY_MS = getattr(settings, 'ATTENDANCE_STREAM_WSGI_RETRY_MS', 30000)
+
+STREAM_ROLES = ['SUPER_ADMIN', 'SCHOOL_ADMIN']
+
+
+def require_get(view):
+    """require_GET for async views (Django 4.2's decorator is sync only)."""
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method != 'GET':
+            return HttpResponseNotAllowed(['GET'])
+        return await view(request, *args, **kwargs)
+    return wrapper
+
+
+def load_account(request):
+    """(role, school id) of the logged-in user, or None."""
+    user = request.user
+    if not user.is_authenticated:
+        return None
+    return user.role, user.school_id
+
+
+async def resolve_school(request, roles=None):
+    """
+    The school id a request may read, or an error JsonResponse. Super
+    admins pick the school with ``?school=``; everyone else gets their own.
+    """
+    account = await sync_to_async(load_account)(request)
+    if account is None:
+        return JsonResponse({'detail': 'Authentication credentials were not provided.'}, status=403)
+    role, school_id = account
+    if roles is not None and role not in roles:
+        return JsonResponse({'error': 'Permission denied'}, status=403)
+    if role == 'SUPER_ADMIN':
+        try:
+            school_id = int(request.GET.get('school', ''))
+        except ValueError:
+            school_id = None
+    if school_id is None:
+        return JsonResponse({'error': 'A valid school is required'}, status=400)
+    return school_id
+
+
+async def grouped_counts(queryset, *fields):
+    """{tuple of ``fields`` values: row count} from one GROUP BY query."""
+    rows = queryset.values(*fields).annotate(total=Count('id')).order_by()
+    return {tuple(row[f] for f in fields): row['total'] async for row in rows}
+
+
+@require_get
+async def attendance_stats(request):
+    """
+    Dashboard figures for a school: head counts and today's attendance
+    by status. GET /api/attendance/stats/?date=YYYY-MM-DD
+    """
+    school_id = await resolve_school(request)
+    if isinstance(school_id, JsonResponse):
+        return school_id
+    try:
+        date = parse_date(request.GET.get('date'))
+    except ValueError:
+        return JsonResponse({'error': 'date must be YYYY-MM-DD'}, status=400)
+
+    # Head counts come from the shared cache; the day's marks are always fresh
+    counts = await sync_to_async(school_statistics)(school_id)
+    statuses = await grouped_counts(
+        AttendanceRecord.objects.filter(student__school_id=school_id, student__is_active=True, date=date),
+        'status',
+    )
+    attendance = {value: statuses.get((value,), 0) for value, _ in AttendanceRecord.status_choices}
+    marked = sum(attendance.values())
+    return JsonResponse({
+        'school': school_id,
+        'date': date.isoformat(),
+        **counts,
+        'attendance': attendance,
+        'marked': marked,
+        'unmarked': max(counts['total_students'] - marked, 0),
+    })
+
+
+@require_get
+async def attendance_progress(request):
+    """
+    Marking progress of every class of a school on one day.
+    GET /api/attendance/progress/?date=YYYY-MM-DD
+    """
+    school_id = await resolve_school(request, MARKING_ROLES)
+    if isinstance(school_id, JsonResponse):
+        return school_id
+    try:
+        date = parse_date(request.GET.get('date'))
+    except ValueError:
+        return JsonResponse({'error': 'date must be YYYY-MM-DD'}, status=400)
+
+    school_class_list = await sync_to_async(school_classes)(school_id)
+    statuses = await grouped_counts(
+        AttendanceRecord.objects.filter(student__school_id=school_id, student__is_active=True, date=date),
+        'student__grade', 'student__class_name', 'status',
+    )
+    classes = {
+        (c['grade'], c['class_name']): dict(c, marked=0, absent=0, late=0) for c in school_class_list
+    }
+    for (grade, class_name, status), total in statuses.items():
+        progress = classes.get((grade, class_name))
+        if progress is None:
+            continue
+        progress['marked'] += total
+        if status in ('ABSENT', 'LATE'):
+            progress[status.lower()] += total
+
+    return JsonResponse({
+        'school': school_id,
+        'date': date.isoformat(),
+        'classes_marked': sum(1 for c in classes.values() if c['marked']),
+        'classes': list(classes.values()),
+    })
+
+
+def start_marker(event_id):
+    """
+    An id-only message: sets the browser's Last-Event-ID, so a first
+    connection resumes from here after a reconnect, without dispatching
+    an event.
+    """
+    return f'id: {event_id}\n\n'
+
+
+def last_event_id(request):
+    value = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id') or ''
+    return int(value) if value.isdigit() else 0
+
+
+async def live_events(school_id, after_id):
+    """
+    Missed events after ``after_id``, then new ones as they are published,
+    for at most ATTENDANCE_STREAM_MAX_SECONDS.
+    """
+    broadcaster = get_broadcaster()
+    queue = await broadcaster.subscribe(school_id)
+    try:
+        yield f'retry: {ATTENDANCE_STREAM_RETRY_MS}\n\n'
+        # Highest id sent, which the browser resumes from, and every id sent:
+        # a sheet that committed late arrives after higher ids
+        sent, delivered = after_id, set()
+        if after_id:
+            for event in await broadcaster.run_db(fetch_events, after_id, school_id):
+                yield format_sse(event)
+                sent = event['id']
+                delivered.add(sent)
+        else:
+            sent = await broadcaster.run_db(latest_event_id)
+            yield start_marker(sent)
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + ATTENDANCE_STREAM_MAX_SECONDS
+        while (remaining := deadline - loop.time()) > 0:
+            try:
+                event = await asyncio.wait_for(
+                    queue.get(), min(ATTENDANCE_STREAM_KEEPALIVE_SECONDS, remaining)
+                )
+            except asyncio.TimeoutError:
+                yield ': keepalive\n\n'
+                continue
+            # The backlog and the queue can overlap by a few events
+            if event['id'] not in delivered:
+                delivered.add(event['id'])
+                sent = max(sent, event['id'])
+                yield format_sse(event, stream_id=sent)
+    finally:
+        broadcaster.unsubscribe(school_id, queue)
+
+
+@require_get
+async def attendance_events(request):
+    """
+    Server-sent events for school admins: one ``class_marked`` message per
+    class sheet submitted, e.g. "Class 7A marked, 3 absent".
+    GET /api/attendance/events/ (text/event-stream)
+    """
+    school_id = await resolve_school(request, STREAM_ROLES)
+    if isinstance(school_id, JsonResponse):
+        return school_id
+    after_id = last_event_id(request)
+
+    if isinstance(request, ASGIRequest):
+        # The stream reads through the broadcaster's connection; give back
+        # the one used for the session and user lookups
+        await sync_to_async(close_connection)()
+        content = live_events(school_id, after_id)
+    else:
+        # A WSGI worker cannot be held open per dashboard: send what was
+        # missed and let the browser reconnect later
+        chunks = [f'retry: {ATTENDANCE_STREAM_WSGI_RETRY_MS}\n\n']
+        if after_id:
+            chunks += [format_sse(event) for event in await sync_to_async(fetch_events)(after_id, school_id)]
+        else:
+            chunks.append(start_marker(await sync_to_async(latest_event_id)()))
+        content = iter(chunks)
+
+    response = StreamingHttpResponse(content, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Keep nginx and similar proxies from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
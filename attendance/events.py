@@ -0,0 +1,221 @@
+"""
+Live attendance events for the dashboards.
+
+mark_attendance() writes one AttendanceEvent row per class it touches.
+Server-sent event streams do not query for those rows themselves: each
+server process runs one EventBroadcaster, which polls the table by
+primary key every ATTENDANCE_EVENT_POLL_SECONDS while anyone is
+listening and hands new rows to the open streams of their school. The
+database cost is one indexed query per process per interval however many
+dashboards are open, and events reach every worker process and host
+without a separate message broker.
+
+Ids are assigned when a row is inserted, not when its transaction
+commits, so during the morning peak a sheet can become visible after a
+later one with a higher id. The broadcaster therefore re-reads events for
+ATTENDANCE_EVENT_SETTLE_SECONDS after they were created and dispatches
+each id once. Only a transaction that takes longer than that to commit
+can still be missed. The same applies to a client that reconnects with
+Last-Event-ID while a lower-id sheet is still committing, and to the
+WSGI fallback, which reads strictly after the client's last id.
+"""
+import asyncio
+import datetime
+import json
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.utils import timezone
+
+from .models import AttendanceEvent
+
+ATTENDANCE_EVENT_POLL_SECONDS = getattr(settings, 'ATTENDANCE_EVENT_POLL_SECONDS', 2.0)
+ATTENDANCE_EVENT_RETENTION_DAYS = getattr(settings, 'ATTENDANCE_EVENT_RETENTION_DAYS', 2)
+# How long after creation an event is re-read in case a lower id commits late
+ATTENDANCE_EVENT_SETTLE_SECONDS = getattr(settings, 'ATTENDANCE_EVENT_SETTLE_SECONDS', 10)
+
+EVENT_FIELDS = ('id', 'school_id', 'date', 'grade', 'class_name', 'marked', 'absent', 'late', 'created_at')
+POLL_LIMIT = 500
+SUBSCRIBER_QUEUE_SIZE = 100
+
+_last_pruned = None
+
+
+def publish_class_marked(school_id, date, classes):
+    """
+    Record one event per class of a submitted sheet.
+
+    ``classes`` maps (grade, class_name) to the list of statuses submitted
+    for that class. Events older than the retention period are deleted at
+    most once a day per process.
+    """
+    global _last_pruned
+    AttendanceEvent.objects.bulk_create([
+        AttendanceEvent(
+            school_id=school_id, date=date, grade=grade, class_name=class_name,
+            marked=len(statuses), absent=statuses.count('ABSENT'), late=statuses.count('LATE'),
+        )
+        for (grade, class_name), statuses in sorted(classes.items())
+    ])
+    today = timezone.localdate()
+    if _last_pruned != today:
+        cutoff = timezone.now() - datetime.timedelta(days=ATTENDANCE_EVENT_RETENTION_DAYS)
+        AttendanceEvent.objects.filter(created_at__lt=cutoff).delete()
+        _last_pruned = today
+
+
+def fetch_events(after_id, school_id=None, limit=POLL_LIMIT):
+    """Events with an id above ``after_id``, oldest first, as dicts."""
+    queryset = AttendanceEvent.objects.filter(id__gt=after_id)
+    if school_id is not None:
+        queryset = queryset.filter(school_id=school_id)
+    return list(queryset.order_by('id').values(*EVENT_FIELDS)[:limit])
+
+
+def latest_event_id():
+    return AttendanceEvent.objects.order_by('-id').values_list('id', flat=True).first() or 0
+
+
+def settled_before():
+    """Events created before this are no longer re-read."""
+    return timezone.now() - datetime.timedelta(seconds=ATTENDANCE_EVENT_SETTLE_SECONDS)
+
+
+def event_cursor():
+    """
+    (id, recent ids) to start polling from: every event up to ``id`` has
+    settled, and the events above it that exist already are not new.
+    """
+    settled = AttendanceEvent.objects.filter(created_at__lt=settled_before())
+    last_id = settled.order_by('-id').values_list('id', flat=True).first() or 0
+    return last_id, set(AttendanceEvent.objects.filter(id__gt=last_id).values_list('id', flat=True))
+
+
+def close_connection():
+    # Looks the connection up in the calling thread; ``connection.close``
+    # passed as a callable would be bound to the thread that passed it
+    connection.close()
+
+
+def format_sse(event, stream_id=None):
+    """
+    One ``class_marked`` message in the text/event-stream format.
+    ``stream_id`` sets the browser's Last-Event-ID instead of the event's
+    own id, for events delivered after a higher one.
+    """
+    data = {
+        'id': event['id'],
+        'date': event['date'].isoformat(),
+        'grade': event['grade'],
+        'class_name': event['class_name'],
+        'marked': event['marked'],
+        'absent': event['absent'],
+        'late': event['late'],
+        'message': f"Class {event['class_name']} marked, {event['absent']} absent",
+    }
+    return f"id: {stream_id or event['id']}\nevent: class_marked\ndata: {json.dumps(data)}\n\n"
+
+
+class EventBroadcaster:
+    """
+    Fans AttendanceEvent rows out to the streams of one event loop.
+
+    The database is read from a single worker thread, so the broadcaster
+    holds one connection while it runs and none once the last stream
+    has closed.
+    """
+
+    def __init__(self, interval=ATTENDANCE_EVENT_POLL_SECONDS):
+        self.interval = interval
+        self.subscribers = {}
+        # Every event up to last_id has been dispatched; recent holds the
+        # dispatched ids above it, which are re-read until they settle
+        self.last_id = None
+        self.recent = set()
+        self.task = None
+        self.start_lock = asyncio.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='attendance-events')
+
+    async def run_db(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    async def subscribe(self, school_id):
+        """
+        A queue that receives the school's events from now on. Anything
+        committed before this returns can be read with fetch_events().
+        """
+        async with self.start_lock:
+            if self.last_id is None:
+                self.last_id, self.recent = await self.run_db(event_cursor)
+            queue = asyncio.Queue(SUBSCRIBER_QUEUE_SIZE)
+            self.subscribers.setdefault(school_id, set()).add(queue)
+            if self.task is None or self.task.done():
+                self.task = asyncio.get_running_loop().create_task(self.run())
+        return queue
+
+    def unsubscribe(self, school_id, queue):
+        queues = self.subscribers.get(school_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self.subscribers[school_id]
+
+    def poll(self, after_id):
+        """All events above ``after_id``, read POLL_LIMIT at a time."""
+        events = []
+        try:
+            while True:
+                page = fetch_events(after_id)
+                events += page
+                if len(page) < POLL_LIMIT:
+                    return events
+                after_id = page[-1]['id']
+        except DatabaseError:
+            # Reconnect on the next poll, e.g. after a database restart
+            connection.close()
+            return events
+
+    def dispatch(self, event):
+        for queue in self.subscribers.get(event['school_id'], ()):
+            if queue.full():
+                # A stalled client loses its oldest event, not everyone's
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    async def run(self):
+        try:
+            while self.subscribers:
+                events = await self.run_db(self.poll, self.last_id)
+                for event in events:
+                    if event['id'] not in self.recent:
+                        self.recent.add(event['id'])
+                        self.dispatch(event)
+                # Move past events that have settled, up to the first that
+                # has not; a lower id could still commit below that one
+                settled = settled_before()
+                for event in events:
+                    if event['created_at'] >= settled:
+                        break
+                    self.last_id = event['id']
+                self.recent = {event_id for event_id in self.recent if event_id > self.last_id}
+                await asyncio.sleep(self.interval)
+        finally:
+            # No await from the emptiness check to here, so a stream that
+            # subscribes meanwhile always sees a finished task and restarts it
+            self.executor.submit(close_connection)
+            self.last_id = None
+            self.recent = set()
+
+
+_broadcasters = weakref.WeakKeyDictionary()
+
+
+def get_broadcaster():
+    """The broadcaster of the running event loop (one per ASGI worker)."""
+    loop = asyncio.get_running_loop()
+    broadcaster = _broadcasters.get(loop)
+    if broadcaster is None:
+        broadcaster = _broadcasters[loop] = EventBroadcaster()
+    return broadcaster
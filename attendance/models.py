@@ -1,2 +1,25 @@
 from django.db import models
-# Placeholder - will be implemented in later phases
\ No newline at end of file
+from schools.models import School
+
+
+class AttendanceEvent(models.Model):
+    """
+    A class sheet having been marked, for live dashboards.
+
+    Rows are written by mark_attendance() and read by the event stream in
+    id order; they are only kept for a couple of days.
+    """
+    school = models.ForeignKey(School, on_delete=models.CASCADE, related_name='attendance_events')
+    date = models.DateField()
+    grade = models.CharField(max_length=10)
+    class_name = models.CharField(max_length=50)
+    marked = models.PositiveIntegerField(default=0)
+    absent = models.PositiveIntegerField(default=0)
+    late = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['id']
+
+    def __str__(self):
+        return f"{self.school_id} {self.class_name} {self.date}: {self.marked} marked, {self.absent} absent"
@@ -0,0 +1,179 @@
+"""
+Business logic for attendance marking and absence monitoring.
+"""
+import datetime
+
+from django.core.files.storage import default_storage
+from django.db.models import Count
+from django.utils import timezone
+
+from schools.cache import get_or_compute, school_namespace
+from students.models import AttendanceRecord, GuardianStudent, Student
+from .events import publish_class_marked
+
+
+def monitoring_window(period_days, as_of=None):
+    """Return the (start, end) dates of a rolling monitoring period ending on ``as_of``."""
+    end = as_of or timezone.localdate()
+    start = end - datetime.timedelta(days=max(period_days, 1) - 1)
+    return start, end
+
+
+def flagged_students(settings, as_of=None):
+    """
+    Students of a school with too many absences in the monitoring period.
+
+    Returns a dict mapping student id to absence count, computed with a
+    single grouped query.
+    """
+    return flagged_students_by_school([settings], as_of)[settings.school_id]
+
+
+def flagged_students_by_school(settings_list, as_of=None):
+    """
+    Flagged students for many schools at once.
+
+    Schools sharing the same monitoring period and threshold are answered by
+    one grouped query, so the query count depends on the number of distinct
+    configurations rather than the number of schools.
+
+    Returns a dict mapping school id to {student id: absence count}.
+    """
+    configs = {}
+    for settings in settings_list:
+        key = (settings.absence_monitoring_period, settings.absence_threshold_days)
+        configs.setdefault(key, []).append(settings.school_id)
+
+    flags = {settings.school_id: {} for settings in settings_list}
+    for (period, threshold), school_ids in configs.items():
+        start, end = monitoring_window(period, as_of)
+        rows = (
+            AttendanceRecord.objects
+            .filter(
+                student__school_id__in=school_ids,
+                student__is_active=True,
+                status='ABSENT',
+                date__range=(start, end),
+            )
+            .values('student_id', 'student__school_id')
+            .annotate(absences=Count('id'))
+            .filter(absences__gte=threshold)
+            .order_by()
+        )
+        for row in rows:
+            flags[row['student__school_id']][row['student_id']] = row['absences']
+    return flags
+
+
+class AttendanceError(Exception):
+    """Raised when submitted attendance cannot be recorded."""
+
+
+def school_classes(school_id):
+    """
+    The classes of a school with their number of active students, in
+    grade and class order. Cached per school.
+    """
+    def compute():
+        return [
+            {'grade': grade, 'class_name': class_name, 'students': total}
+            for grade, class_name, total in
+            Student.objects.filter(school_id=school_id, is_active=True)
+            .values('grade', 'class_name').annotate(total=Count('id'))
+            .order_by('grade', 'class_name').values_list('grade', 'class_name', 'total')
+        ]
+    return get_or_compute(school_namespace(school_id), 'classes', compute)
+
+
+def class_students(school_id, grade, class_name):
+    """
+    Active students of a class with their roster thumbnail and primary
+    guardian. One query served by the (school, grade, class_name, name)
+    index in its default order, plus one for the guardians. Cached per
+    school; guardian changes invalidate it too (students/signals.py).
+    """
+    def compute():
+        students = list(
+            Student.objects.filter(school_id=school_id, grade=grade, class_name=class_name, is_active=True)
+            .values('id', 'student_id', 'first_name', 'last_name', 'photo_thumbnail')
+        )
+        guardians = {}
+        for link in (
+            GuardianStudent.objects.filter(student_id__in=[s['id'] for s in students], is_primary=True)
+            .order_by('id')
+            .values('student_id', 'guardian_id', 'guardian__first_name', 'guardian__last_name',
+                    'guardian__relationship', 'guardian__phone_number')
+        ):
+            guardians.setdefault(link['student_id'], {
+                'id': link['guardian_id'],
+                'name': f"{link['guardian__first_name']} {link['guardian__last_name']}",
+                'relationship': link['guardian__relationship'],
+                'phone_number': link['guardian__phone_number'],
+            })
+        for student in students:
+            thumbnail = student.pop('photo_thumbnail')
+            student['photo_thumbnail'] = default_storage.url(thumbnail) if thumbnail else None
+            student['primary_guardian'] = guardians.get(student['id'])
+        return students
+    return get_or_compute(school_namespace(school_id), f'class-roster:{grade}:{class_name}', compute)
+
+
+def class_roster(school, grade, class_name, date):
+    """
+    Active students of a class with their attendance status on ``date``.
+
+    The student list comes from the cache; the day's records for those
+    students are always read fresh, in one query.
+    """
+    students = class_students(school.id, grade, class_name)
+    statuses = dict(
+        AttendanceRecord.objects.filter(student_id__in=[s['id'] for s in students], date=date)
+        .values_list('student_id', 'status')
+    )
+    return [dict(student, status=statuses.get(student['id'])) for student in students]
+
+
+def mark_attendance(school, date, records):
+    """
+    Record many students' attendance for one date.
+
+    ``records`` maps student id to status. Existing records for the date are
+    updated in place, so resubmitting a corrected sheet is safe. Uses one
+    validation query and one bulk upsert, then records a live event for
+    each class on the sheet.
+    """
+    valid_statuses = {value for value, _ in AttendanceRecord.status_choices}
+    # Statuses come from request JSON, so they may not even be hashable
+    invalid = sorted({
+        str(status) for status in records.values()
+        if not isinstance(status, str) or status not in valid_statuses
+    })
+    if invalid:
+        raise AttendanceError(f"Invalid status: {', '.join(invalid)}")
+
+    known = {
+        student_id: (grade, class_name)
+        for student_id, grade, class_name in
+        Student.objects.filter(school=school, is_active=True, id__in=list(records))
+        .values_list('id', 'grade', 'class_name')
+    }
+    unknown = sorted(set(records) - set(known))
+    if unknown:
+        raise AttendanceError(f"Students not in this school: {', '.join(map(str, unknown))}")
+
+    AttendanceRecord.objects.bulk_create(
+        [
+            AttendanceRecord(student_id=student_id, date=date, status=status)
+            for student_id, status in records.items()
+        ],
+        update_conflicts=True,
+        unique_fields=['student', 'date'],
+        update_fields=['status'],
+        batch_size=500,
+    )
+
+    classes = {}
+    for student_id, status in records.items():
+        classes.setdefault(known[student_id], []).append(status)
+    publish_class_marked(school.id, date, classes)
+    return len(records)
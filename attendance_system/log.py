@@ -0,0 +1,373 @@
+"""
+Structured logging kept off the request thread.
+
+A request thread's only logging work is to put the record on an in-memory
+queue. QueueListenerHandler starts a listener thread per process. That
+thread formats each record as one JSON line and writes it, so file I/O and
+JSON encoding never slow a request. If the queue is full, the record is
+dropped instead of blocking the request.
+
+RotatingSharedFileHandler is the file target. It rotates at LOG_MAX_BYTES or
+at LOG_ROTATE_WHEN, whichever comes first. Every worker process appends to
+the same file. A worker rotates only while holding a lock file, and every
+worker reopens the file once another has rotated it.
+
+RequestLogMiddleware gives each request an id (taken from ``X-Request-ID``
+when a proxy sets one) and writes one access record per request. The
+record carries the user's role and school code and the duration. Every
+record logged while the request runs carries the request id. Only the
+school's id is kept on the request; JsonFormatter looks up the code in
+the listener thread.
+InfoSamplingFilter keeps INFO records for a LOG_INFO_SAMPLE_RATE share of
+requests. It keeps or drops all of a request's records together. Warnings,
+errors, slow requests and background jobs are always logged.
+
+    LOGGING = {
+        ...
+        'handlers': {'file': {
+            'class': 'attendance_system.log.QueueListenerHandler',
+            'target': 'attendance_system.log.RotatingSharedFileHandler',
+            'filename': '/var/log/attendance/app.log',
+            'formatter': 'json',
+            'filters': ['request_context', 'sample_info'],
+        }},
+    }
+"""
+import atexit
+import contextvars
+import copy
+import datetime
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import re
+import time
+import traceback
+import uuid
+import zlib
+
+from django.utils.functional import empty
+from django.utils.module_loading import import_string
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows development machines
+    fcntl = None
+
+request_context = contextvars.ContextVar('log_request_context', default=None)
+
+# Record attributes set by the logging module itself; anything else on a
+# record came from ``extra=`` and is included in the JSON line
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+_CONTEXT_FIELDS = ('request_id', 'school_id', 'role')
+_REQUEST_ID = re.compile(r'^[A-Za-z0-9._-]{1,64}$')
+# Seconds the process keeps its copy of the school codes
+_SCHOOL_CODES_MAX_AGE = 60
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line; context and ``extra=`` fields become keys,
+    with the request's school id written as its ``school`` code.
+    """
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc)
+            .isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'pid': record.process,
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and value is not None:
+                entry[key] = value
+        if 'school_id' in entry:
+            entry['school'] = school_code(entry.pop('school_id'))
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc'] = record.exc_text
+        if record.stack_info:
+            entry['stack'] = record.stack_info
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class RequestContextFilter(logging.Filter):
+    """Stamps records with the request id, school id and role of the current request."""
+
+    def filter(self, record):
+        context = request_context.get()
+        for field in _CONTEXT_FIELDS:
+            if not hasattr(record, field):
+                setattr(record, field, context.get(field) if context else None)
+        return True
+
+
+class InfoSamplingFilter(logging.Filter):
+    """
+    Keeps INFO and lower records for ``rate`` of requests, chosen by request
+    id so a request's records are kept or dropped together. Records outside
+    a request and WARNING and above always pass.
+    """
+
+    def __init__(self, rate=1.0):
+        super().__init__()
+        self.threshold = int(max(0.0, min(1.0, float(rate))) * 0xFFFFFFFF)
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or self.threshold >= 0xFFFFFFFF:
+            return True
+        context = request_context.get()
+        if context is None:
+            return True
+        sampled = context.get('sampled')
+        if sampled is None:
+            sampled = context['sampled'] = zlib.crc32(context['request_id'].encode()) <= self.threshold
+        return sampled
+
+
+class QueueListenerHandler(logging.handlers.QueueHandler):
+    """
+    Puts records on a bounded queue for a listener thread that writes them
+    with ``target``, a handler class path built with the remaining keyword
+    arguments. The formatter set on this handler is used by the target, in
+    the listener thread.
+    """
+
+    def __init__(self, target, queue_size=10000, **target_kwargs):
+        super().__init__(queue.Queue(queue_size))
+        if isinstance(target, str):
+            target = import_string(target)
+        self.target = target(**target_kwargs)
+        self.dropped = 0
+        self.listener = None
+        self.start()
+        # Threads do not survive fork(); restart in the child (gunicorn --preload)
+        os.register_at_fork(after_in_child=self._restart_after_fork)
+        atexit.register(self.stop)
+
+    def start(self):
+        self.listener = logging.handlers.QueueListener(self.queue, self.target, respect_handler_level=True)
+        self.listener.start()
+
+    def stop(self):
+        listener, self.listener = self.listener, None
+        if listener is not None and listener._thread is not None:
+            # Writes out everything still queued before returning
+            listener.stop()
+
+    def _restart_after_fork(self):
+        self.queue = queue.Queue(self.queue.maxsize)
+        self.listener = None
+        self.start()
+
+    def setFormatter(self, fmt):
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record):
+        # Formatting happens in the listener; only fix the message now, since
+        # the arguments may change after this call returns
+        record = copy.copy(record)
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = ''.join(traceback.format_exception(*record.exc_info)).rstrip()
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        self.stop()
+        self.target.close()
+        super().close()
+
+
+class RotatingSharedFileHandler(logging.handlers.WatchedFileHandler):
+    """
+    Appends to ``filename`` and rotates it to ``filename.<timestamp>`` when
+    it reaches ``max_bytes`` or when the ``when`` period ends ('midnight',
+    'H' for hourly, or None for size only), keeping ``backup_count`` old files. Safe to
+    share between processes: rotation happens under an exclusive lock and
+    the other processes reopen the new file on their next write.
+    """
+
+    PERIODS = {'midnight': '%Y-%m-%d', 'H': '%Y-%m-%d_%H', None: None}
+
+    def __init__(self, filename, max_bytes=0, backup_count=7, when='midnight', encoding='utf-8'):
+        when = when or None
+        if when not in self.PERIODS:
+            raise ValueError(f"when must be one of {', '.join(map(str, self.PERIODS))}, not {when!r}")
+        directory = os.path.dirname(os.path.abspath(filename))
+        os.makedirs(directory, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.period_format = self.PERIODS[when]
+        self.lock_path = os.path.abspath(filename) + '.lock'
+        super().__init__(filename, encoding=encoding)
+        self.period = self._file_period()
+
+    def _current_period(self):
+        return time.strftime(self.period_format) if self.period_format else None
+
+    def _file_period(self):
+        if not self.period_format:
+            return None
+        try:
+            return time.strftime(self.period_format, time.localtime(os.stat(self.baseFilename).st_mtime))
+        except FileNotFoundError:
+            return self._current_period()
+
+    def _should_rotate(self):
+        if self.period_format and self._current_period() != self.period:
+            return True
+        if self.max_bytes and self.stream is not None:
+            return os.fstat(self.stream.fileno()).st_size >= self.max_bytes
+        return False
+
+    def emit(self, record):
+        try:
+            self.reopenIfNeeded()
+            if self._should_rotate():
+                self.rotate()
+        except Exception:
+            self.handleError(record)
+            return
+        # Already reopened above; skip WatchedFileHandler's second stat
+        logging.FileHandler.emit(self, record)
+
+    def rotate(self):
+        with open(self.lock_path, 'a') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                # Another process may have rotated while we waited
+                self.reopenIfNeeded()
+                if self._should_rotate() and os.path.getsize(self.baseFilename) > 0:
+                    os.rename(self.baseFilename, self._rotated_name())
+                    self._delete_old()
+                    self.reopenIfNeeded()
+                self.period = self._current_period()
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _rotated_name(self):
+        stamp = time.strftime(self.period_format or '%Y-%m-%d', time.localtime(os.stat(self.baseFilename).st_mtime))
+        name = f'{self.baseFilename}.{stamp}'
+        suffix = 1
+        while os.path.exists(name):
+            name = f'{self.baseFilename}.{stamp}.{suffix}'
+            suffix += 1
+        return name
+
+    def _delete_old(self):
+        if not self.backup_count:
+            return
+        directory, base = os.path.split(self.baseFilename)
+        rotated = [
+            os.path.join(directory, name) for name in os.listdir(directory)
+            if name.startswith(base + '.') and name != os.path.basename(self.lock_path)
+        ]
+        rotated.sort(key=os.path.getmtime)
+        for path in rotated[:-self.backup_count]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+_school_codes = {}
+_school_codes_loaded = None
+
+
+def school_code(school_id):
+    """
+    A school's code for log records, from a copy kept in process memory.
+    The copy is reloaded from the shared cache once it is older than
+    _SCHOOL_CODES_MAX_AGE, or when it lacks the school and is over a
+    second old.
+    """
+    global _school_codes, _school_codes_loaded
+    now = time.monotonic()
+    age = None if _school_codes_loaded is None else now - _school_codes_loaded
+    if age is None or age > _SCHOOL_CODES_MAX_AGE or (school_id not in _school_codes and age > 1):
+        from django.db import connection
+        from schools.cache import REFERENCE, get_or_compute
+        from schools.models import School
+
+        # Runs in the listener thread, which should not keep a connection open
+        had_connection = connection.connection is not None
+        try:
+            _school_codes = get_or_compute(
+                REFERENCE, 'school_codes', lambda: dict(School.objects.values_list('id', 'code'))
+            )
+        except Exception:
+            # Log lines still go out without a school code
+            pass
+        finally:
+            if not had_connection:
+                connection.close()
+        _school_codes_loaded = now
+    return _school_codes.get(school_id)
+
+
+def loaded_user(request):
+    """The request's user if something already loaded it, without a query of our own."""
+    user = getattr(request, 'user', None)
+    if user is None or getattr(user, '_wrapped', None) is empty:
+        return None
+    return user if user.is_authenticated else None
+
+
+class RequestLogMiddleware:
+    """
+    Assigns the request id, echoes it as ``X-Request-ID`` and logs one
+    access record per request on ``attendance_system.request``. Requests
+    slower than LOG_SLOW_REQUEST_MS are logged as warnings.
+    """
+
+    def __init__(self, get_response):
+        from django.conf import settings
+
+        self.get_response = get_response
+        self.slow_seconds = getattr(settings, 'LOG_SLOW_REQUEST_MS', 1000) / 1000
+        self.logger = logging.getLogger('attendance_system.request')
+
+    def __call__(self, request):
+        request_id = request.headers.get('X-Request-ID', '')
+        if not _REQUEST_ID.match(request_id):
+            request_id = uuid.uuid4().hex
+        context = {'request_id': request_id}
+        token = request_context.set(context)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+            duration = time.perf_counter() - started
+            user = loaded_user(request)
+            if user is not None:
+                context['role'] = user.role
+                context['school_id'] = user.school_id
+            level = logging.WARNING if duration >= self.slow_seconds else logging.INFO
+            if self.logger.isEnabledFor(level):
+                self.logger.log(
+                    level, '%s %s %s', request.method, request.path, response.status_code,
+                    extra={
+                        'method': request.method,
+                        'path': request.path,
+                        'status': response.status_code,
+                        'duration_ms': round(duration * 1000, 1),
+                    },
+                )
+        finally:
+            request_context.reset(token)
+        response['X-Request-ID'] = request_id
+        return response
@@ -6,6 +6,7 @@ Generated for Django 4.2.17 with environment-based configuration.
 
 from pathlib import Path
 import os
+import tempfile
 import dj_database_url
 from decouple import config, UndefinedValueError
 
@@ -60,9 +61,14 @@ INSTALLED_APPS = [
     'attendance.apps.AttendanceConfig',
     'visits.apps.VisitsConfig',
     'reports.apps.ReportsConfig',
+    'notifications.apps.NotificationsConfig',
+    'perf.apps.PerfConfig',
 ]
 
 MIDDLEWARE = [
+    'attendance_system.log.RequestLogMiddleware',
+    'perf.middleware.RequestMetricsMiddleware',
+    'perf.nplusone.DuplicateQueryMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
@@ -200,19 +206,54 @@ CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
 ]
 
-# Logging configuration
+# Logging configuration: request threads only enqueue records; a listener
+# thread per process writes them as JSON lines (see attendance_system/log.py)
+LOG_FILE = config('LOG_FILE', default=os.path.join(BASE_DIR, 'django.log'))
+LOG_MAX_BYTES = config('LOG_MAX_BYTES', default=50 * 1024 * 1024, cast=int)
+LOG_BACKUP_COUNT = config('LOG_BACKUP_COUNT', default=14, cast=int)
+LOG_ROTATE_WHEN = config('LOG_ROTATE_WHEN', default='midnight')
+# Share of requests whose INFO records are kept; warnings and errors always are
+LOG_INFO_SAMPLE_RATE = config('LOG_INFO_SAMPLE_RATE', default=1.0 if DEBUG else 0.1, cast=float)
+LOG_SLOW_REQUEST_MS = config('LOG_SLOW_REQUEST_MS', default=1000, cast=int)
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
+    'formatters': {
+        'json': {
+            '()': 'attendance_system.log.JsonFormatter',
+        },
+        'plain': {
+            'format': '%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s',
+        },
+    },
+    'filters': {
+        'request_context': {
+            '()': 'attendance_system.log.RequestContextFilter',
+        },
+        'sample_info': {
+            '()': 'attendance_system.log.InfoSamplingFilter',
+            'rate': LOG_INFO_SAMPLE_RATE,
+        },
+    },
     'handlers': {
         'file': {
             'level': 'INFO',
-            'class': 'logging.FileHandler',
-            'filename': os.path.join(BASE_DIR, 'django.log'),
+            'class': 'attendance_system.log.QueueListenerHandler',
+            'target': 'attendance_system.log.RotatingSharedFileHandler',
+            'filename': LOG_FILE,
+            'max_bytes': LOG_MAX_BYTES,
+            'backup_count': LOG_BACKUP_COUNT,
+            'when': LOG_ROTATE_WHEN,
+            'formatter': 'json',
+            'filters': ['request_context', 'sample_info'],
         },
         'console': {
             'level': 'INFO',
-            'class': 'logging.StreamHandler',
+            'class': 'attendance_system.log.QueueListenerHandler',
+            'target': 'logging.StreamHandler',
+            'formatter': 'plain' if DEBUG else 'json',
+            'filters': ['request_context', 'sample_info'],
         },
     },
     'loggers': {
@@ -229,13 +270,43 @@ LOGGING = {
     },
 }
 
-# Cache configuration
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'unique-snowflake',
+# Cache configuration: shared by all workers. CACHE_URL is redis://... in
+# production; by default a SQLite file shared by the processes on this host.
+CACHE_URL = config('CACHE_URL', default='')
+if CACHE_URL.startswith(('redis://', 'rediss://')):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_URL,
+            'KEY_PREFIX': 'attendance',
+        }
     }
-}
+elif CACHE_URL.startswith('locmem://'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'unique-snowflake',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'attendance_system.cache_backends.SQLiteCache',
+            'LOCATION': CACHE_URL.removeprefix('sqlite://') or os.path.join(
+                tempfile.gettempdir(), 'attendance-cache.sqlite3'
+            ),
+            'OPTIONS': {'MAX_ENTRIES': 100000},
+        }
+    }
+# Default lifetime of get_or_compute() entries (schools.cache)
+SCHOOL_CACHE_TIMEOUT = config('SCHOOL_CACHE_TIMEOUT', default=600, cast=int)
+# Lifetime of the super admin overview of all schools (schools.statistics)
+NETWORK_STATISTICS_TIMEOUT = config('NETWORK_STATISTICS_TIMEOUT', default=60, cast=int)
+
+# Term analytics (see reports/analytics.py): percentage of missed days at
+# which a student counts as chronically absent, and how long results are cached
+CHRONIC_ABSENCE_THRESHOLD = config('CHRONIC_ABSENCE_THRESHOLD', default=10, cast=float)
+ANALYTICS_CACHE_TIMEOUT = config('ANALYTICS_CACHE_TIMEOUT', default=300, cast=int)
 
 # Session configuration
 SESSION_ENGINE = 'django.contrib.sessions.backends.db'
@@ -246,6 +317,56 @@ SESSION_EXPIRE_AT_BROWSER_CLOSE = True
 FILE_UPLOAD_MAX_MEMORY_SIZE = 5242880  # 5MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 5242880  # 5MB
 
+# Uploaded photos are re-encoded in the background (see schools/images.py)
+IMAGE_FORMAT = config('IMAGE_FORMAT', default='WEBP')
+IMAGE_QUALITY = config('IMAGE_QUALITY', default=80, cast=int)
+IMAGE_WORKERS = config('IMAGE_WORKERS', default=1, cast=int)
+STUDENT_PHOTO_PROCESS_ON_SAVE = config('STUDENT_PHOTO_PROCESS_ON_SAVE', default=True, cast=bool)
+
+# Resumable visit photo uploads (see visits/uploads.py); part files must be on
+# a disk shared by all workers
+VISIT_UPLOAD_DIR = config('VISIT_UPLOAD_DIR', default=os.path.join(BASE_DIR, 'upload_parts'))
+VISIT_PHOTO_MAX_BYTES = config('VISIT_PHOTO_MAX_BYTES', default=25 * 1024 * 1024, cast=int)
+VISIT_UPLOAD_CHUNK_BYTES = config('VISIT_UPLOAD_CHUNK_BYTES', default=256 * 1024, cast=int)
+VISIT_UPLOAD_EXPIRY_HOURS = config('VISIT_UPLOAD_EXPIRY_HOURS', default=48, cast=int)
+
+# SMS gateway for guardian notifications
+SMS_GATEWAY = {
+    'BACKEND': config('SMS_GATEWAY_BACKEND', default='notifications.gateways.FileGateway'),
+    'OPTIONS': {
+        'path': config('SMS_OUTBOX_DIR', default=os.path.join(BASE_DIR, 'sms_outbox')),
+    } if not config('SMS_GATEWAY_URL', default='') else {
+        'url': config('SMS_GATEWAY_URL'),
+        'api_key': config('SMS_GATEWAY_API_KEY', default=''),
+    },
+}
+SMS_BATCH_SIZE = config('SMS_BATCH_SIZE', default=100, cast=int)
+SMS_CONCURRENCY = config('SMS_CONCURRENCY', default=4, cast=int)
+SMS_RATE_PER_SECOND = config('SMS_RATE_PER_SECOND', default=50, cast=int)
+SMS_MAX_RETRIES = config('SMS_MAX_RETRIES', default=3, cast=int)
+
+# Request metrics (Server-Timing header and /internal/metrics/ for Prometheus)
+PERF_METRICS_ENABLED = config('PERF_METRICS_ENABLED', default=True, cast=bool)
+PERF_METRICS_DIR = config('PERF_METRICS_DIR', default='')
+PERF_METRICS_TOKEN = config('PERF_METRICS_TOKEN', default='')
+PERF_METRICS_ALLOWED_IPS = [
+    ip.strip() for ip in config('PERF_METRICS_ALLOWED_IPS', default='127.0.0.1,::1').split(',') if ip.strip()
+]
+# Proxies in front of the app (e.g. nginx's network), so the allow list sees
+# the scraper's address instead of the proxy's; empty trusts no forwarded header
+PERF_METRICS_TRUSTED_PROXIES = [
+    ip.strip() for ip in config('PERF_METRICS_TRUSTED_PROXIES', default='').split(',') if ip.strip()
+]
+
+# N+1 detection: 'off', 'log' (staging) or 'raise' (development/tests)
+PERF_NPLUSONE_MODE = config('PERF_NPLUSONE_MODE', default='log' if DEBUG else 'off')
+PERF_NPLUSONE_THRESHOLD = config('PERF_NPLUSONE_THRESHOLD', default=5, cast=int)
+
+# Live attendance events (/api/attendance/events/; streams stay open with SERVER_MODE=asgi)
+ATTENDANCE_EVENT_POLL_SECONDS = config('ATTENDANCE_EVENT_POLL_SECONDS', default=2.0, cast=float)
+ATTENDANCE_EVENT_SETTLE_SECONDS = config('ATTENDANCE_EVENT_SETTLE_SECONDS', default=10, cast=int)
+ATTENDANCE_STREAM_MAX_SECONDS = config('ATTENDANCE_STREAM_MAX_SECONDS', default=300, cast=int)
+
 # Custom user model (to be created)
 AUTH_USER_MODEL = 'schools.User'
 
@@ -18,6 +18,7 @@ urlpatterns = [
     path('attendance/', include('attendance.urls')),
     path('visits/', include('visits.urls')),
     path('reports/', include('reports.urls')),
+    path('internal/', include('perf.urls')),
     
     # API URLs
     path('api/', include('schools.api_urls')),
@@ -40,6 +40,6 @@ else:
     print('Superuser already exists')
 "
 
-# Load sample data fixtures
+# Load sample data fixtures (skipped when the fixture files are unchanged)
 echo "Loading sample data fixtures..."
-python manage.py loaddata fixtures/*.json || echo "Fixtures already loaded or not found"
\ No newline at end of file
+python manage.py load_fixture_set fixtures/*.json || echo "Warning: Fixture loading failed"
\ No newline at end of file
@@ -11,30 +11,9 @@ if [ ! -f "manage.py" ]; then
     exit 1
 fi
 
-# Load fixtures in correct order to handle dependencies
-echo "Loading schools..."
-python manage.py loaddata fixtures/01_schools.json
-
-echo "Loading zones..."
-python manage.py loaddata fixtures/02_zones.json
-
-echo "Loading users..."
-python manage.py loaddata fixtures/03_users.json
-
-echo "Loading school settings..."
-python manage.py loaddata fixtures/04_school_settings.json
-
-echo "Loading guardians..."
-python manage.py loaddata fixtures/05_guardians.json
-
-echo "Loading students..."
-python manage.py loaddata fixtures/06_students.json
-
-echo "Loading guardian-student relationships..."
-python manage.py loaddata fixtures/07_guardian_students.json
-
-echo "Loading zone assignments..."
-python manage.py loaddata fixtures/08_zone_assignments.json
+# Load all fixtures in one process; models are ordered by their dependencies
+# and an unchanged fixture set is skipped (pass --force to reload it)
+python manage.py load_fixture_set fixtures/*.json "$@" || exit 1
 
 echo ""
 echo "✅ Sample data fixtures loaded successfully!"
@@ -0,0 +1,29 @@
+"""
+Gunicorn configuration, shared by the Docker image and Render.
+
+SERVER_MODE=wsgi (the default) runs sync workers on the WSGI application.
+SERVER_MODE=asgi runs uvicorn workers on the ASGI application: the async
+dashboard endpoints and the live attendance event stream then wait on the
+event loop instead of holding a worker, so a few processes can keep
+thousands of dashboards open.
+"""
+# Not ``from decouple import config``: gunicorn reads every module-level name
+# as a setting, and ``config`` is one
+import decouple
+
+SERVER_MODES = {
+    'wsgi': ('attendance_system.wsgi:application', 'sync'),
+    'asgi': ('attendance_system.asgi:application', 'uvicorn_worker.UvicornWorker'),
+}
+
+SERVER_MODE = decouple.config('SERVER_MODE', default='wsgi')
+if SERVER_MODE not in SERVER_MODES:
+    raise ValueError(f"SERVER_MODE must be one of {', '.join(SERVER_MODES)}, not {SERVER_MODE!r}")
+
+wsgi_app, worker_class = SERVER_MODES[SERVER_MODE]
+workers = decouple.config('WEB_CONCURRENCY', default=4, cast=int)
+timeout = 120
+# Event streams close themselves after a few minutes; don't wait that long on shutdown
+graceful_timeout = 30
+max_requests = 1000
+max_requests_jitter = 100
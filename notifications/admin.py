@@ -0,0 +1,19 @@
+from django.contrib import admin
+from .models import SmsMessage
+
+
+@admin.register(SmsMessage)
+class SmsMessageAdmin(admin.ModelAdmin):
+    list_display = ['phone_number', 'school', 'kind', 'event_date', 'status', 'attempts', 'sent_at']
+    list_filter = ['status', 'kind', 'school', 'event_date']
+    search_fields = ['phone_number']
+    raw_id_fields = ['guardian']
+    list_select_related = ['school']
+
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        if request.user.role == 'SUPER_ADMIN':
+            return qs
+        if request.user.school:
+            return qs.filter(school=request.user.school)
+        return qs.none()
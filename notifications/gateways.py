@@ -0,0 +1,125 @@
+"""
+Pluggable SMS gateways.
+
+The active gateway is configured with ``SMS_GATEWAY``::
+
+    SMS_GATEWAY = {
+        'BACKEND': 'notifications.gateways.FileGateway',
+        'OPTIONS': {'path': '/var/spool/sms'},
+    }
+
+Gateways receive a batch of messages and return one SendResult per
+message, in order. Failures marked ``retryable`` are retried with backoff.
+"""
+import json
+import os
+import threading
+import urllib.error
+import urllib.request
+import uuid
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+
+@dataclass
+class OutboundSms:
+    id: int
+    to: str
+    body: str
+
+
+@dataclass
+class SendResult:
+    ok: bool
+    provider_message_id: str = ''
+    error: str = ''
+    retryable: bool = False
+
+
+class BaseGateway:
+    def __init__(self, **options):
+        self.options = options
+
+    def send_batch(self, messages):
+        raise NotImplementedError
+
+
+class FileGateway(BaseGateway):
+    """
+    Offline gateway that appends each message as a JSON line to a daily file.
+    """
+
+    def __init__(self, path=None, **options):
+        super().__init__(**options)
+        self.path = path or os.path.join(settings.BASE_DIR, 'sms_outbox')
+        self._lock = threading.Lock()
+
+    def send_batch(self, messages):
+        os.makedirs(self.path, exist_ok=True)
+        filename = os.path.join(self.path, f'{timezone.localdate():%Y-%m-%d}.jsonl')
+        results, lines = [], []
+        for message in messages:
+            provider_id = uuid.uuid4().hex
+            lines.append(json.dumps({
+                'id': provider_id,
+                'message': message.id,
+                'to': message.to,
+                'body': message.body,
+            }))
+            results.append(SendResult(ok=True, provider_message_id=provider_id))
+        with self._lock, open(filename, 'a', encoding='utf-8') as outbox:
+            outbox.write('\n'.join(lines) + '\n')
+        return results
+
+
+class HttpGateway(BaseGateway):
+    """
+    Posts a batch as JSON to an HTTP endpoint (a provider or a local stub).
+
+    The endpoint receives ``{"messages": [{"to": ..., "body": ...}]}`` and
+    must answer with ``{"results": [{"ok": true, "id": "..."}]}`` in order.
+    Connection errors and 429/5xx responses are treated as retryable.
+    """
+
+    def __init__(self, url, api_key='', timeout=10, **options):
+        super().__init__(**options)
+        self.url = url
+        self.api_key = api_key
+        self.timeout = timeout
+
+    def send_batch(self, messages):
+        payload = json.dumps({
+            'messages': [{'to': m.to, 'body': m.body, 'reference': m.id} for m in messages],
+        }).encode('utf-8')
+        request = urllib.request.Request(self.url, data=payload, method='POST')
+        request.add_header('Content-Type', 'application/json')
+        if self.api_key:
+            request.add_header('Authorization', f'Bearer {self.api_key}')
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                body = json.loads(response.read().decode('utf-8'))
+        except urllib.error.HTTPError as exc:
+            retryable = exc.code == 429 or exc.code >= 500
+            return [SendResult(ok=False, error=f'HTTP {exc.code}', retryable=retryable) for _ in messages]
+        except (urllib.error.URLError, TimeoutError, ValueError) as exc:
+            return [SendResult(ok=False, error=str(exc), retryable=True) for _ in messages]
+
+        results = body.get('results', [])
+        return [
+            SendResult(
+                ok=bool(item.get('ok')),
+                provider_message_id=str(item.get('id', '')),
+                error=item.get('error', ''),
+                retryable=bool(item.get('retryable', False)),
+            )
+            for item in results
+        ] + [SendResult(ok=False, error='No result from gateway', retryable=True)] * (len(messages) - len(results))
+
+
+def get_gateway():
+    config = getattr(settings, 'SMS_GATEWAY', {})
+    backend = import_string(config.get('BACKEND', 'notifications.gateways.FileGateway'))
+    return backend(**config.get('OPTIONS', {}))
@@ -0,0 +1,40 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from notifications.sms import notify_absences
+from schools.models import School
+
+
+class Command(BaseCommand):
+    help = "Send one SMS per guardian for the day's absences (schools with parent SMS enabled)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--school', action='append', dest='schools', metavar='CODE',
+                            help='Only notify the given school code (repeatable)')
+        parser.add_argument('--date', help='Absence date as YYYY-MM-DD (default: today)')
+        parser.add_argument('--retry-failed', action='store_true',
+                            help='Also resend messages that failed in an earlier run')
+
+    def handle(self, *args, **options):
+        date = None
+        if options['date']:
+            try:
+                date = datetime.date.fromisoformat(options['date'])
+            except ValueError:
+                raise CommandError('--date must be in YYYY-MM-DD format')
+
+        schools = School.objects.filter(
+            is_active=True, settings__notify_parents_sms=True
+        ).select_related('settings').order_by('code')
+        if options['schools']:
+            schools = schools.filter(code__in=options['schools'])
+
+        for school in schools:
+            result = notify_absences(school, date=date, retry_failed=options['retry_failed'])
+            self.stdout.write(
+                f'{school.code}: {result.absences} absence(s), {result.messages_queued} new message(s), '
+                f'{result.sent} sent, {result.failed} failed in {result.duration_ms} ms'
+            )
+            for error in result.errors:
+                self.stderr.write(f'  {error}')
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.17 on 2026-10-19 13:13
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('schools', '0002_alter_user_employee_number'),
+        ('students', '0003_guardian_phone_e164'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SmsMessage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('phone_number', models.CharField(help_text='E.164 destination number', max_length=16)),
+                ('kind', models.CharField(choices=[('ABSENCE', 'Absence notice')], default='ABSENCE', max_length=20)),
+                ('event_date', models.DateField()),
+                ('language', models.CharField(default='EN', max_length=10)),
+                ('body', models.TextField()),
+                ('status', models.CharField(choices=[('QUEUED', 'Queued'), ('SENT', 'Sent'), ('FAILED', 'Failed')], default='QUEUED', max_length=10)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('provider_message_id', models.CharField(blank=True, max_length=100)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('guardian', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='sms_messages', to='students.guardian')),
+                ('school', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sms_messages', to='schools.school')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['school', 'event_date', 'status'], name='notificatio_school__ed2575_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='smsmessage',
+            constraint=models.UniqueConstraint(fields=('phone_number', 'kind', 'event_date'), name='unique_sms_per_number_kind_day'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.17 on 2026-10-19 14:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0002_sms_sending_status'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='smsmessage',
+            name='unique_sms_per_number_kind_day',
+        ),
+        migrations.AddConstraint(
+            model_name='smsmessage',
+            constraint=models.UniqueConstraint(fields=('school', 'phone_number', 'kind', 'event_date'), name='unique_sms_per_school_number_kind_day'),
+        ),
+    ]
@@ -0,0 +1,57 @@
+from django.db import models
+from schools.models import School
+from students.models import Guardian
+
+
+class SmsMessage(models.Model):
+    """
+    An outbound SMS to a guardian. One row per school, number, day and kind,
+    so a notification run can be repeated without sending twice; a guardian
+    with absent children at two schools gets one message from each.
+    """
+    STATUS_CHOICES = [
+        ('QUEUED', 'Queued'),
+        ('SENDING', 'Sending'),
+        ('SENT', 'Sent'),
+        ('FAILED', 'Failed'),
+    ]
+    KIND_CHOICES = [
+        ('ABSENCE', 'Absence notice'),
+    ]
+
+    school = models.ForeignKey(School, on_delete=models.CASCADE, related_name='sms_messages')
+    guardian = models.ForeignKey(
+        Guardian,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='sms_messages'
+    )
+    phone_number = models.CharField(max_length=16, help_text='E.164 destination number')
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, default='ABSENCE')
+    event_date = models.DateField()
+    language = models.CharField(max_length=10, default='EN')
+    body = models.TextField()
+
+    # Delivery tracking
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='QUEUED')
+    attempts = models.PositiveIntegerField(default=0)
+    provider_message_id = models.CharField(max_length=100, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['school', 'phone_number', 'kind', 'event_date'],
+                name='unique_sms_per_school_number_kind_day',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['school', 'event_date', 'status']),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} to {self.phone_number} ({self.get_status_display()})"
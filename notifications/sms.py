@@ -0,0 +1,262 @@
+"""
+Guardian SMS fan-out for absences.
+
+A run collects the day's absences for a school, coalesces them per guardian
+phone number (a parent of three absent siblings gets one message), renders
+the guardian's language template and dispatches the messages in batches
+through the configured gateway. Dispatch is concurrent, rate limited and
+retried with exponential backoff. Each number gets at most one SmsMessage
+row per school and day (a unique key), and a run only sends the rows it
+has moved from QUEUED to SENDING itself, so overlapping runs never send
+twice. A row left in SENDING by a crashed run is not retried, as it may
+have been delivered.
+"""
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from students.models import AttendanceRecord, GuardianStudent
+from .gateways import OutboundSms, get_gateway
+from .models import SmsMessage
+
+SMS_BATCH_SIZE = getattr(settings, 'SMS_BATCH_SIZE', 100)
+SMS_CONCURRENCY = getattr(settings, 'SMS_CONCURRENCY', 4)
+SMS_RATE_PER_SECOND = getattr(settings, 'SMS_RATE_PER_SECOND', 50)
+SMS_MAX_RETRIES = getattr(settings, 'SMS_MAX_RETRIES', 3)
+SMS_BACKOFF_SECONDS = getattr(settings, 'SMS_BACKOFF_SECONDS', 1.0)
+
+# Templates per Guardian.preferred_language, overridable per language
+# through settings.SMS_TEMPLATES; only a language with no template at all
+# falls back to English. {verb} is only needed by the English wording.
+ABSENCE_TEMPLATES = {
+    'EN': '{school}: {children} {verb} marked absent on {date}. Please contact the school if this is unexpected.',
+    'NY': ('{school}: {children} sanabwere ku sukulu pa {date}. '
+           'Chonde lumikizanani ndi sukulu ngati simunadziwe za izi.'),
+    'BE': ('{school}: {children} tabaisile ku sukulu pa {date}. '
+           'Napapata lanshanyeni ne sukulu nga tamwaishibe pali ici.'),
+}
+ABSENCE_TEMPLATES.update(getattr(settings, 'SMS_TEMPLATES', {}).get('ABSENCE', {}))
+# Word joining the last two child names
+CONJUNCTIONS = {'EN': 'and', 'NY': 'ndi', 'BE': 'na'}
+
+
+@dataclass
+class FanOutResult:
+    absences: int = 0
+    messages_queued: int = 0
+    sent: int = 0
+    failed: int = 0
+    skipped_existing: int = 0
+    duration_ms: int = 0
+    errors: list = field(default_factory=list)
+
+
+class RateLimiter:
+    """Thread-safe token bucket allowing ``rate`` messages per second."""
+
+    def __init__(self, rate):
+        self.rate = float(rate)
+        self.tokens = float(rate)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, count=1):
+        if self.rate <= 0:
+            return
+        # Batches larger than the bucket go through once it is full and
+        # leave it in debt, which delays the following batches
+        needed = min(count, self.rate)
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= needed:
+                    self.tokens -= count
+                    return
+                wait = (needed - self.tokens) / self.rate
+            time.sleep(min(wait, 1.0))
+
+
+def join_names(names, conjunction='and'):
+    if len(names) == 1:
+        return names[0]
+    return ', '.join(names[:-1]) + f' {conjunction} {names[-1]}'
+
+
+def render_absence_message(language, school_name, child_names, date):
+    if not ABSENCE_TEMPLATES.get(language):
+        language = 'EN'
+    return ABSENCE_TEMPLATES[language].format(
+        school=school_name,
+        children=join_names(child_names, CONJUNCTIONS.get(language, 'and')),
+        verb='was' if len(child_names) == 1 else 'were',
+        date=date.strftime('%d/%m/%Y'),
+    )
+
+
+def collect_absence_messages(school, date):
+    """
+    Build one unsaved SmsMessage per guardian phone number for the day.
+
+    Absences and guardian links are read with two queries for the whole
+    school.
+    """
+    absences = dict(
+        AttendanceRecord.objects.filter(
+            student__school=school, student__is_active=True, date=date, status='ABSENT'
+        ).values_list('student_id', 'student__first_name')
+    )
+    if not absences:
+        return 0, []
+
+    links = (
+        GuardianStudent.objects
+        .filter(
+            student_id__in=list(absences),
+            can_receive_calls=True,
+            guardian__receive_sms=True,
+        )
+        .exclude(guardian__phone_e164='')
+        .order_by('guardian__phone_e164', '-is_primary', 'guardian_id', 'student_id')
+        .values_list('guardian_id', 'guardian__phone_e164', 'guardian__preferred_language', 'student_id')
+    )
+    recipients = {}
+    for guardian_id, phone, language, student_id in links:
+        recipient = recipients.setdefault(phone, {'guardian_id': guardian_id, 'language': language, 'students': []})
+        if student_id not in recipient['students']:
+            recipient['students'].append(student_id)
+
+    messages = [
+        SmsMessage(
+            school=school,
+            guardian_id=recipient['guardian_id'],
+            phone_number=phone,
+            kind='ABSENCE',
+            event_date=date,
+            language=recipient['language'],
+            body=render_absence_message(
+                recipient['language'],
+                school.name,
+                [absences[student_id] for student_id in sorted(recipient['students'])],
+                date,
+            ),
+        )
+        for phone, recipient in recipients.items()
+    ]
+    return len(absences), messages
+
+
+def send_with_retry(gateway, batch, limiter):
+    """Send one batch, retrying retryable failures with exponential backoff."""
+    outcome = {}
+    pending = batch
+    for attempt in range(SMS_MAX_RETRIES + 1):
+        if attempt:
+            time.sleep(SMS_BACKOFF_SECONDS * 2 ** (attempt - 1) * (1 + random.random()))
+        limiter.acquire(len(pending))
+        try:
+            results = gateway.send_batch(pending)
+        except Exception as exc:
+            results = [None] * len(pending)
+            error = str(exc)
+        retry = []
+        for message, result in zip(pending, results):
+            if result is None:
+                outcome[message.id] = (False, '', error, attempt + 1)
+                retry.append(message)
+            elif result.ok or not result.retryable:
+                outcome[message.id] = (result.ok, result.provider_message_id, result.error, attempt + 1)
+            else:
+                outcome[message.id] = (False, '', result.error, attempt + 1)
+                retry.append(message)
+        if not retry:
+            break
+        pending = retry
+    return outcome
+
+
+def dispatch(messages, gateway=None):
+    """Send queued SmsMessage rows concurrently and record their outcome."""
+    gateway = gateway or get_gateway()
+    limiter = RateLimiter(SMS_RATE_PER_SECOND)
+    outbound = [OutboundSms(id=m.id, to=m.phone_number, body=m.body) for m in messages]
+    batches = [outbound[i:i + SMS_BATCH_SIZE] for i in range(0, len(outbound), SMS_BATCH_SIZE)]
+
+    outcome = {}
+    with ThreadPoolExecutor(max_workers=max(SMS_CONCURRENCY, 1)) as pool:
+        for batch_outcome in pool.map(lambda batch: send_with_retry(gateway, batch, limiter), batches):
+            outcome.update(batch_outcome)
+
+    now = timezone.now()
+    for message in messages:
+        ok, provider_id, error, attempts = outcome[message.id]
+        message.status = 'SENT' if ok else 'FAILED'
+        message.provider_message_id = provider_id
+        message.error = error
+        message.attempts += attempts
+        message.sent_at = now if ok else None
+    SmsMessage.objects.bulk_update(
+        messages, ['status', 'provider_message_id', 'error', 'attempts', 'sent_at'], batch_size=500
+    )
+    return messages
+
+
+def claim_messages(school, date, statuses):
+    """
+    Move the day's absence messages in ``statuses`` to SENDING and return
+    them. Rows locked by another run are skipped and the update only takes
+    rows still in ``statuses``, so each message is claimed by one run.
+    """
+    with transaction.atomic():
+        ids = list(
+            SmsMessage.objects.select_for_update(skip_locked=True)
+            .filter(school=school, kind='ABSENCE', event_date=date, status__in=statuses)
+            .order_by('id').values_list('id', flat=True)
+        )
+        if not ids:
+            return []
+        SmsMessage.objects.filter(id__in=ids, status__in=statuses).update(status='SENDING')
+    return list(SmsMessage.objects.filter(id__in=ids, status='SENDING').order_by('id'))
+
+
+def notify_absences(school, date=None, gateway=None, retry_failed=False):
+    """
+    Send the day's absence SMS for a school. Safe to run repeatedly.
+
+    Returns a FanOutResult.
+    """
+    started = time.monotonic()
+    date = date or timezone.localdate()
+    result = FanOutResult()
+
+    settings_obj = getattr(school, 'settings', None)
+    if settings_obj is None or not settings_obj.notify_parents_sms:
+        return result
+
+    result.absences, candidates = collect_absence_messages(school, date)
+    if candidates:
+        with transaction.atomic():
+            already = set(SmsMessage.objects.filter(
+                school=school, kind='ABSENCE', event_date=date,
+                phone_number__in=[m.phone_number for m in candidates],
+            ).values_list('phone_number', flat=True))
+            SmsMessage.objects.bulk_create(candidates, ignore_conflicts=True, batch_size=500)
+        result.skipped_existing = len(already)
+        result.messages_queued = len(candidates) - len(already)
+
+    queued = claim_messages(school, date, ['QUEUED', 'FAILED'] if retry_failed else ['QUEUED'])
+    if queued:
+        dispatch(queued, gateway=gateway)
+        result.sent = sum(1 for m in queued if m.status == 'SENT')
+        result.failed = sum(1 for m in queued if m.status == 'FAILED')
+        result.errors = sorted({m.error for m in queued if m.error})
+
+    result.duration_ms = int((time.monotonic() - started) * 1000)
+    return result
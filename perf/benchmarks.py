@@ -0,0 +1,293 @@
+"""
+Micro-benchmarks for the hot code paths.
+
+Each benchmark runs against a throwaway test database seeded with a given
+number of students (``seed_dataset``) and is timed over several repeats.
+Benchmarks that write, or that seed extra rows in a ``setup`` step
+outside the timed section, run inside a transaction that is rolled back,
+so every repeat sees the same data. Results are plain JSON so runs can be
+stored and compared; ``compare_results`` flags benchmarks whose best time
+slowed down by more than a threshold (the minimum is far less noisy than
+the median for runs of a few milliseconds).
+"""
+import datetime
+import io
+import json
+import math
+import platform
+import statistics
+import subprocess
+import time
+from dataclasses import dataclass
+from types import SimpleNamespace
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core import serializers as django_serializers
+from django.core.management import call_command
+from django.db import connection, transaction
+from rest_framework.renderers import JSONRenderer
+
+from attendance.services import flagged_students_by_school, mark_attendance
+from reports.analytics import analyse_frame, load_attendance
+from reports.exports import attendance_csv_rows
+from reports.generators import build_daily_report
+from schools.api_views import SchoolViewSet, UserViewSet
+from schools.fast_serializers import UserValuesSerializer
+from schools.models import SchoolSettings, User, Zone
+from schools.serializers import SchoolSerializer, UserSerializer
+from students.models import Student
+from .synthetic import SyntheticDataGenerator
+
+STUDENTS_PER_SCHOOL = 1000
+SEED_DAYS = 10
+# Rows in the large list responses
+LIST_ROWS = 10000
+
+
+@dataclass
+class Benchmark:
+    name: str
+    run: callable
+    writes: bool = False
+    setup: callable = None
+
+
+def school_days(count, end=None):
+    """The ``count`` weekdays up to and including ``end``, oldest first."""
+    day = end or datetime.date.today()
+    days = []
+    while len(days) < count:
+        if day.weekday() < 5:
+            days.append(day)
+        day -= datetime.timedelta(days=1)
+    return days[::-1]
+
+
+def seed_dataset(students, days=SEED_DAYS, seed=0):
+    """
+    Generate schools of up to STUDENTS_PER_SCHOOL students with the
+    synthetic data generator, with ``days`` school days of attendance, plus
+    a super admin to list them as.
+    """
+    school_count = max(1, math.ceil(students / STUDENTS_PER_SCHOOL))
+    result = SyntheticDataGenerator(
+        schools=school_count,
+        students_per_school=math.ceil(students / school_count),
+        days=school_days(days),
+        seed=seed,
+        code_prefix='BS',
+    ).run()
+    User.objects.create(
+        username='bench_super', role='SUPER_ADMIN', password=make_password(None), employee_number='BENCHSUPER'
+    )
+    return result.schools
+
+
+def viewset_queryset(viewset_class, user):
+    """The queryset a viewset would list for ``user``."""
+    view = viewset_class()
+    view.request = SimpleNamespace(user=user)
+    return view.get_queryset()
+
+
+def bench_school_serializer(context):
+    return len(SchoolSerializer(viewset_queryset(SchoolViewSet, context.super_admin), many=True).data)
+
+
+def bench_user_serializer(context):
+    return len(UserSerializer(viewset_queryset(UserViewSet, context.super_admin), many=True).data)
+
+
+def seed_officers(context):
+    """LIST_ROWS field officers spread over the schools, each assigned one zone."""
+    zones = list(Zone.objects.filter(school__in=context.schools))
+    password = make_password(None)
+    officers = User.objects.bulk_create([
+        User(username=f'bench_officer_{index}', first_name='Bench', last_name=f'Officer {index}',
+             role='FIELD_OFFICER', school_id=zones[index % len(zones)].school_id, password=password)
+        for index in range(LIST_ROWS)
+    ], batch_size=1000)
+    if not officers[0].pk:
+        # Backends that cannot return ids from bulk inserts
+        officers = list(User.objects.filter(username__startswith='bench_officer_').order_by('id'))
+    zones_by_school = {zone.school_id: zone for zone in zones}
+    User.assigned_zones.through.objects.bulk_create([
+        User.assigned_zones.through(user_id=officer.pk, zone_id=zones_by_school[officer.school_id].pk)
+        for officer in officers
+    ], batch_size=1000)
+
+
+def officer_queryset(context):
+    return viewset_queryset(UserViewSet, context.super_admin).filter(username__startswith='bench_officer_')
+
+
+def bench_user_list_modelserializer(context):
+    data = UserSerializer(officer_queryset(context), many=True).data
+    JSONRenderer().render(data)
+    return len(data)
+
+
+def bench_user_list_values(context):
+    serializer = UserValuesSerializer()
+    data = serializer.serialize(serializer.values(officer_queryset(context)))
+    JSONRenderer().render(data)
+    return len(data)
+
+
+def bench_daily_report(context):
+    for school in context.schools:
+        build_daily_report(school, context.today)
+    return len(context.schools)
+
+
+def bench_absence_flagging(context):
+    flags = flagged_students_by_school(list(SchoolSettings.objects.all()), context.today)
+    return sum(len(students) for students in flags.values()) or 1
+
+
+def bench_attendance_bulk_write(context):
+    date = context.today + datetime.timedelta(days=1)
+    marked = 0
+    for school in context.schools:
+        student_ids = Student.objects.filter(school=school).values_list('id', flat=True)
+        marked += mark_attendance(school, date, {student_id: 'PRESENT' for student_id in student_ids})
+    return marked
+
+
+def bench_fixture_import(context):
+    # The loaddata path: deserialize a JSON fixture and save object by object
+    for obj in django_serializers.deserialize('json', context.student_fixture):
+        obj.object.pk = None
+        obj.object.student_id = f'I{obj.object.student_id}'
+        obj.save()
+    return context.fixture_count
+
+
+def bench_attendance_export(context):
+    rows = 0
+    start = context.days[0]
+    for school in context.schools:
+        for _ in attendance_csv_rows(school, start, context.today):
+            rows += 1
+    return rows
+
+
+def bench_term_analytics(context):
+    # Uncached: the query and the vectorized analysis
+    students = 0
+    for school in context.schools:
+        students += analyse_frame(load_attendance(school.id, context.days[0], context.today))['students']
+    return students
+
+
+BENCHMARKS = [
+    Benchmark('school_serializer', bench_school_serializer),
+    Benchmark('user_serializer', bench_user_serializer),
+    Benchmark('user_list_modelserializer', bench_user_list_modelserializer, setup=seed_officers),
+    Benchmark('user_list_values', bench_user_list_values, setup=seed_officers),
+    Benchmark('daily_report', bench_daily_report),
+    Benchmark('absence_flagging', bench_absence_flagging),
+    Benchmark('attendance_bulk_write', bench_attendance_bulk_write, writes=True),
+    Benchmark('fixture_import', bench_fixture_import, writes=True),
+    Benchmark('attendance_export', bench_attendance_export),
+    Benchmark('term_analytics', bench_term_analytics),
+]
+
+
+def build_context(schools):
+    days = school_days(SEED_DAYS)
+    students = Student.objects.order_by('id')[:STUDENTS_PER_SCHOOL]
+    stream = io.StringIO()
+    django_serializers.serialize('json', students, stream=stream)
+    return SimpleNamespace(
+        schools=schools,
+        super_admin=User.objects.get(username='bench_super'),
+        days=days,
+        today=days[-1],
+        student_fixture=stream.getvalue(),
+        fixture_count=len(students),
+    )
+
+
+def time_benchmark(benchmark, context, repeat):
+    """Median, min and mean seconds over ``repeat`` runs, plus items per run."""
+    timings = []
+    items = 0
+    for _ in range(repeat):
+        with transaction.atomic():
+            if benchmark.setup:
+                benchmark.setup(context)
+            started = time.perf_counter()
+            items = benchmark.run(context)
+            timings.append(time.perf_counter() - started)
+            if benchmark.writes or benchmark.setup:
+                transaction.set_rollback(True)
+    median = statistics.median(timings)
+    return {
+        'median_s': round(median, 6),
+        'min_s': round(min(timings), 6),
+        'mean_s': round(statistics.fmean(timings), 6),
+        'items': items,
+        'items_per_s': round(items / median, 1) if median else None,
+    }
+
+
+def run_benchmarks(sizes, repeat=5, only=None, seed=0, progress=None):
+    """
+    Seed each size in turn and run the benchmarks on it.
+
+    Must be called with a test database active; the data of each size is
+    flushed before the next one is seeded.
+    """
+    selected = [b for b in BENCHMARKS if not only or b.name in only]
+    results = {}
+    for size in sizes:
+        call_command('flush', interactive=False, verbosity=0)
+        context = build_context(seed_dataset(size, seed=seed))
+        for benchmark in selected:
+            key = f'{benchmark.name}@{size}'
+            results[key] = time_benchmark(benchmark, context, repeat)
+            if progress:
+                progress(key, results[key])
+    return {
+        'created': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'database': connection.vendor,
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'commit': git_commit(),
+        'repeat': repeat,
+        'results': results,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, timeout=5,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ''
+
+
+def compare_results(previous, current, threshold):
+    """
+    Benchmarks whose best time grew by more than ``threshold`` (a
+    fraction, e.g. 0.25 for 25%). Returns (key, old, new, change) tuples.
+    """
+    regressions = []
+    for key, result in current['results'].items():
+        old = previous.get('results', {}).get(key)
+        if not old or not old['min_s']:
+            continue
+        change = result['min_s'] / old['min_s'] - 1
+        if change > threshold:
+            regressions.append((key, old['min_s'], result['min_s'], change))
+    return regressions
+
+
+def load_results(path):
+    with open(path) as handle:
+        return json.load(handle)
@@ -0,0 +1,255 @@
+"""
+HTTP load test of the morning attendance peak.
+
+Every virtual user is a staff member arriving at 07:30: it logs in through
+the login form, opens the dashboard, fetches a class roster, submits the
+whole sheet through the bulk attendance API and, if it is a school admin,
+downloads the daily report. All users start within the ramp-up period and
+repeat the session with a short think time until the test ends.
+
+Requests go over real HTTP to a gunicorn server (started by the
+``loadtest`` command or already running), so the numbers include
+middleware, sessions, password hashing and the database.
+"""
+import http.cookiejar
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from dataclasses import dataclass, field
+
+from django.conf import settings
+
+from schools.models import User
+from students.models import Student
+
+STEPS = ['login', 'dashboard', 'roster', 'submit', 'report']
+
+
+@dataclass
+class Credentials:
+    username: str
+    password: str
+    role: str
+    school_id: int
+    classes: list = field(default_factory=list)
+
+
+@dataclass
+class StepStats:
+    latencies: list = field(default_factory=list)
+    errors: int = 0
+
+    def percentile(self, pct):
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+        return ordered[index]
+
+    def summary(self):
+        count = len(self.latencies)
+        return {
+            'requests': count,
+            'errors': self.errors,
+            'error_rate': round(self.errors / count, 4) if count else 0.0,
+            'p50_ms': round(self.percentile(50) * 1000, 1) if count else None,
+            'p95_ms': round(self.percentile(95) * 1000, 1) if count else None,
+            'p99_ms': round(self.percentile(99) * 1000, 1) if count else None,
+            'max_ms': round(max(self.latencies) * 1000, 1) if count else None,
+        }
+
+
+class NoRedirect(urllib.request.HTTPRedirectHandler):
+    """Report redirects to the caller instead of following them."""
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+class VirtualUser:
+    def __init__(self, base_url, credentials, results, lock, rng):
+        self.base_url = base_url.rstrip('/')
+        self.credentials = credentials
+        self.results = results
+        self.lock = lock
+        self.rng = rng
+        self.reset()
+
+    def reset(self):
+        self.cookies = http.cookiejar.CookieJar()
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(self.cookies), NoRedirect
+        )
+
+    def cookie(self, name):
+        return next((c.value for c in self.cookies if c.name == name), '')
+
+    def request(self, method, path, data=None, json_body=None):
+        headers = {'Referer': self.base_url + '/'}
+        body = None
+        if json_body is not None:
+            body = json.dumps(json_body).encode()
+            headers['Content-Type'] = 'application/json'
+            headers['X-CSRFToken'] = self.cookie('csrftoken')
+        elif data is not None:
+            body = urllib.parse.urlencode(data).encode()
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        request = urllib.request.Request(self.base_url + path, data=body, headers=headers, method=method)
+        try:
+            with self.opener.open(request, timeout=30) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as exc:
+            return exc.code, exc.read()
+        except (urllib.error.URLError, OSError):
+            return 0, b''
+
+    def timed(self, step, method, path, expect=None, **kwargs):
+        started = time.perf_counter()
+        status, body = self.request(method, path, **kwargs)
+        elapsed = time.perf_counter() - started
+        ok = status in expect if expect else 200 <= status < 400
+        with self.lock:
+            stats = self.results[step]
+            stats.latencies.append(elapsed)
+            if not ok:
+                stats.errors += 1
+        return ok, status, body
+
+    def session(self):
+        """One full morning session. Returns False if it had to stop early."""
+        self.reset()
+        self.request('GET', '/login/')
+        # A successful login redirects; a failed one re-renders the form
+        ok, _, _ = self.timed('login', 'POST', '/login/', expect={302}, data={
+            'username': self.credentials.username,
+            'password': self.credentials.password,
+            'csrfmiddlewaretoken': self.cookie('csrftoken'),
+        })
+        if not ok:
+            return False
+
+        self.timed('dashboard', 'GET', '/dashboard/')
+
+        if self.credentials.classes:
+            grade, class_name = self.rng.choice(self.credentials.classes)
+            query = urllib.parse.urlencode({'grade': grade, 'class_name': class_name})
+            ok, _, body = self.timed('roster', 'GET', f'/api/attendance/class/?{query}')
+            if ok:
+                students = json.loads(body)['students']
+                records = {
+                    str(s['id']): 'ABSENT' if self.rng.random() < 0.08 else 'PRESENT'
+                    for s in students
+                }
+                if records:
+                    self.timed('submit', 'POST', '/api/attendance/class/', json_body={
+                        'grade': grade, 'class_name': class_name, 'records': records,
+                    })
+
+        if self.credentials.role == 'SCHOOL_ADMIN':
+            self.timed('report', 'GET', '/api/reports/daily/?export=csv')
+        return True
+
+
+def load_credentials(users, password, schools=None):
+    """Active teachers and school admins with the classes of their school."""
+    queryset = User.objects.filter(is_active=True, role__in=['TEACHER', 'SCHOOL_ADMIN'], school__isnull=False)
+    if schools:
+        queryset = queryset.filter(school__in=schools)
+    accounts = list(queryset.order_by('id').values_list('username', 'role', 'school_id')[:users])
+
+    classes = {}
+    for school_id, grade, class_name in (
+            Student.objects.filter(school_id__in={a[2] for a in accounts}, is_active=True)
+            .order_by().values_list('school_id', 'grade', 'class_name').distinct()):
+        classes.setdefault(school_id, []).append((grade, class_name))
+
+    return [
+        Credentials(username, password, role, school_id, classes.get(school_id, []))
+        for username, role, school_id in accounts
+    ]
+
+
+def run_load_test(base_url, credentials, virtual_users, duration, ramp_up=10.0, think_time=1.0, seed=0):
+    """
+    Run ``virtual_users`` concurrent users for ``duration`` seconds.
+
+    Returns a dict with per-step and overall latency percentiles, error
+    rates and throughput.
+    """
+    results = {step: StepStats() for step in STEPS}
+    lock = threading.Lock()
+    started = time.monotonic()
+    deadline = started + ramp_up + duration
+
+    def worker(index):
+        rng = random.Random(seed * 100003 + index)
+        user = VirtualUser(base_url, credentials[index % len(credentials)], results, lock, rng)
+        time.sleep(ramp_up * index / max(virtual_users, 1))
+        while time.monotonic() < deadline:
+            if not user.session():
+                time.sleep(think_time)
+            time.sleep(rng.uniform(0.5, 1.5) * think_time)
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(virtual_users)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+
+    overall = StepStats()
+    for stats in results.values():
+        overall.latencies.extend(stats.latencies)
+        overall.errors += stats.errors
+    return {
+        'virtual_users': virtual_users,
+        'duration_s': round(elapsed, 1),
+        'throughput_rps': round(len(overall.latencies) / elapsed, 1) if elapsed else 0.0,
+        'steps': {step: stats.summary() for step, stats in results.items() if stats.latencies},
+        'overall': overall.summary(),
+    }
+
+
+def check_thresholds(report, max_p95_ms, max_error_rate):
+    """Return a list of threshold violations (empty when the run passes)."""
+    failures = []
+    for name, summary in [('overall', report['overall'])] + list(report['steps'].items()):
+        if summary['p95_ms'] is not None and summary['p95_ms'] > max_p95_ms:
+            failures.append(f"{name}: p95 {summary['p95_ms']} ms > {max_p95_ms} ms")
+        if summary['error_rate'] > max_error_rate:
+            failures.append(f"{name}: error rate {summary['error_rate']:.2%} > {max_error_rate:.2%}")
+    return failures
+
+
+def start_server(port, workers, mode='wsgi'):
+    """
+    Start gunicorn on localhost with the current settings and wait until it
+    answers. ``mode`` is a SERVER_MODE of gunicorn.conf.py.
+    """
+    process = subprocess.Popen(
+        [
+            sys.executable, '-m', 'gunicorn', '--config', 'gunicorn.conf.py',
+            '--bind', f'127.0.0.1:{port}', '--workers', str(workers),
+            '--log-level', 'warning',
+        ],
+        cwd=str(settings.BASE_DIR),
+        env={**os.environ, 'SERVER_MODE': mode},
+    )
+    base_url = f'http://127.0.0.1:{port}'
+    for _ in range(100):
+        if process.poll() is not None:
+            raise RuntimeError(f'gunicorn exited with code {process.returncode}')
+        try:
+            urllib.request.urlopen(f'{base_url}/login/', timeout=1).close()
+            return process, base_url
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError('gunicorn did not start within 20 seconds')
@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+
+from perf.nplusone import capture_queries, format_report
+from schools.models import User
+
+DEFAULT_PATHS = [
+    '/dashboard/',
+    '/api/schools/',
+    '/api/zones/',
+    '/api/users/',
+    '/api/students/search/?q=a',
+]
+
+
+class Command(BaseCommand):
+    help = 'Request pages as a user and fail if any repeats a query more than the threshold (N+1)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*', help='Paths to request (default: main list pages)')
+        parser.add_argument('--user', help='Username to request as (default: first super admin)')
+        parser.add_argument('--threshold', type=int, default=None,
+                            help='Allowed repeats of one query (default: PERF_NPLUSONE_THRESHOLD)')
+
+    def handle(self, *args, **options):
+        if options['user']:
+            user = User.objects.filter(username=options['user']).first()
+        else:
+            user = User.objects.filter(role='SUPER_ADMIN', is_active=True).order_by('id').first()
+        if user is None:
+            raise CommandError('No user to request pages as; pass --user')
+
+        client = Client(raise_request_exception=True)
+        client.force_login(user)
+
+        failed = []
+        for path in options['paths'] or DEFAULT_PATHS:
+            with capture_queries() as capture:
+                response = client.get(path, HTTP_HOST='localhost')
+            duplicates = capture.duplicates(options['threshold'])
+            if duplicates:
+                failed.append(path)
+                self.stdout.write(self.style.ERROR(f'FAIL  {path} ({response.status_code}, {capture.total} queries)'))
+                self.stdout.write(format_report(duplicates))
+            else:
+                self.stdout.write(f'{self.style.SUCCESS("ok")}  {path} ({response.status_code}, {capture.total} queries)')
+
+        if failed:
+            raise CommandError(f"{len(failed)} page(s) repeat queries: {', '.join(failed)}")
+        self.stdout.write(self.style.SUCCESS('No repeated queries found'))
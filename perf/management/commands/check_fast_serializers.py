@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from perf.benchmarks import viewset_queryset
+from schools.api_views import SchoolViewSet, UserViewSet, ZoneViewSet
+from schools.models import User
+
+CHECKS = [
+    ('schools', SchoolViewSet),
+    ('zones', ZoneViewSet),
+    ('users', UserViewSet),
+]
+
+
+class Command(BaseCommand):
+    help = "Fail unless each list's values() serializer renders the same JSON bytes as its ModelSerializer"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='Username whose lists to compare (default: first super admin)')
+
+    def handle(self, *args, **options):
+        if options['user']:
+            user = User.objects.filter(username=options['user']).first()
+        else:
+            user = User.objects.filter(role='SUPER_ADMIN', is_active=True).order_by('id').first()
+        if user is None:
+            raise CommandError('No user to list as; pass --user')
+
+        renderer = JSONRenderer()
+        failed = []
+        for name, viewset_class in CHECKS:
+            queryset = viewset_queryset(viewset_class, user)
+            expected = renderer.render(viewset_class.serializer_class(queryset, many=True).data)
+            fast = viewset_class.fast_serializer_class()
+            actual = renderer.render(fast.serialize(fast.values(queryset)))
+            if actual == expected:
+                self.stdout.write(f"{self.style.SUCCESS('ok')}  {name}: {len(expected)} bytes")
+                continue
+            failed.append(name)
+            position = next(
+                (i for i, (a, b) in enumerate(zip(actual, expected)) if a != b), min(len(actual), len(expected))
+            )
+            self.stdout.write(f"{self.style.ERROR('FAIL')}  {name}: first difference at byte {position}")
+            self.stdout.write(f'      expected ...{expected[max(position - 60, 0):position + 60]!r}')
+            self.stdout.write(f'      actual   ...{actual[max(position - 60, 0):position + 60]!r}')
+
+        if failed:
+            raise CommandError(f"Fast serializers differ from the ModelSerializers: {', '.join(failed)}")
+        self.stdout.write(self.style.SUCCESS(f'All {len(CHECKS)} fast serializers match byte for byte'))
@@ -0,0 +1,32 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from perf.query_plans import check_query_plans
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN the hot querysets and fail if any needs a sequential scan or a sort'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verbose-plans', action='store_true',
+                            help='Print the full plan of every query')
+
+    def handle(self, *args, **options):
+        checks = check_query_plans()
+        for check in checks:
+            status = self.style.SUCCESS('ok') if check.ok else self.style.ERROR('FAIL')
+            self.stdout.write(f'{status}  {check.name}')
+            for problem in check.problems:
+                self.stdout.write(f'      {problem}')
+            if options['verbose_plans'] or not check.ok:
+                self.stdout.write(f'      {check.sql}')
+                plan = check.plan if isinstance(check.plan, list) and all(
+                    isinstance(line, str) for line in check.plan) else [json.dumps(check.plan, indent=2)]
+                for line in plan:
+                    self.stdout.write(f'      | {line}')
+
+        failed = [check.name for check in checks if not check.ok]
+        if failed:
+            raise CommandError(f"{len(failed)} query plan(s) not served by an index: {', '.join(failed)}")
+        self.stdout.write(self.style.SUCCESS(f'All {len(checks)} query plans use indexes'))
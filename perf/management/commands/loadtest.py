@@ -0,0 +1,106 @@
+import json
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+
+from perf.loadtest import STEPS, check_thresholds, load_credentials, run_load_test, start_server
+from schools.models import School, User
+
+LOADTEST_MAX_P95_MS = getattr(settings, 'LOADTEST_MAX_P95_MS', 500)
+LOADTEST_MAX_ERROR_RATE = getattr(settings, 'LOADTEST_MAX_ERROR_RATE', 0.01)
+
+
+class Command(BaseCommand):
+    help = (
+        'Simulate the 07:30 attendance peak (login, dashboard, roster, bulk submit, report '
+        'download) against gunicorn and fail if latency or error thresholds are exceeded'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50, help='Concurrent virtual users')
+        parser.add_argument('--duration', type=float, default=60, help='Seconds to run after ramp-up')
+        parser.add_argument('--ramp-up', type=float, default=10, help='Seconds over which users arrive')
+        parser.add_argument('--think-time', type=float, default=1.0, help='Mean pause between sessions')
+        parser.add_argument('--password', required=True, help='Password of the staff accounts used')
+        parser.add_argument('--set-passwords', action='store_true',
+                            help='Set --password on the accounts used first (only with DEBUG=True)')
+        parser.add_argument('--school', action='append', default=[],
+                            help='Only use staff of this school code (repeatable)')
+        parser.add_argument('--base-url', help='Target a running server instead of starting gunicorn')
+        parser.add_argument('--port', type=int, default=8765, help='Port for the started gunicorn')
+        parser.add_argument('--workers', type=int, default=4, help='Workers for the started gunicorn')
+        parser.add_argument('--server-mode', choices=['wsgi', 'asgi'], default='wsgi',
+                            help='Worker type of the started gunicorn (see gunicorn.conf.py)')
+        parser.add_argument('--seed', type=int, default=0, help='Seed for the scenario choices')
+        parser.add_argument('--max-p95-ms', type=float, default=LOADTEST_MAX_P95_MS,
+                            help='Fail if any step p95 exceeds this')
+        parser.add_argument('--max-error-rate', type=float, default=LOADTEST_MAX_ERROR_RATE,
+                            help='Fail if any step error rate exceeds this fraction')
+        parser.add_argument('--output', help='Write the results as JSON to this file')
+
+    def handle(self, *args, **options):
+        schools = []
+        for code in options['school']:
+            school = School.objects.filter(code=code).first()
+            if school is None:
+                raise CommandError(f'Unknown school code: {code}')
+            schools.append(school)
+
+        credentials = load_credentials(options['users'], options['password'], schools)
+        if not credentials:
+            raise CommandError('No active teachers or school admins to log in as')
+
+        if options['set_passwords']:
+            if not settings.DEBUG:
+                raise CommandError('--set-passwords rewrites account passwords and needs DEBUG=True')
+            # One hash for all accounts; hashing per user would dominate setup
+            User.objects.filter(username__in=[c.username for c in credentials]).update(
+                password=make_password(options['password']), is_password_changed=True
+            )
+
+        process = None
+        base_url = options['base_url']
+        if not base_url:
+            try:
+                process, base_url = start_server(options['port'], options['workers'], options['server_mode'])
+            except RuntimeError as e:
+                raise CommandError(str(e))
+
+        self.stdout.write(
+            f"{options['users']} users ({len(credentials)} accounts) against {base_url} "
+            f"for {options['ramp_up']:g}s ramp-up + {options['duration']:g}s"
+        )
+        try:
+            report = run_load_test(
+                base_url, credentials, options['users'], options['duration'],
+                ramp_up=options['ramp_up'], think_time=options['think_time'], seed=options['seed'],
+            )
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait(timeout=30)
+
+        self.stdout.write(f"{'step':<10}{'requests':>10}{'errors':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}")
+        rows = [(step, report['steps'][step]) for step in STEPS if step in report['steps']]
+        for name, summary in rows + [('overall', report['overall'])]:
+            self.stdout.write(
+                f"{name:<10}{summary['requests']:>10}{summary['errors']:>8}"
+                + ''.join(f"{summary[key] if summary[key] is not None else '-':>9}"
+                          for key in ('p50_ms', 'p95_ms', 'p99_ms', 'max_ms'))
+            )
+        self.stdout.write(f"Throughput: {report['throughput_rps']} requests/s (latencies in ms)")
+
+        failures = check_thresholds(report, options['max_p95_ms'], options['max_error_rate'])
+        report['thresholds'] = {
+            'max_p95_ms': options['max_p95_ms'],
+            'max_error_rate': options['max_error_rate'],
+            'failures': failures,
+        }
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                json.dump(report, handle, indent=2)
+
+        if failures:
+            raise CommandError('Load test thresholds exceeded:\n  ' + '\n  '.join(failures))
+        self.stdout.write(self.style.SUCCESS('All thresholds met'))
@@ -0,0 +1,81 @@
+import datetime
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from perf.benchmarks import BENCHMARKS, compare_results, load_results, run_benchmarks
+
+BENCHMARK_RESULTS_DIR = getattr(settings, 'BENCHMARK_RESULTS_DIR', os.path.join(settings.BASE_DIR, 'benchmark_results'))
+
+
+class Command(BaseCommand):
+    help = (
+        'Time serializers, aggregations, bulk writes, import and export on a seeded test '
+        'database at several sizes, save the results as JSON and flag regressions'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='1000,10000',
+                            help='Comma-separated numbers of students to seed (default: 1000,10000)')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per benchmark')
+        parser.add_argument('--only', action='append', default=[],
+                            choices=[b.name for b in BENCHMARKS], help='Run only this benchmark (repeatable)')
+        parser.add_argument('--seed', type=int, default=0, help='Seed for the generated data')
+        parser.add_argument('--output', help='Results file (default: a timestamped file in BENCHMARK_RESULTS_DIR)')
+        parser.add_argument('--compare', help='Results file to compare with (default: the latest in BENCHMARK_RESULTS_DIR)')
+        parser.add_argument('--threshold', type=float, default=0.25,
+                            help='Flag benchmarks whose best time grew by more than this fraction (default: 0.25)')
+        parser.add_argument('--no-save', action='store_true', help='Do not write a results file')
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(size) for size in options['sizes'].split(',') if size.strip()]
+        except ValueError:
+            raise CommandError('--sizes must be comma-separated integers')
+        if not sizes or min(sizes) < 1:
+            raise CommandError('--sizes must be positive')
+
+        previous_path = options['compare'] or self.latest_results()
+        previous = load_results(previous_path) if previous_path else None
+
+        def progress(key, result):
+            self.stdout.write(
+                f"{key:<36}{result['median_s'] * 1000:>11.1f} ms{result['items']:>9} items"
+                f"{result['items_per_s'] or 0:>14.0f} /s"
+            )
+
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            results = run_benchmarks(sizes, options['repeat'], options['only'], options['seed'], progress)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        if not options['no_save']:
+            path = options['output'] or os.path.join(
+                BENCHMARK_RESULTS_DIR, f"{datetime.datetime.now():%Y%m%d-%H%M%S}.json"
+            )
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with open(path, 'w') as handle:
+                json.dump(results, handle, indent=2)
+            self.stdout.write(f'Results written to {path}')
+
+        if previous is None:
+            return
+        regressions = compare_results(previous, results, options['threshold'])
+        if regressions:
+            lines = [
+                f'{key}: {old * 1000:.1f} ms -> {new * 1000:.1f} ms (+{change:.0%})'
+                for key, old, new, change in regressions
+            ]
+            raise CommandError(f'Regressions against {previous_path}:\n  ' + '\n  '.join(lines))
+        self.stdout.write(self.style.SUCCESS(f'No regressions above {options["threshold"]:.0%} against {previous_path}'))
+
+    def latest_results(self):
+        if not os.path.isdir(BENCHMARK_RESULTS_DIR):
+            return None
+        files = sorted(f for f in os.listdir(BENCHMARK_RESULTS_DIR) if f.endswith('.json'))
+        return os.path.join(BENCHMARK_RESULTS_DIR, files[-1]) if files else None
@@ -0,0 +1,179 @@
+"""
+In-process request metrics in Prometheus text format.
+
+Every worker process keeps its own registry of counters and histograms,
+labelled by resolved URL name. Gunicorn runs several workers and a scrape
+only reaches one of them, so when ``PERF_METRICS_DIR`` is set each worker
+also writes a snapshot of its registry there (at most every
+``PERF_METRICS_FLUSH_SECONDS``) and the metrics endpoint merges the
+snapshots of all workers. Snapshots of workers that stopped writing more
+than ``PERF_METRICS_STALE_SECONDS`` ago are removed; Prometheus treats the
+resulting drop like any other counter reset.
+"""
+import bisect
+import json
+import os
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+
+PERF_METRICS_DIR = getattr(settings, 'PERF_METRICS_DIR', '')
+PERF_METRICS_FLUSH_SECONDS = getattr(settings, 'PERF_METRICS_FLUSH_SECONDS', 10)
+PERF_METRICS_STALE_SECONDS = getattr(settings, 'PERF_METRICS_STALE_SECONDS', 3600)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+# name: (type, help, buckets)
+METRICS = {
+    'http_requests_total': (
+        'counter', 'Requests handled, by view, method and status class.', None),
+    'http_request_duration_seconds': (
+        'histogram', 'Total time spent handling the request.', DURATION_BUCKETS),
+    'http_request_sql_queries': (
+        'histogram', 'SQL queries executed per request.', QUERY_COUNT_BUCKETS),
+    'http_request_sql_duration_seconds': (
+        'histogram', 'Time spent in SQL queries per request.', DURATION_BUCKETS),
+    'http_request_cache_hits_total': (
+        'counter', 'Cache hits during requests.', None),
+    'http_request_cache_misses_total': (
+        'counter', 'Cache misses during requests.', None),
+}
+
+
+class Registry:
+    """
+    Thread-safe store of counter values and histogram bucket counts.
+
+    Series are keyed by (metric name, label tuple); a histogram value is
+    [bucket counts..., +Inf count, sum].
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.series = {}
+        self.last_flush = 0.0
+
+    def inc(self, name, labels, amount=1):
+        key = (name, labels)
+        with self.lock:
+            self.series[key] = self.series.get(key, 0) + amount
+
+    def observe(self, name, labels, value):
+        buckets = METRICS[name][2]
+        key = (name, labels)
+        with self.lock:
+            counts = self.series.get(key)
+            if counts is None:
+                counts = self.series[key] = [0] * (len(buckets) + 1) + [0.0]
+            # Buckets are cumulative when rendered, so only one slot is bumped here
+            counts[bisect.bisect_left(buckets, value)] += 1
+            counts[-1] += value
+
+    def record_request(self, stats, view, method, status):
+        """Fold one finished request's RequestStats into the registry."""
+        labels = (('view', view),)
+        self.inc('http_requests_total', labels + (('method', method), ('status', f'{status // 100}xx')))
+        self.observe('http_request_duration_seconds', labels, stats.total_seconds)
+        self.observe('http_request_sql_queries', labels, stats.queries)
+        self.observe('http_request_sql_duration_seconds', labels, stats.sql_seconds)
+        if stats.cache_hits:
+            self.inc('http_request_cache_hits_total', labels, stats.cache_hits)
+        if stats.cache_misses:
+            self.inc('http_request_cache_misses_total', labels, stats.cache_misses)
+        if PERF_METRICS_DIR and time.monotonic() - self.last_flush >= PERF_METRICS_FLUSH_SECONDS:
+            self.flush()
+
+    def snapshot(self):
+        with self.lock:
+            return [
+                [name, [list(pair) for pair in labels], list(value) if isinstance(value, list) else value]
+                for (name, labels), value in self.series.items()
+            ]
+
+    def flush(self):
+        """Write this worker's snapshot to PERF_METRICS_DIR atomically."""
+        self.last_flush = time.monotonic()
+        os.makedirs(PERF_METRICS_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=PERF_METRICS_DIR, suffix='.tmp')
+        with os.fdopen(fd, 'w') as handle:
+            json.dump(self.snapshot(), handle)
+        os.replace(tmp_path, os.path.join(PERF_METRICS_DIR, f'worker-{os.getpid()}.json'))
+
+
+registry = Registry()
+
+
+def merge_into(series, snapshot):
+    for name, labels, value in snapshot:
+        if name not in METRICS:
+            continue
+        key = (name, tuple(tuple(pair) for pair in labels))
+        if isinstance(value, list):
+            current = series.setdefault(key, [0] * len(value))
+            for index, amount in enumerate(value):
+                current[index] += amount
+        else:
+            series[key] = series.get(key, 0) + value
+
+
+def collect():
+    """Merged series of this process and, if configured, all other workers."""
+    series = {}
+    own_file = f'worker-{os.getpid()}.json'
+    merge_into(series, registry.snapshot())
+    if not PERF_METRICS_DIR or not os.path.isdir(PERF_METRICS_DIR):
+        return series
+
+    now = time.time()
+    for filename in os.listdir(PERF_METRICS_DIR):
+        if not filename.endswith('.json') or filename == own_file:
+            continue
+        path = os.path.join(PERF_METRICS_DIR, filename)
+        try:
+            if now - os.path.getmtime(path) > PERF_METRICS_STALE_SECONDS:
+                os.remove(path)
+                continue
+            with open(path) as handle:
+                merge_into(series, json.load(handle))
+        except (OSError, ValueError):
+            # Another worker replaced or removed the file mid-read
+            continue
+    return series
+
+
+def format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (
+        (key, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for key, value in pairs
+    )
+    return '{' + ','.join(f'{key}="{value}"' for key, value in escaped) + '}'
+
+
+def render_prometheus(series=None):
+    """Render series in the Prometheus text exposition format."""
+    series = collect() if series is None else series
+    by_name = {}
+    for (name, labels), value in sorted(series.items()):
+        by_name.setdefault(name, []).append((labels, value))
+
+    lines = []
+    for name, (kind, help_text, buckets) in METRICS.items():
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        for labels, value in by_name.get(name, []):
+            if kind == 'counter':
+                lines.append(f'{name}{format_labels(labels)} {value}')
+                continue
+            cumulative = 0
+            for bound, count in zip(buckets + ('+Inf',), value[:-1]):
+                cumulative += count
+                lines.append(f'{name}_bucket{format_labels(labels, [("le", bound)])} {cumulative}')
+            lines.append(f'{name}_sum{format_labels(labels)} {value[-1]}')
+            lines.append(f'{name}_count{format_labels(labels)} {cumulative}')
+    return '\n'.join(lines) + '\n'
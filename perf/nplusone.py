@@ -0,0 +1,186 @@
+"""
+N+1 and duplicate-query detection.
+
+Queries run inside ``capture_queries()`` are fingerprinted by their SQL
+with literals, parameters and IN-lists normalised away, so
+``SELECT ... WHERE id = 1`` and ``... WHERE id = 2`` count as the same
+query. A fingerprint seen more than the threshold times in one unit of
+work (a request, a test) is almost always a per-row lookup in a loop.
+Each report carries the application call site of the first occurrence.
+
+Use ``assert_no_duplicate_queries()`` in tests and CI, and
+DuplicateQueryMiddleware (``PERF_NPLUSONE_MODE = 'log'`` or ``'raise'``)
+in development and staging.
+"""
+import logging
+import re
+import traceback
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger('attendance_system')
+
+PERF_NPLUSONE_MODE = getattr(settings, 'PERF_NPLUSONE_MODE', 'off')
+PERF_NPLUSONE_THRESHOLD = getattr(settings, 'PERF_NPLUSONE_THRESHOLD', 5)
+# Regexes matched against fingerprints that are allowed to repeat
+PERF_NPLUSONE_IGNORE = getattr(settings, 'PERF_NPLUSONE_IGNORE', [])
+
+PROJECT_ROOT = str(Path(settings.BASE_DIR).resolve())
+PERF_ROOT = f'{PROJECT_ROOT}/perf/'
+STACK_DEPTH = 6
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST = re.compile(r'\bIN\s*\((?:\s*(?:%s|\?|\$\d+)\s*,?)+\)', re.IGNORECASE)
+_PLACEHOLDER_RUN = re.compile(r'(?:(?:%s|\?)\s*,\s*)+(?:%s|\?)')
+_WHITESPACE = re.compile(r'\s+')
+
+
+class DuplicateQueriesError(AssertionError):
+    """Raised when a unit of work repeats a query more than allowed."""
+
+    def __init__(self, duplicates, label=''):
+        self.duplicates = duplicates
+        super().__init__(format_report(duplicates, label))
+
+
+@dataclass
+class DuplicateQuery:
+    fingerprint: str
+    count: int
+    sql: str
+    stack: list = field(default_factory=list)
+
+
+def fingerprint(sql):
+    """Normalise SQL so queries differing only in values compare equal."""
+    sql = _STRING_LITERAL.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = _IN_LIST.sub('IN (...)', sql)
+    sql = _PLACEHOLDER_RUN.sub('...', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+def is_application_frame(filename):
+    return (
+        filename.startswith(PROJECT_ROOT)
+        and '/site-packages/' not in filename
+        and not filename.startswith(PERF_ROOT)
+        and not filename.endswith('manage.py')
+    )
+
+
+def application_stack():
+    """
+    The innermost project frames of the current stack, outermost first,
+    followed by the frame that issued the query when that is library code
+    (e.g. a serializer field ``source`` following a foreign key).
+    """
+    stack = traceback.extract_stack()[:-2]
+    frames = [
+        f'{frame.filename[len(PROJECT_ROOT) + 1:]}:{frame.lineno} in {frame.name}'
+        for frame in stack if is_application_frame(frame.filename)
+    ][-STACK_DEPTH:]
+    innermost = next((
+        frame for frame in reversed(stack)
+        if '/django/db/' not in frame.filename and not frame.filename.startswith(PERF_ROOT)
+    ), None)
+    if innermost is not None and not is_application_frame(innermost.filename):
+        frames.append(f'{innermost.filename}:{innermost.lineno} in {innermost.name}')
+    return frames
+
+
+class QueryCapture:
+    """Collects query fingerprints through ``connection.execute_wrapper``."""
+
+    def __init__(self):
+        self.counts = {}
+        self.first_seen = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        key = fingerprint(sql)
+        count = self.counts.get(key, 0)
+        self.counts[key] = count + 1
+        if not count:
+            self.first_seen[key] = (sql, application_stack())
+        return execute(sql, params, many, context)
+
+    @property
+    def total(self):
+        return sum(self.counts.values())
+
+    def duplicates(self, threshold=None, ignore=None):
+        """Fingerprints repeated more than ``threshold`` times, most repeated first."""
+        threshold = PERF_NPLUSONE_THRESHOLD if threshold is None else threshold
+        ignore = [re.compile(pattern) for pattern in (PERF_NPLUSONE_IGNORE if ignore is None else ignore)]
+        found = [
+            DuplicateQuery(key, count, *self.first_seen[key])
+            for key, count in self.counts.items()
+            if count > threshold and not any(pattern.search(key) for pattern in ignore)
+        ]
+        return sorted(found, key=lambda duplicate: -duplicate.count)
+
+
+@contextmanager
+def capture_queries(using=None):
+    """Capture queries on one database alias, or on all of them."""
+    capture = QueryCapture()
+    with ExitStack() as stack:
+        for alias in ([using] if using else connections):
+            stack.enter_context(connections[alias].execute_wrapper(capture))
+        yield capture
+
+
+@contextmanager
+def assert_no_duplicate_queries(threshold=None, using=None, ignore=None):
+    """
+    Fail with DuplicateQueriesError if the block repeats any query more
+    than ``threshold`` times::
+
+        with assert_no_duplicate_queries(threshold=2):
+            client.get('/api/schools/')
+    """
+    with capture_queries(using) as capture:
+        yield capture
+    duplicates = capture.duplicates(threshold, ignore)
+    if duplicates:
+        raise DuplicateQueriesError(duplicates)
+
+
+def format_report(duplicates, label=''):
+    lines = [f'{len(duplicates)} repeated query pattern(s){" in " + label if label else ""}:']
+    for duplicate in duplicates:
+        lines.append(f'  {duplicate.count}x {duplicate.fingerprint[:300]}')
+        lines.extend(f'      {frame}' for frame in duplicate.stack or ['(no application frame)'])
+    return '\n'.join(lines)
+
+
+class DuplicateQueryMiddleware:
+    """
+    Check every request for repeated queries.
+
+    ``PERF_NPLUSONE_MODE`` is ``'off'`` (middleware removed), ``'log'``
+    (warning with call sites, for staging) or ``'raise'`` (the request
+    fails with DuplicateQueriesError, for development and tests).
+    """
+
+    def __init__(self, get_response):
+        if PERF_NPLUSONE_MODE not in ('log', 'raise'):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with capture_queries() as capture:
+            response = self.get_response(request)
+        duplicates = capture.duplicates()
+        if duplicates:
+            label = f'{request.method} {request.path}'
+            if PERF_NPLUSONE_MODE == 'raise':
+                raise DuplicateQueriesError(duplicates, label)
+            logger.warning(format_report(duplicates, label))
+        return response
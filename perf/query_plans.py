@@ -0,0 +1,131 @@
+"""
+Query-plan regression checks for the hot querysets.
+
+Each check builds a queryset exactly as the application issues it
+(default orderings included) and inspects its plan. A plan fails if it
+reads a table sequentially or needs a separate sort step, which means the
+query is not served by an index.
+
+On PostgreSQL sequential scans and sorts are disabled for the session
+first, so tiny seeded tables do not hide a missing index: the planner
+only falls back to them when no index can serve the query.
+"""
+import json
+import re
+from dataclasses import dataclass, field
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from schools.models import School, User, Zone
+from students.models import AttendanceRecord, Student
+from visits.models import HomeVisit
+
+
+@dataclass
+class PlanCheck:
+    name: str
+    sql: str = ''
+    plan: list = field(default_factory=list)
+    problems: list = field(default_factory=list)
+
+    @property
+    def ok(self):
+        return not self.problems
+
+
+def sample_values():
+    """Pick realistic filter values from the seeded database."""
+    student = Student.objects.order_by().values('id', 'school_id', 'grade', 'class_name').first()
+    school_id = student['school_id'] if student else School.objects.order_by().values_list('id', flat=True).first()
+    return {
+        'school_id': school_id or 1,
+        'student_id': student['id'] if student else 1,
+        'grade': student['grade'] if student else 'GRADE_1',
+        'class_name': student['class_name'] if student else '1A',
+        'date': timezone.localdate(),
+    }
+
+
+def hot_querysets(values):
+    """The querysets whose plans are checked, keyed by name."""
+    school_id = values['school_id']
+    return {
+        'students by school': Student.objects.filter(school_id=school_id),
+        'class roster': Student.objects.filter(
+            school_id=school_id, grade=values['grade'],
+            class_name=values['class_name'], is_active=True,
+        ),
+        'users by school': User.objects.filter(school_id=school_id),
+        'field officers by school': User.objects.filter(
+            school_id=school_id, role='FIELD_OFFICER', is_active=True
+        ),
+        'zones by school': Zone.objects.filter(school_id=school_id),
+        'student attendance history': AttendanceRecord.objects.filter(student_id=values['student_id']),
+        'absences on a day': AttendanceRecord.objects.filter(date=values['date'], status='ABSENT'),
+        'visits by school': HomeVisit.objects.filter(school_id=school_id),
+    }
+
+
+def sqlite_plan(sql, params):
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def sqlite_problems(plan):
+    problems = []
+    for detail in plan:
+        # A SCAN reads the whole table, or the whole of an index when it is
+        # only used for ordering; an index lookup shows up as SEARCH
+        if re.match(r'SCAN (TABLE )?\S+( USING (COVERING )?INDEX \S+)?$', detail):
+            problems.append(f'full scan: {detail}')
+        if 'USE TEMP B-TREE' in detail:
+            problems.append(f'sort: {detail}')
+    return problems
+
+
+def postgresql_plan(sql, params):
+    with connection.cursor() as cursor:
+        cursor.execute('SET LOCAL enable_seqscan = off')
+        cursor.execute('SET LOCAL enable_sort = off')
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan
+
+
+def postgresql_nodes(node):
+    yield node
+    for child in node.get('Plans', []):
+        yield from postgresql_nodes(child)
+
+
+def postgresql_problems(plan):
+    problems = []
+    for node in postgresql_nodes(plan[0]['Plan']):
+        if node['Node Type'] == 'Seq Scan':
+            problems.append(f"sequential scan on {node.get('Relation Name')}")
+        elif node['Node Type'] in ('Sort', 'Incremental Sort'):
+            problems.append(f"sort on {', '.join(node.get('Sort Key', []))}")
+    return problems
+
+
+def check_query_plans():
+    """Return a PlanCheck for every hot queryset."""
+    results = []
+    for name, queryset in hot_querysets(sample_values()).items():
+        sql, params = queryset.query.sql_with_params()
+        check = PlanCheck(name=name, sql=sql)
+        if connection.vendor == 'postgresql':
+            with transaction.atomic():
+                check.plan = postgresql_plan(sql, params)
+            check.problems = postgresql_problems(check.plan)
+        elif connection.vendor == 'sqlite':
+            check.plan = sqlite_plan(sql, params)
+            check.problems = sqlite_problems(check.plan)
+        else:
+            check.problems = [f'plans are not checked on {connection.vendor}']
+        results.append(check)
+    return results
@@ -0,0 +1,371 @@
+"""
+Reproducible synthetic data at realistic volumes.
+
+SyntheticDataGenerator creates schools with zone polygons around the
+school, staff (an admin, a teacher per class, field officers assigned to
+zones), guardian households whose children are siblings at the same
+school and share the household's GPS point inside one of the zones, and
+attendance for every school day of the chosen period.
+
+Attendance is the bulk of the data. Each student gets a personal absence
+rate (most are rarely absent, a few are chronically absent), absences run
+in short streaks, and Mondays and Fridays are slightly worse. Attendance
+is written with COPY on PostgreSQL and batched executemany elsewhere; the
+other models go through bulk_create.
+All randomness comes from one seeded generator, so the same arguments
+always produce the same data.
+"""
+import datetime
+import io
+import math
+import random
+import time
+from dataclasses import dataclass, field
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.utils import timezone
+
+from schools.models import School, SchoolSettings, User, Zone
+from students.models import AttendanceRecord, Guardian, GuardianStudent, Student
+from students.search import name_search_columns
+
+BATCH_SIZE = 5000
+STUDENTS_PER_CLASS = 40
+ZONE_SIZE_DEGREES = 0.01
+
+# Lusaka; schools are scattered around it
+CITY_CENTRE = (-15.4167, 28.2833)
+
+FIRST_NAMES_M = ['John', 'Peter', 'Joseph', 'Daniel', 'Moses', 'Emmanuel', 'Brian', 'Mwila', 'Chanda', 'Kelvin',
+                 'Chilufya', 'Bwalya', 'Lazarus', 'Patrick', 'Mapalo', 'Isaac', 'Kondwani', 'Musonda']
+FIRST_NAMES_F = ['Mary', 'Grace', 'Ruth', 'Esther', 'Faith', 'Precious', 'Mutinta', 'Natasha', 'Chipo', 'Thandiwe',
+                 'Memory', 'Loveness', 'Martha', 'Agnes', 'Towela', 'Naomi', 'Mwansa', 'Ireen']
+LAST_NAMES = ['Banda', 'Phiri', 'Mwale', 'Tembo', 'Zulu', 'Lungu', 'Mumba', 'Sakala', 'Chanda', 'Bwalya', 'Mulenga',
+              'Ngoma', 'Daka', 'Mbewe', 'Kabwe', 'Musonda', 'Nyirenda', 'Chilufya', 'Kapata', 'Simukonda']
+
+# Children per household and how common each size is
+HOUSEHOLD_SIZES = [1, 2, 3, 4]
+HOUSEHOLD_WEIGHTS = [55, 28, 12, 5]
+
+# Zambian school terms as (start month, day, end month, day)
+TERMS = [(1, 13, 4, 11), (5, 5, 8, 1), (9, 1, 11, 28)]
+
+
+def term_days(start, end):
+    """Weekdays between ``start`` and ``end`` that fall inside a school term."""
+    days = []
+    day = start
+    while day <= end:
+        if day.weekday() < 5 and any(
+                datetime.date(day.year, sm, sd) <= day <= datetime.date(day.year, em, ed)
+                for sm, sd, em, ed in TERMS):
+            days.append(day)
+        day += datetime.timedelta(days=1)
+    return days
+
+
+@dataclass
+class SyntheticResult:
+    schools: list = field(default_factory=list)
+    counts: dict = field(default_factory=dict)
+    duration_s: float = 0.0
+
+
+class SyntheticDataGenerator:
+    def __init__(self, schools=5, students_per_school=1000, days=None, zones_per_school=4,
+                 seed=0, code_prefix='SYN', password='testpass123', batch_size=BATCH_SIZE, log=None):
+        self.school_count = schools
+        self.students_per_school = students_per_school
+        self.days = days if days is not None else term_days(
+            timezone.localdate() - datetime.timedelta(days=365), timezone.localdate()
+        )
+        self.zones_per_school = zones_per_school
+        self.rng = random.Random(seed)
+        self.code_prefix = code_prefix
+        self.password = password
+        self.batch_size = batch_size
+        self.log = log or (lambda message: None)
+        self.counts = dict.fromkeys(
+            ['schools', 'zones', 'users', 'guardians', 'students', 'guardian_links', 'attendance'], 0
+        )
+
+    def run(self):
+        started = time.monotonic()
+        # One hash for every account; hashing per user would take minutes
+        self.password_hash = make_password(self.password)
+        existing = School.objects.filter(code__startswith=self.code_prefix).count()
+        schools = []
+        for number in range(existing + 1, existing + self.school_count + 1):
+            with transaction.atomic():
+                school = self.create_school(number)
+                zones = self.create_zones(school)
+                classes = self.create_students(school, number, zones)
+                self.create_staff(school, zones, classes)
+                self.create_attendance(school)
+            schools.append(school)
+            self.log(f'{school.code}: {self.counts["students"]} students, '
+                     f'{self.counts["attendance"]} attendance rows so far')
+        return SyntheticResult(schools, dict(self.counts), round(time.monotonic() - started, 1))
+
+    def create_school(self, number):
+        code = f'{self.code_prefix}{number}'
+        lat = CITY_CENTRE[0] + self.rng.uniform(-0.15, 0.15)
+        lng = CITY_CENTRE[1] + self.rng.uniform(-0.15, 0.15)
+        school = School.objects.create(
+            name=f'Synthetic School {code}', code=code, address=f'Plot {number}, Lusaka',
+            latitude=round(lat, 7), longitude=round(lng, 7),
+        )
+        SchoolSettings.objects.create(school=school)
+        self.counts['schools'] += 1
+        return school
+
+    def create_zones(self, school):
+        """A grid of square zones centred on the school."""
+        columns = math.ceil(math.sqrt(self.zones_per_school))
+        origin_lat = float(school.latitude) - columns * ZONE_SIZE_DEGREES / 2
+        origin_lng = float(school.longitude) - columns * ZONE_SIZE_DEGREES / 2
+        zones = []
+        for index in range(self.zones_per_school):
+            lat = origin_lat + (index // columns) * ZONE_SIZE_DEGREES
+            lng = origin_lng + (index % columns) * ZONE_SIZE_DEGREES
+            corners = [
+                [round(lat, 6), round(lng, 6)],
+                [round(lat + ZONE_SIZE_DEGREES, 6), round(lng, 6)],
+                [round(lat + ZONE_SIZE_DEGREES, 6), round(lng + ZONE_SIZE_DEGREES, 6)],
+                [round(lat, 6), round(lng + ZONE_SIZE_DEGREES, 6)],
+            ]
+            zones.append(Zone(
+                school=school, name=f'Zone {chr(65 + index)}',
+                boundary_coordinates={'type': 'polygon', 'coordinates': corners + [corners[0]]},
+            ))
+        zones = Zone.objects.bulk_create(zones)
+        self.counts['zones'] += len(zones)
+        return [(zone, zone.boundary_coordinates['coordinates'][0]) for zone in zones]
+
+    def household_point(self, zones):
+        """A random point strictly inside one of the zone squares."""
+        zone, (lat, lng) = self.rng.choice(zones)
+        margin = ZONE_SIZE_DEGREES * 0.05
+        return (
+            f'{lat + self.rng.uniform(margin, ZONE_SIZE_DEGREES - margin):.6f},'
+            f'{lng + self.rng.uniform(margin, ZONE_SIZE_DEGREES - margin):.6f}'
+        )
+
+    def person_name(self, gender, last_name=None):
+        names = FIRST_NAMES_M if gender == 'M' else FIRST_NAMES_F
+        return self.rng.choice(names), last_name or self.rng.choice(LAST_NAMES)
+
+    def create_students(self, school, number, zones):
+        """
+        Households of siblings with one or two guardians. Returns the
+        school's classes as (grade, class name) pairs.
+        """
+        rng = self.rng
+        guardians, students, household_of_student = [], [], []
+        household_guardians = []
+        today = timezone.localdate()
+        while len(students) < self.students_per_school:
+            size = min(
+                rng.choices(HOUSEHOLD_SIZES, HOUSEHOLD_WEIGHTS)[0],
+                self.students_per_school - len(students),
+            )
+            last_name = rng.choice(LAST_NAMES)
+            address = f'House {rng.randint(1, 999)}, Section {rng.randint(1, 20)}'
+            gps = self.household_point(zones)
+            household = len(household_guardians)
+            members = []
+            for relationship, gender in [('MOTHER', 'F'), ('FATHER', 'M')][:1 if rng.random() < 0.7 else 2]:
+                first_name, _ = self.person_name(gender)
+                # Unique per school: two digits of the school number and a sequence
+                phone = f'09{rng.choice("5677")}{number % 100:02d}{len(guardians):05d}'
+                search_name, search_name_reversed = name_search_columns(first_name, last_name)
+                guardians.append(Guardian(
+                    first_name=first_name, last_name=last_name, relationship=relationship,
+                    phone_number=phone, phone_e164=f'+260{phone[1:]}', address=address,
+                    preferred_language=rng.choice(['EN', 'EN', 'NY', 'BE']),
+                    search_name=search_name, search_name_reversed=search_name_reversed,
+                ))
+                members.append(len(guardians) - 1)
+            household_guardians.append(members)
+
+            for _ in range(size):
+                gender = rng.choice('MF')
+                first_name, _ = self.person_name(gender)
+                grade = rng.randint(1, 12)
+                search_name, search_name_reversed = name_search_columns(first_name, last_name)
+                students.append(Student(
+                    student_id=f'{school.code}{len(students) + 1:06d}',
+                    first_name=first_name, last_name=last_name, school=school,
+                    grade=f'GRADE_{grade}', class_name='', gender=gender,
+                    date_of_birth=today - datetime.timedelta(days=365 * (grade + 5) + rng.randint(0, 364)),
+                    current_address=address, gps_coordinates=gps,
+                    enrollment_date=today - datetime.timedelta(days=365 * rng.randint(0, grade - 1) + rng.randint(0, 200)),
+                    search_name=search_name, search_name_reversed=search_name_reversed,
+                ))
+                household_of_student.append(household)
+
+        classes = self.assign_classes(students)
+        Guardian.objects.bulk_create(guardians, batch_size=self.batch_size)
+        Student.objects.bulk_create(students, batch_size=self.batch_size)
+        if guardians[0].pk is None or students[0].pk is None:
+            self.reload_ids(school, guardians, students)
+
+        links = [
+            GuardianStudent(
+                guardian_id=guardians[guardian_index].pk, student_id=student.pk,
+                is_primary=position == 0, can_receive_calls=True,
+            )
+            for student, household in zip(students, household_of_student)
+            for position, guardian_index in enumerate(household_guardians[household])
+        ]
+        GuardianStudent.objects.bulk_create(links, batch_size=self.batch_size)
+
+        self.student_ids = [student.pk for student in students]
+        self.counts['guardians'] += len(guardians)
+        self.counts['students'] += len(students)
+        self.counts['guardian_links'] += len(links)
+        return classes
+
+    def assign_classes(self, students):
+        """Split each grade into sections of at most STUDENTS_PER_CLASS."""
+        by_grade = {}
+        for student in students:
+            by_grade.setdefault(student.grade, []).append(student)
+        classes = []
+        for grade, members in sorted(by_grade.items()):
+            sections = math.ceil(len(members) / STUDENTS_PER_CLASS)
+            number = grade.split('_')[1]
+            for index, student in enumerate(members):
+                student.class_name = f'{number}{chr(65 + index % sections)}'
+            classes += [(grade, f'{number}{chr(65 + s)}') for s in range(sections)]
+        return classes
+
+    def reload_ids(self, school, guardians, students):
+        """Fill in primary keys on backends that do not return them from bulk inserts."""
+        student_ids = dict(Student.objects.filter(school=school).values_list('student_id', 'id'))
+        for student in students:
+            student.pk = student_ids[student.student_id]
+        guardian_ids = dict(
+            Guardian.objects.filter(phone_e164__in=[g.phone_e164 for g in guardians])
+            .order_by('id').values_list('phone_e164', 'id')
+        )
+        for guardian in guardians:
+            guardian.pk = guardian_ids[guardian.phone_e164]
+
+    def create_staff(self, school, zones, classes):
+        code = school.code
+        users = [User(
+            username=f'{code.lower()}_admin', role='SCHOOL_ADMIN', school=school,
+            employee_number=f'{code}A1', first_name='Admin', last_name=code,
+            password=self.password_hash, is_password_changed=True,
+        )]
+        for index, _ in enumerate(classes, start=1):
+            first_name, last_name = self.person_name(self.rng.choice('MF'))
+            users.append(User(
+                username=f'{code.lower()}_teacher_{index}', role='TEACHER', school=school,
+                employee_number=f'{code}T{index}', first_name=first_name, last_name=last_name,
+                password=self.password_hash, is_password_changed=True,
+            ))
+        officers = []
+        for index in range(1, max(1, len(zones) // 2) + 1):
+            first_name, last_name = self.person_name(self.rng.choice('MF'))
+            officers.append(User(
+                username=f'{code.lower()}_officer_{index}', role='FIELD_OFFICER', school=school,
+                employee_number=f'{code}F{index}', first_name=first_name, last_name=last_name,
+                password=self.password_hash, is_password_changed=True,
+            ))
+        User.objects.bulk_create(users + officers, batch_size=self.batch_size)
+        officer_ids = dict(
+            User.objects.filter(username__in=[o.username for o in officers]).values_list('username', 'id')
+        )
+        User.assigned_zones.through.objects.bulk_create([
+            User.assigned_zones.through(
+                user_id=officer_ids[officers[index % len(officers)].username], zone_id=zone.pk
+            )
+            for index, (zone, _) in enumerate(zones)
+        ])
+        self.counts['users'] += len(users) + len(officers)
+
+    def attendance_rows(self):
+        """Yield (student id, date, status) for every student and school day."""
+        rng = self.rng
+        for student_id in self.student_ids:
+            # Most students miss 1-5% of days; about one in twenty is chronically absent
+            rate = rng.uniform(0.15, 0.35) if rng.random() < 0.05 else rng.uniform(0.01, 0.05)
+            absent_yesterday = False
+            for day in self.days:
+                chance = rate * (1.3 if day.weekday() in (0, 4) else 1.0)
+                if absent_yesterday:
+                    chance = min(0.9, chance * 6)
+                roll = rng.random()
+                if roll < chance:
+                    status = 'ABSENT'
+                elif roll < chance + 0.03:
+                    status = 'LATE'
+                elif roll < chance + 0.04:
+                    status = 'EXCUSED'
+                else:
+                    status = 'PRESENT'
+                absent_yesterday = status == 'ABSENT'
+                yield student_id, day, status
+
+    def create_attendance(self, school):
+        if connection.vendor == 'postgresql':
+            written = self.copy_attendance()
+        else:
+            written = self.insert_attendance()
+        self.counts['attendance'] += written
+
+    def insert_attendance(self):
+        """
+        Batched multi-row insert. Rows go straight to ``executemany`` with
+        values prepared once per day, which is several times faster than
+        building a model instance per row for bulk_create.
+        """
+        opts = AttendanceRecord._meta
+        quote = connection.ops.quote_name
+        columns = ['student_id', 'date', 'status', 'marked_at']
+        sql = (
+            f'INSERT INTO {quote(opts.db_table)} ({", ".join(map(quote, columns))}) '
+            f'VALUES ({", ".join(["%s"] * len(columns))})'
+        )
+        date_field = opts.get_field('date')
+        day_values = {day: date_field.get_db_prep_value(day, connection) for day in self.days}
+        marked_at = opts.get_field('marked_at').get_db_prep_value(timezone.now(), connection)
+
+        written = 0
+        batch = []
+        with connection.cursor() as cursor:
+            for student_id, day, status in self.attendance_rows():
+                batch.append((student_id, day_values[day], status, marked_at))
+                if len(batch) >= self.batch_size:
+                    cursor.executemany(sql, batch)
+                    written += len(batch)
+                    batch = []
+            if batch:
+                cursor.executemany(sql, batch)
+                written += len(batch)
+        return written
+
+    def copy_attendance(self):
+        """Stream the rows through COPY, one buffer per batch."""
+        table = AttendanceRecord._meta.db_table
+        marked_at = timezone.now().isoformat()
+        written = 0
+        buffer = io.StringIO()
+        with connection.cursor() as cursor:
+            for student_id, day, status in self.attendance_rows():
+                buffer.write(f'{student_id}\t{day.isoformat()}\t{status}\t{marked_at}\n')
+                written += 1
+                if written % self.batch_size == 0:
+                    self.copy_buffer(cursor, table, buffer)
+                    buffer = io.StringIO()
+            self.copy_buffer(cursor, table, buffer)
+        return written
+
+    def copy_buffer(self, cursor, table, buffer):
+        buffer.seek(0)
+        cursor.cursor.copy_expert(
+            f'COPY {table} (student_id, date, status, marked_at) FROM STDIN', buffer
+        )
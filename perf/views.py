@@ -0,0 +1,60 @@
+import hmac
+import ipaddress
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.views.decorators.http import require_GET
+
+from .metrics import render_prometheus
+
+PERF_METRICS_TOKEN = getattr(settings, 'PERF_METRICS_TOKEN', '')
+PERF_METRICS_ALLOWED_IPS = getattr(settings, 'PERF_METRICS_ALLOWED_IPS', ['127.0.0.1', '::1'])
+# Proxies (addresses or networks) whose X-Forwarded-For is believed
+PERF_METRICS_TRUSTED_PROXIES = [
+    ipaddress.ip_network(proxy, strict=False)
+    for proxy in getattr(settings, 'PERF_METRICS_TRUSTED_PROXIES', [])
+]
+
+
+def is_trusted_proxy(address):
+    try:
+        address = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(address in network for network in PERF_METRICS_TRUSTED_PROXIES)
+
+
+def client_address(request):
+    """
+    The address a scrape came from. REMOTE_ADDR is the last proxy when the
+    app runs behind nginx or a load balancer, so when it is a trusted proxy
+    X-Forwarded-For is read from the right, skipping trusted proxies. Entries
+    further left were written by the client and could be forged.
+    """
+    address = request.META.get('REMOTE_ADDR', '')
+    forwarded = [hop.strip() for hop in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',') if hop.strip()]
+    while is_trusted_proxy(address) and forwarded:
+        address = forwarded.pop()
+    return address
+
+
+def metrics_allowed(request):
+    """
+    Scrapes must carry the bearer token or come from an allowed address.
+    Behind a proxy the address gate needs PERF_METRICS_TRUSTED_PROXIES; on
+    platforms whose proxy addresses are not known, use the token.
+    """
+    if PERF_METRICS_TOKEN:
+        header = request.headers.get('Authorization', '')
+        if header.startswith('Bearer ') and hmac.compare_digest(header[7:], PERF_METRICS_TOKEN):
+            return True
+    return client_address(request) in PERF_METRICS_ALLOWED_IPS
+
+
+@require_GET
+def metrics(request):
+    """Prometheus scrape endpoint for request metrics."""
+    if not metrics_allowed(request):
+        # Not advertised to anyone outside the allow list
+        raise Http404
+    return HttpResponse(render_prometheus(), content_type='text/plain; version=0.0.4; charset=utf-8')
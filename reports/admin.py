@@ -1,2 +1,10 @@
 from django.contrib import admin
-# Placeholder - will be implemented in later phases
\ No newline at end of file
+from .models import DailyReportRun
+
+
+@admin.register(DailyReportRun)
+class DailyReportRunAdmin(admin.ModelAdmin):
+    list_display = ['school', 'report_date', 'status', 'started_at', 'completed_at']
+    list_filter = ['status', 'report_date']
+    list_select_related = ['school']
+    readonly_fields = ['school', 'report_date', 'status', 'started_at', 'completed_at', 'error']
@@ -0,0 +1,181 @@
+"""
+Term attendance analytics for a school.
+
+analyse_attendance() loads every attendance record of the term with one
+values_list() query, so there is one row per student and day, including
+the student's grade and gender. It then computes all figures at once
+from NumPy arrays:
+
+- Daily status counts and attendance rate.
+- Weekly attendance rate and absences, each with the change from the
+  previous week.
+- Each student's share of missed days. Students who missed at least the
+  threshold (CHRONIC_ABSENCE_THRESHOLD percent) are chronically absent.
+- Attendance and chronic-absence rates per grade and per gender.
+
+Attendance counts PRESENT and LATE, as the daily report does. A missed
+day is any other status, because chronic absence includes excused
+absences.
+
+Results are cached in the school's namespace for ANALYTICS_CACHE_TIMEOUT
+seconds. Marking attendance does not invalidate that namespace, so
+figures for a running term can be up to that old.
+"""
+import numpy as np
+import pandas as pd
+from django.conf import settings
+
+from schools.cache import get_or_compute, school_namespace
+from students.models import AttendanceRecord, Student
+from .generators import STATUSES
+
+CHRONIC_ABSENCE_THRESHOLD = getattr(settings, 'CHRONIC_ABSENCE_THRESHOLD', 10)
+ANALYTICS_CACHE_TIMEOUT = getattr(settings, 'ANALYTICS_CACHE_TIMEOUT', 300)
+
+GRADES = [grade for grade, _ in Student.grade_choices]
+GENDERS = [gender for gender, _ in Student.gender_choices]
+ATTENDED = [STATUSES.index('PRESENT'), STATUSES.index('LATE')]
+
+COLUMNS = ['student', 'date', 'status', 'grade', 'gender']
+
+
+def load_attendance(school_id, start, end):
+    """The school's attendance between ``start`` and ``end`` as a DataFrame with categorical columns."""
+    rows = (
+        AttendanceRecord.objects
+        .filter(student__school_id=school_id, date__range=(start, end))
+        .order_by()
+        .values_list('student_id', 'date', 'status', 'student__grade', 'student__gender')
+    )
+    frame = pd.DataFrame.from_records(list(rows), columns=COLUMNS)
+    frame['date'] = pd.to_datetime(frame['date'])
+    # Statuses outside STATUSES are dropped; other unknown values get their own category
+    frame['status'] = pd.Categorical(frame['status'], categories=STATUSES)
+    frame = frame.dropna(subset=['status'])
+    for column, known in (('grade', GRADES), ('gender', GENDERS)):
+        extra = sorted(set(frame[column].unique()) - set(known))
+        frame[column] = pd.Categorical(frame[column], categories=known + extra)
+    return frame
+
+
+def percent(numerator, denominator):
+    """Element-wise percentage rounded to 0.1, None where ``denominator`` is 0."""
+    numerator = np.asarray(numerator, dtype=float)
+    denominator = np.asarray(denominator, dtype=float)
+    rates = np.round(100 * numerator / np.where(denominator == 0, 1, denominator), 1)
+    return [float(rate) if total else None for rate, total in zip(rates, denominator)]
+
+
+def changes(values):
+    """Change of each value from the one before it; None for the first and after gaps."""
+    result = [None]
+    for previous, current in zip(values, values[1:]):
+        result.append(None if previous is None or current is None else round(current - previous, 1))
+    return result
+
+
+def breakdown(key, labels, row_codes, attended, student_codes, chronic):
+    """Attendance and chronic-absence rates per label; rows and students carry label codes."""
+    size = len(labels)
+    marked = np.bincount(row_codes, minlength=size)
+    present = np.bincount(row_codes, weights=attended, minlength=size)
+    students = np.bincount(student_codes, minlength=size)
+    chronic_students = np.bincount(student_codes, weights=chronic, minlength=size)
+    attendance_rates = percent(present, marked)
+    chronic_rates = percent(chronic_students, students)
+    return [
+        {
+            key: labels[code],
+            'students': int(students[code]),
+            'attendance_rate': attendance_rates[code],
+            'chronically_absent': int(chronic_students[code]),
+            'chronic_absence_rate': chronic_rates[code],
+        }
+        for code in np.flatnonzero(students)
+    ]
+
+
+def analyse_frame(frame, threshold=CHRONIC_ABSENCE_THRESHOLD):
+    """The analytics for a frame from load_attendance(); see the module docstring."""
+    status = frame['status'].cat.codes.to_numpy()
+    attended = np.isin(status, ATTENDED)
+    dates, date_index = np.unique(frame['date'].to_numpy(), return_inverse=True)
+
+    # Status counts per day, one row per date
+    daily_counts = np.bincount(
+        date_index * len(STATUSES) + status, minlength=len(dates) * len(STATUSES)
+    ).reshape(len(dates), len(STATUSES))
+    daily_marked = daily_counts.sum(axis=1)
+    daily_present = daily_counts[:, ATTENDED].sum(axis=1)
+    daily_rates = percent(daily_present, daily_marked)
+    day_labels = pd.DatetimeIndex(dates)
+
+    # Dates are sorted, so each week is a contiguous run of days
+    week_starts = (day_labels - pd.to_timedelta(day_labels.weekday, unit='D')).to_numpy()
+    weeks, week_first_day = np.unique(week_starts, return_index=True)
+    weekly_counts = np.add.reduceat(daily_counts, week_first_day, axis=0) if len(dates) else daily_counts
+    weekly_rates = percent(weekly_counts[:, ATTENDED].sum(axis=1), weekly_counts.sum(axis=1))
+    weekly_absences = [int(count) for count in weekly_counts.sum(axis=1) - weekly_counts[:, ATTENDED].sum(axis=1)]
+
+    # Per student: share of marked days missed
+    students, first_row, student_index = np.unique(
+        frame['student'].to_numpy(), return_index=True, return_inverse=True
+    )
+    student_marked = np.bincount(student_index, minlength=len(students))
+    student_missed = np.bincount(student_index, weights=~attended, minlength=len(students))
+    chronic = 100 * student_missed >= threshold * student_marked
+
+    grades, genders = frame['grade'].cat, frame['gender'].cat
+    grade_codes, gender_codes = grades.codes.to_numpy(), genders.codes.to_numpy()
+    return {
+        'threshold': threshold,
+        'school_days': len(dates),
+        'students': len(students),
+        'marked': int(daily_marked.sum()),
+        'attendance_rate': percent([attended.sum()], [len(attended)])[0],
+        'chronically_absent': int(chronic.sum()),
+        'chronic_absence_rate': percent([chronic.sum()], [len(students)])[0],
+        'daily': [
+            {
+                'date': day.date().isoformat(),
+                **{name.lower(): int(count) for name, count in zip(STATUSES, counts)},
+                'attendance_rate': rate,
+            }
+            for day, counts, rate in zip(day_labels, daily_counts, daily_rates)
+        ],
+        'weekly': [
+            {
+                'week_start': pd.Timestamp(week).date().isoformat(),
+                'school_days': int(days),
+                'attendance_rate': rate,
+                'attendance_rate_change': rate_change,
+                'absences': absences,
+                'absences_change': absence_change,
+            }
+            for week, days, rate, rate_change, absences, absence_change in zip(
+                weeks, np.diff(np.append(week_first_day, len(dates))), weekly_rates, changes(weekly_rates),
+                weekly_absences, changes(weekly_absences),
+            )
+        ],
+        'by_grade': breakdown(
+            'grade', list(grades.categories), grade_codes, attended, grade_codes[first_row], chronic
+        ),
+        'by_gender': breakdown(
+            'gender', list(genders.categories), gender_codes, attended, gender_codes[first_row], chronic
+        ),
+    }
+
+
+def analyse_attendance(school_id, start, end, threshold=CHRONIC_ABSENCE_THRESHOLD):
+    """Attendance analytics for a school between two dates, cached."""
+    def compute():
+        return {
+            'start': start.isoformat(),
+            'end': end.isoformat(),
+            **analyse_frame(load_attendance(school_id, start, end), threshold),
+        }
+
+    return get_or_compute(
+        school_namespace(school_id), f'attendance-analytics:{start}:{end}:{threshold}', compute,
+        timeout=ANALYTICS_CACHE_TIMEOUT,
+    )
@@ -1,9 +1,13 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from . import api_views
 
 router = DefaultRouter()
 # Will add viewsets when implementing
 
 urlpatterns = [
     path('', include(router.urls)),
-]
\ No newline at end of file
+    path('daily/', api_views.DailyReportView.as_view(), name='daily_report'),
+    path('analytics/', api_views.AnalyticsView.as_view(), name='attendance_analytics'),
+    path('attendance-export/', api_views.AttendanceExportView.as_view(), name='attendance_export'),
+]
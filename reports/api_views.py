@@ -0,0 +1,126 @@
+import csv
+import datetime
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from schools.models import School
+from .analytics import CHRONIC_ABSENCE_THRESHOLD, analyse_attendance
+from .exports import attendance_csv_rows
+from .generators import STATUSES, build_daily_report
+
+MAX_EXPORT_DAYS = 366
+
+
+def report_school(request):
+    """The school a report is for, or None if the user may not see one."""
+    user = request.user
+    if user.role == 'SUPER_ADMIN':
+        try:
+            return School.objects.filter(id=int(request.query_params.get('school'))).first()
+        except (TypeError, ValueError):
+            return None
+    if user.role == 'SCHOOL_ADMIN':
+        return user.school
+    return None
+
+
+class DailyReportView(APIView):
+    """
+    Download a school's daily attendance report as JSON (default) or CSV
+    (``?export=csv``).
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        if request.user.role not in ['SUPER_ADMIN', 'SCHOOL_ADMIN']:
+            return Response({'error': 'Permission denied'}, status=403)
+        school = report_school(request)
+        if school is None:
+            return Response({'error': 'A valid school is required'}, status=400)
+        try:
+            date_param = request.query_params.get('date')
+            date = datetime.date.fromisoformat(date_param) if date_param else timezone.localdate()
+        except ValueError:
+            return Response({'error': 'date must be YYYY-MM-DD'}, status=400)
+
+        report = build_daily_report(school, date)
+        if request.query_params.get('export') != 'csv':
+            return Response(report)
+
+        response = HttpResponse(content_type='text/csv')
+        response['Content-Disposition'] = f'attachment; filename="attendance-{school.code}-{date}.csv"'
+        writer = csv.writer(response)
+        writer.writerow(['Grade', 'Class'] + [status.title() for status in STATUSES])
+        for row in report['classes']:
+            writer.writerow([row['grade'], row['class_name']] + [row[status.lower()] for status in STATUSES])
+        writer.writerow(['Total', ''] + [report['totals'][status.lower()] for status in STATUSES])
+        return response
+
+
+class AttendanceExportView(APIView):
+    """
+    Stream a school's attendance records between ``start`` and ``end``
+    (YYYY-MM-DD, at most a year) as CSV.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        if request.user.role not in ['SUPER_ADMIN', 'SCHOOL_ADMIN']:
+            return Response({'error': 'Permission denied'}, status=403)
+        school = report_school(request)
+        if school is None:
+            return Response({'error': 'A valid school is required'}, status=400)
+        try:
+            start = datetime.date.fromisoformat(request.query_params.get('start', ''))
+            end = datetime.date.fromisoformat(request.query_params.get('end', ''))
+        except ValueError:
+            return Response({'error': 'start and end must be YYYY-MM-DD'}, status=400)
+        if end < start or (end - start).days >= MAX_EXPORT_DAYS:
+            return Response({'error': f'The range must be 1 to {MAX_EXPORT_DAYS} days'}, status=400)
+
+        response = StreamingHttpResponse(attendance_csv_rows(school, start, end), content_type='text/csv')
+        response['Content-Disposition'] = f'attachment; filename="attendance-{school.code}-{start}-{end}.csv"'
+        return response
+
+
+class AnalyticsView(APIView):
+    """
+    Attendance analytics for a term: daily and weekly trends, chronic
+    absence and grade and gender breakdowns (see reports/analytics.py).
+    ``start`` and ``end`` (YYYY-MM-DD) default to the school's term dates;
+    ``threshold`` is the percentage of missed days that counts as chronic.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        if request.user.role not in ['SUPER_ADMIN', 'SCHOOL_ADMIN']:
+            return Response({'error': 'Permission denied'}, status=403)
+        school = report_school(request)
+        if school is None:
+            return Response({'error': 'A valid school is required'}, status=400)
+        school_settings = getattr(school, 'settings', None)
+        start = getattr(school_settings, 'term_start_date', None)
+        end = getattr(school_settings, 'term_end_date', None)
+        try:
+            if request.query_params.get('start'):
+                start = datetime.date.fromisoformat(request.query_params['start'])
+            if request.query_params.get('end'):
+                end = datetime.date.fromisoformat(request.query_params['end'])
+        except ValueError:
+            return Response({'error': 'start and end must be YYYY-MM-DD'}, status=400)
+        if not start or not end:
+            return Response({'error': 'start and end are required when no term dates are set'}, status=400)
+        if end < start or (end - start).days >= MAX_EXPORT_DAYS:
+            return Response({'error': f'The range must be 1 to {MAX_EXPORT_DAYS} days'}, status=400)
+        try:
+            threshold = float(request.query_params.get('threshold', CHRONIC_ABSENCE_THRESHOLD))
+        except ValueError:
+            threshold = None
+        if threshold is None or not 0 < threshold <= 100:
+            return Response({'error': 'threshold must be a percentage above 0'}, status=400)
+
+        return Response({'school': school.name, **analyse_attendance(school.id, start, end, threshold)})
@@ -0,0 +1,37 @@
+"""
+Streaming CSV exports.
+
+Rows are read with ``iterator()`` in chunks and written as they are
+produced, so memory stays flat however many records are exported.
+"""
+import csv
+
+from students.models import AttendanceRecord
+
+EXPORT_CHUNK_SIZE = 2000
+
+ATTENDANCE_COLUMNS = ['Date', 'Student ID', 'First name', 'Last name', 'Grade', 'Class', 'Status']
+
+
+class Echo:
+    """File-like object whose write() returns the line for streaming."""
+
+    def write(self, value):
+        return value
+
+
+def attendance_csv_rows(school, start, end):
+    """Yield CSV lines for a school's attendance records between two dates."""
+    writer = csv.writer(Echo())
+    yield writer.writerow(ATTENDANCE_COLUMNS)
+    records = (
+        AttendanceRecord.objects
+        .filter(student__school=school, date__range=(start, end))
+        .order_by('date', 'student__grade', 'student__class_name', 'student__last_name')
+        .values_list(
+            'date', 'student__student_id', 'student__first_name', 'student__last_name',
+            'student__grade', 'student__class_name', 'status',
+        )
+    )
+    for row in records.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield writer.writerow(row)
@@ -0,0 +1,88 @@
+"""
+Report creation logic.
+"""
+from django.conf import settings
+from django.core.mail import send_mail
+from django.db.models import Count, Q
+
+from students.models import AttendanceRecord, Student
+
+STATUSES = ['PRESENT', 'ABSENT', 'LATE', 'EXCUSED']
+
+
+def build_daily_report(school, date):
+    """
+    Attendance summary for a school on one date, per class and in total.
+
+    Uses one grouped query over the day's attendance and one count of
+    active students.
+    """
+    rows = (
+        AttendanceRecord.objects
+        .filter(student__school=school, date=date)
+        .values('student__grade', 'student__class_name')
+        .annotate(**{
+            status.lower(): Count('id', filter=Q(status=status)) for status in STATUSES
+        })
+        .order_by('student__grade', 'student__class_name')
+    )
+    classes = [
+        {
+            'grade': row['student__grade'],
+            'class_name': row['student__class_name'],
+            **{status.lower(): row[status.lower()] for status in STATUSES},
+        }
+        for row in rows
+    ]
+    totals = {status.lower(): sum(c[status.lower()] for c in classes) for status in STATUSES}
+    marked = sum(totals.values())
+    return {
+        'school': school.name,
+        'date': date.isoformat(),
+        'active_students': Student.objects.filter(school=school, is_active=True).count(),
+        'marked': marked,
+        'attendance_rate': round(100 * (totals['present'] + totals['late']) / marked, 1) if marked else None,
+        'totals': totals,
+        'classes': classes,
+    }
+
+
+def render_daily_report_text(report):
+    lines = [
+        f"Daily attendance report - {report['school']} - {report['date']}",
+        '',
+        f"Active students: {report['active_students']}",
+        f"Marked: {report['marked']}",
+        f"Attendance rate: {report['attendance_rate'] if report['attendance_rate'] is not None else 'n/a'}%",
+        '',
+    ]
+    lines += [f"{status.title()}: {report['totals'][status.lower()]}" for status in STATUSES]
+    lines.append('')
+    for row in report['classes']:
+        lines.append(
+            f"{row['class_name']}: {row['present']} present, {row['absent']} absent, "
+            f"{row['late']} late, {row['excused']} excused"
+        )
+    return '\n'.join(lines)
+
+
+def send_daily_report(school, date):
+    """Build a school's daily report and email it to its administrators."""
+    report = build_daily_report(school, date)
+    school_settings = getattr(school, 'settings', None)
+    if school_settings is not None and not school_settings.notify_admin_email:
+        return report
+
+    recipients = list(
+        school.users.filter(role='SCHOOL_ADMIN', is_active=True)
+        .exclude(email='')
+        .values_list('email', flat=True)
+    )
+    if recipients:
+        send_mail(
+            subject=f"Daily attendance report - {school.name} - {date:%d/%m/%Y}",
+            message=render_daily_report_text(report),
+            from_email=getattr(settings, 'DEFAULT_FROM_EMAIL', None),
+            recipient_list=recipients,
+        )
+    return report
@@ -0,0 +1,43 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from reports.scheduler import DailyReportScheduler
+
+
+class Command(BaseCommand):
+    help = "Run the daily report scheduler, firing each school's report at its daily_report_time"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true',
+                            help='Fire any reports that are due now and exit')
+        parser.add_argument('--refresh-interval', type=int, default=60,
+                            help='Seconds between checks for changed school settings')
+
+    def handle(self, *args, **options):
+        scheduler = DailyReportScheduler()
+        scheduler.rebuild()
+
+        if options['once']:
+            fired = scheduler.run_due()
+            self.stdout.write(self.style.SUCCESS(f'Fired {fired} daily report(s)'))
+            return
+
+        refresh_interval = max(options['refresh_interval'], 1)
+        next_refresh = time.monotonic() + refresh_interval
+        self.stdout.write(f'Scheduling daily reports for {len(scheduler.heap)} school(s)')
+        while True:
+            if time.monotonic() >= next_refresh:
+                scheduler.refresh_if_changed()
+                next_refresh = time.monotonic() + refresh_interval
+
+            fired = scheduler.run_due()
+            if fired:
+                self.stdout.write(f'Fired {fired} daily report(s)')
+
+            next_due = scheduler.next_due()
+            sleep_for = next_refresh - time.monotonic()
+            if next_due is not None:
+                sleep_for = min(sleep_for, (next_due - timezone.now()).total_seconds())
+            time.sleep(max(sleep_for, 0.5))
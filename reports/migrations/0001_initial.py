@@ -0,0 +1,35 @@
+# Generated by Django 4.2.17 on 2026-10-19 13:14
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('schools', '0003_schoolsettings_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyReportRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('report_date', models.DateField()),
+                ('status', models.CharField(choices=[('RUNNING', 'Running'), ('COMPLETED', 'Completed'), ('FAILED', 'Failed')], default='RUNNING', max_length=10)),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('error', models.TextField(blank=True)),
+                ('school', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_report_runs', to='schools.school')),
+            ],
+            options={
+                'ordering': ['-report_date', 'school'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dailyreportrun',
+            constraint=models.UniqueConstraint(fields=('school', 'report_date'), name='unique_daily_report_per_school'),
+        ),
+    ]
@@ -1,2 +1,30 @@
 from django.db import models
-# Placeholder - will be implemented in later phases
\ No newline at end of file
+from schools.models import School
+
+
+class DailyReportRun(models.Model):
+    """
+    Record of a school's daily report for one date. The unique constraint
+    makes each report fire at most once per day across scheduler restarts.
+    """
+    STATUS_CHOICES = [
+        ('RUNNING', 'Running'),
+        ('COMPLETED', 'Completed'),
+        ('FAILED', 'Failed'),
+    ]
+
+    school = models.ForeignKey(School, on_delete=models.CASCADE, related_name='daily_report_runs')
+    report_date = models.DateField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='RUNNING')
+    started_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    error = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ['-report_date', 'school']
+        constraints = [
+            models.UniqueConstraint(fields=['school', 'report_date'], name='unique_daily_report_per_school'),
+        ]
+
+    def __str__(self):
+        return f"Daily report for {self.school.code} on {self.report_date}"
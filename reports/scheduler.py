@@ -0,0 +1,108 @@
+"""
+Time-ordered scheduler for per-school daily reports.
+
+Each school's ``SchoolSettings.daily_report_time`` is a wall-clock time in
+``settings.TIME_ZONE``. The scheduler keeps a min-heap of (due time, school)
+entries so the next due report is found in O(log n) instead of scanning
+every school each minute. The heap is rebuilt when the settings table
+changes, detected with one cheap aggregate query.
+
+Each firing is claimed by inserting a DailyReportRun row, whose unique
+(school, report_date) constraint guarantees one report per school per
+day even if the scheduler restarts or two schedulers run at once.
+"""
+import datetime
+import heapq
+import logging
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from schools.models import SchoolSettings
+from .generators import send_daily_report
+from .models import DailyReportRun
+
+logger = logging.getLogger('attendance_system')
+
+
+def due_at(report_time, date, tz):
+    """Aware datetime for ``report_time`` on ``date`` in ``tz``."""
+    return datetime.datetime.combine(date, report_time, tzinfo=tz)
+
+
+class DailyReportScheduler:
+    def __init__(self, job=send_daily_report, tz=None):
+        self.job = job
+        self.tz = tz or timezone.get_current_timezone()
+        self.heap = []
+        self.fingerprint = None
+
+    def settings_fingerprint(self):
+        """Changes whenever a settings row is added, removed or edited."""
+        summary = SchoolSettings.objects.filter(school__is_active=True).aggregate(
+            total=Count('id'), changed=Max('updated_at')
+        )
+        return summary['total'], summary['changed']
+
+    def rebuild(self, now=None):
+        """Recreate the due queue from the current settings."""
+        now = now or timezone.now()
+        today = now.astimezone(self.tz).date()
+        done_today = set(
+            DailyReportRun.objects.filter(report_date=today).values_list('school_id', flat=True)
+        )
+        self.heap = []
+        for school_id, report_time in SchoolSettings.objects.filter(
+                school__is_active=True).values_list('school_id', 'daily_report_time'):
+            # Reports missed today (e.g. while restarting) become due immediately
+            date = today if school_id not in done_today else today + datetime.timedelta(days=1)
+            self.heap.append((due_at(report_time, date, self.tz), school_id, report_time))
+        heapq.heapify(self.heap)
+        self.fingerprint = self.settings_fingerprint()
+        logger.info('Daily report scheduler loaded %d school(s)', len(self.heap))
+
+    def refresh_if_changed(self, now=None):
+        if self.fingerprint is None or self.settings_fingerprint() != self.fingerprint:
+            self.rebuild(now)
+            return True
+        return False
+
+    def next_due(self):
+        """The earliest due time, or None if nothing is scheduled."""
+        return self.heap[0][0] if self.heap else None
+
+    def claim(self, school_id, date):
+        try:
+            with transaction.atomic():
+                return DailyReportRun.objects.create(school_id=school_id, report_date=date)
+        except IntegrityError:
+            return None
+
+    def run_due(self, now=None):
+        """Fire every report due at or before ``now``. Returns the number fired."""
+        now = now or timezone.now()
+        fired = 0
+        while self.heap and self.heap[0][0] <= now:
+            due, school_id, report_time = heapq.heappop(self.heap)
+            date = due.astimezone(self.tz).date()
+            run = self.claim(school_id, date)
+            if run is not None:
+                self.execute(run)
+                fired += 1
+            heapq.heappush(
+                self.heap,
+                (due_at(report_time, date + datetime.timedelta(days=1), self.tz), school_id, report_time),
+            )
+        return fired
+
+    def execute(self, run):
+        try:
+            self.job(run.school, run.report_date)
+            run.status = 'COMPLETED'
+        except Exception as exc:
+            logger.exception('Daily report for school %s failed', run.school_id)
+            run.status = 'FAILED'
+            run.error = str(exc)
+        run.completed_at = timezone.now()
+        run.save(update_fields=['status', 'error', 'completed_at'])
@@ -1,7 +1,8 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.utils.html import format_html
-from .models import School, Zone, User, SchoolSettings
+from .models import School, Zone, User, SchoolSettings, FixtureLoad
+from .paginators import EstimatedCountPaginator
 
 
 @admin.register(School)
@@ -46,6 +47,7 @@ class ZoneAdmin(admin.ModelAdmin):
     list_display = ['name', 'school', 'created_at']
     list_filter = ['school', 'created_at']
     search_fields = ['name', 'school__name']
+    list_select_related = ['school']
     
     def get_queryset(self, request):
         qs = super().get_queryset(request)
@@ -67,6 +69,10 @@ class UserAdmin(BaseUserAdmin):
     list_display = ['username', 'get_full_name', 'employee_number', 'role', 'school', 'is_active', 'last_login']
     list_filter = ['role', 'school', 'is_active', 'is_staff', 'date_joined']
     search_fields = ['username', 'first_name', 'last_name', 'employee_number', 'email']
+    list_select_related = ['school']
+    autocomplete_fields = ['assigned_zones']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     
     fieldsets = BaseUserAdmin.fieldsets + (
         ('Legacy Academy Fields', {
@@ -113,6 +119,7 @@ class UserAdmin(BaseUserAdmin):
 class SchoolSettingsAdmin(admin.ModelAdmin):
     list_display = ['school', 'absence_threshold_days', 'auto_generate_visits', 'notify_parents_sms']
     list_filter = ['auto_generate_visits', 'notify_parents_sms', 'notify_admin_email']
+    list_select_related = ['school']
     
     fieldsets = (
         ('Attendance Monitoring', {
@@ -142,4 +149,10 @@ class SchoolSettingsAdmin(admin.ModelAdmin):
         if db_field.name == "school":
             if request.user.role != 'SUPER_ADMIN' and request.user.school:
                 kwargs["queryset"] = School.objects.filter(id=request.user.school.id)
-        return super().formfield_for_foreignkey(db_field, request, **kwargs)
\ No newline at end of file
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+
+@admin.register(FixtureLoad)
+class FixtureLoadAdmin(admin.ModelAdmin):
+    list_display = ['name', 'content_hash', 'object_count', 'duration_ms', 'loaded_at']
+    readonly_fields = [field.name for field in FixtureLoad._meta.fields]
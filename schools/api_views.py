@@ -1,9 +1,13 @@
 from rest_framework import viewsets, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.db.models import Q
+from django.db.models import Count, Q
+from students.models import Student
 from .models import School, Zone, User
+from .fast_serializers import FastListMixin, SchoolValuesSerializer, UserValuesSerializer, ZoneValuesSerializer
 from .serializers import SchoolSerializer, ZoneSerializer, UserSerializer
+from .statistics import count_per_school, network_statistics, school_statistics
+from .zone_assignments import ZoneAssignmentError, apply_zone_assignments, parse_assignments
 
 
 class SchoolIsolationMixin:
@@ -23,21 +27,29 @@ class SchoolIsolationMixin:
         return queryset
 
 
-class SchoolViewSet(SchoolIsolationMixin, viewsets.ModelViewSet):
+class SchoolViewSet(SchoolIsolationMixin, FastListMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing schools.
     Super admins can see all schools, others see only their own.
     """
     queryset = School.objects.all()
     serializer_class = SchoolSerializer
+    fast_serializer_class = SchoolValuesSerializer
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
         if self.request.user.role == 'SUPER_ADMIN':
-            return School.objects.all()
-        if self.request.user.school:
-            return School.objects.filter(id=self.request.user.school.id)
-        return School.objects.none()
+            queryset = School.objects.all()
+        elif self.request.user.school:
+            queryset = School.objects.filter(id=self.request.user.school.id)
+        else:
+            return School.objects.none()
+        # Counts for SchoolSerializer, computed in the list query instead of per school
+        return queryset.annotate(
+            total_students=count_per_school(Student.objects.filter(is_active=True)),
+            total_teachers=count_per_school(User.objects.filter(role='TEACHER', is_active=True)),
+            total_zones=count_per_school(Zone.objects.all()),
+        )
     
     @action(detail=True, methods=['get'])
     def statistics(self, request, pk=None):
@@ -48,24 +60,30 @@ class SchoolViewSet(SchoolIsolationMixin, viewsets.ModelViewSet):
         if not request.user.can_access_school(school):
             return Response({'error': 'Permission denied'}, status=403)
         
-        stats = {
-            'total_students': school.students.filter(is_active=True).count() if hasattr(school, 'students') else 0,
-            'total_teachers': school.users.filter(role='TEACHER', is_active=True).count(),
-            'total_field_officers': school.users.filter(role='FIELD_OFFICER', is_active=True).count(),
-            'total_zones': school.zones.count(),
-        }
-        
-        return Response(stats)
+        return Response(school_statistics(school.id))
+
+    @action(detail=False, methods=['get'])
+    def overview(self, request):
+        """Figures of every school and their totals, for super admins."""
+        if request.user.role != 'SUPER_ADMIN':
+            return Response({'error': 'Permission denied'}, status=403)
+        return Response(network_statistics())
 
 
-class ZoneViewSet(SchoolIsolationMixin, viewsets.ModelViewSet):
+class ZoneViewSet(SchoolIsolationMixin, FastListMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing zones within a school.
     """
     queryset = Zone.objects.all()
     serializer_class = ZoneSerializer
+    fast_serializer_class = ZoneValuesSerializer
     permission_classes = [permissions.IsAuthenticated]
     
+    def get_queryset(self):
+        return super().get_queryset().select_related('school').annotate(
+            assigned_officers_count=Count('assigned_officers')
+        ).order_by(*Zone._meta.ordering)
+    
     def perform_create(self, serializer):
         # Auto-assign school for non-super admins
         if self.request.user.role != 'SUPER_ADMIN':
@@ -74,27 +92,30 @@ class ZoneViewSet(SchoolIsolationMixin, viewsets.ModelViewSet):
             serializer.save()
 
 
-class UserViewSet(SchoolIsolationMixin, viewsets.ModelViewSet):
+class UserViewSet(SchoolIsolationMixin, FastListMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing users within a school.
     """
     queryset = User.objects.all()
     serializer_class = UserSerializer
+    fast_serializer_class = UserValuesSerializer
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
         if self.request.user.role == 'SUPER_ADMIN':
-            return User.objects.all()
-        if self.request.user.school:
-            return User.objects.filter(school=self.request.user.school)
-        return User.objects.none()
+            queryset = User.objects.all()
+        elif self.request.user.school:
+            queryset = User.objects.filter(school=self.request.user.school)
+        else:
+            return User.objects.none()
+        return queryset.select_related('school').prefetch_related('assigned_zones')
     
     @action(detail=False, methods=['get'])
     def field_officers(self, request):
         """Get all field officers for the user's school."""
-        queryset = self.get_queryset().filter(role='FIELD_OFFICER', is_active=True)
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        serializer = UserValuesSerializer(context=self.get_serializer_context())
+        rows = serializer.values(self.get_queryset().filter(role='FIELD_OFFICER', is_active=True))
+        return Response(serializer.serialize(rows))
     
     @action(detail=True, methods=['post'])
     def assign_zones(self, request, pk=None):
@@ -107,13 +128,54 @@ class UserViewSet(SchoolIsolationMixin, viewsets.ModelViewSet):
         zone_ids = request.data.get('zone_ids', [])
         
         # Validate zones belong to user's school
-        zones = Zone.objects.filter(
+        zones = list(Zone.objects.filter(
             id__in=zone_ids,
             school=user.school
-        )
+        ).values_list('id', flat=True))
+        
+        apply_zone_assignments(user.school, {user.id: zones}, validate=False)
+        
+        return Response({
+            'message': f'Assigned {len(zones)} zones to {user.get_full_name()}'
+        })
+    
+    @action(detail=False, methods=['post'])
+    def bulk_assign_zones(self, request):
+        """
+        Set the zones of many field officers at once.
+        
+        Expects {"assignments": {"<officer id>": [<zone id>, ...]}} and, for
+        super admins, the "school" the officers and zones belong to.
+        """
+        if request.user.role not in ['SUPER_ADMIN', 'SCHOOL_ADMIN']:
+            return Response({'error': 'Permission denied'}, status=403)
+        
+        if request.user.role == 'SUPER_ADMIN':
+            try:
+                school = School.objects.filter(id=int(request.data.get('school'))).first()
+            except (TypeError, ValueError):
+                school = None
+            if school is None:
+                return Response({'error': 'A valid school is required'}, status=400)
+        else:
+            school = request.user.school
+        
+        try:
+            assignments = parse_assignments(request.data.get('assignments'))
+        except (TypeError, ValueError) as e:
+            return Response({'error': str(e)}, status=400)
         
-        user.assigned_zones.set(zones)
+        try:
+            result = apply_zone_assignments(school, assignments)
+        except ZoneAssignmentError as e:
+            return Response({
+                'error': str(e),
+                'invalid_officers': e.invalid_officers,
+                'invalid_zones': e.invalid_zones,
+            }, status=400)
         
         return Response({
-            'message': f'Assigned {zones.count()} zones to {user.get_full_name()}'
+            'message': f'Updated zones for {len(assignments)} field officers',
+            'added': result.added,
+            'removed': result.removed,
         })
\ No newline at end of file
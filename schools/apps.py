@@ -4,4 +4,7 @@ from django.apps import AppConfig
 class SchoolsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'schools'
-    verbose_name = 'School Management'
\ No newline at end of file
+    verbose_name = 'School Management'
+
+    def ready(self):
+        from . import signals  # noqa: F401
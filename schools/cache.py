@@ -0,0 +1,109 @@
+"""
+Shared cache with per-school namespaces.
+
+Cached values live in a namespace: ``school:<id>`` for data derived from
+one school's students, staff, zones and settings, and ``reference`` for
+data spanning schools. Every key embeds its namespace's current version,
+so invalidating a namespace is one write that replaces the version; the
+old entries are never read again and age out of the cache. Versions are
+random tokens rather than counters, so a version key that was evicted
+and recreated can never bring old entries back.
+
+get_or_compute() is the read API. When a key is missing, one caller
+computes it while holding a short lock and the others poll briefly for
+the result, so a popular key expiring does not send every worker to the
+database at once.
+"""
+import time
+import uuid
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+SCHOOL_CACHE_ALIAS = getattr(settings, 'SCHOOL_CACHE_ALIAS', 'default')
+SCHOOL_CACHE_TIMEOUT = getattr(settings, 'SCHOOL_CACHE_TIMEOUT', 600)
+# How long a computing caller may hold the lock, and how long others wait
+LOCK_TIMEOUT = 30
+LOCK_WAIT = 5
+
+REFERENCE = 'reference'
+
+_MISSING = object()
+
+
+def get_cache():
+    return caches[SCHOOL_CACHE_ALIAS]
+
+
+def school_namespace(school_id):
+    return f'school:{school_id}'
+
+
+def new_version():
+    return uuid.uuid4().hex[:12]
+
+
+def namespace_version(namespace, cache=None):
+    cache = cache or get_cache()
+    key = f'ns:{namespace}'
+    version = cache.get(key)
+    if version is None:
+        # Concurrent first readers agree on whichever version was added first
+        cache.add(key, new_version(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def get_or_compute(namespace, key, compute, timeout=None):
+    """
+    The cached value of ``key`` in ``namespace``, computing and storing it
+    with ``compute()`` on a miss. ``timeout`` defaults to
+    SCHOOL_CACHE_TIMEOUT seconds.
+    """
+    cache = get_cache()
+    timeout = SCHOOL_CACHE_TIMEOUT if timeout is None else timeout
+    # Keys may contain class names etc.; keep them valid for every backend
+    full_key = f'{namespace}:{namespace_version(namespace, cache)}:{quote(key, safe=":")}'
+    value = cache.get(full_key, _MISSING)
+    if value is not _MISSING:
+        return value
+
+    lock_key = f'{full_key}:lock'
+    if cache.add(lock_key, 1, LOCK_TIMEOUT):
+        try:
+            value = compute()
+            cache.set(full_key, value, timeout)
+        finally:
+            cache.delete(lock_key)
+        return value
+
+    deadline = time.monotonic() + LOCK_WAIT
+    delay = 0.01
+    while time.monotonic() < deadline:
+        time.sleep(delay)
+        delay = min(delay * 2, 0.2)
+        value = cache.get(full_key, _MISSING)
+        if value is not _MISSING:
+            return value
+    # The lock holder is slow or gone; answer without waiting longer
+    return compute()
+
+
+def invalidate(*namespaces):
+    """
+    Drop every entry of ``namespaces``. Inside a transaction this waits for
+    the commit, so no other process can re-cache the old rows meanwhile.
+    """
+    if not namespaces:
+        return
+
+    def bump():
+        get_cache().set_many({f'ns:{namespace}': new_version() for namespace in namespaces}, timeout=None)
+
+    transaction.on_commit(bump)
+
+
+def invalidate_schools(school_ids):
+    invalidate(*(school_namespace(school_id) for school_id in set(school_ids) if school_id is not None))
@@ -0,0 +1,183 @@
+"""
+Read-only list serialization from values() rows.
+
+A ModelSerializer list builds a model instance per row and then resolves
+every field through ``get_attribute`` and ``to_representation``. For long
+lists that dominates the response time. A ValuesSerializer produces the
+same output as its ``serializer_class`` from the rows of a values()
+query:
+
+- The reference serializer's fields are compiled once per class into
+  (name, values() lookup, converter) entries.
+- Fields whose model value already has the output type are copied as-is.
+- Other fields use the reference field's own ``to_representation``, so
+  dates, times and decimals come out exactly as DRF renders them.
+- Fields sourced through a relation that is null are left out, or take
+  their default, exactly as DRF does.
+- Method fields and many-to-many fields are produced by ``get_<name>(row)``
+  on the subclass, and ``prepare(rows)`` can load related data for them in
+  one query.
+
+``manage.py check_fast_serializers`` renders every list with both
+serializers and fails if the JSON differs by a single byte.
+"""
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import serializers
+from rest_framework.fields import empty
+from rest_framework.mixins import ListModelMixin
+from rest_framework.response import Response
+
+from .models import User
+from .serializers import SchoolSerializer, UserSerializer, ZoneSerializer
+
+# Fields whose to_representation returns model values of these types unchanged
+IDENTITY_FIELDS = (serializers.IntegerField, serializers.CharField, serializers.EmailField, serializers.BooleanField)
+
+_SKIP = object()
+
+
+def missing_relation_value(field):
+    """What DRF outputs for ``field`` when a relation on its source path is null."""
+    if field.default is not empty:
+        default = field.get_default()
+        return None if default is None else field.to_representation(default)
+    if field.allow_null:
+        return None
+    return _SKIP
+
+
+class ValuesSerializer:
+    serializer_class = None
+    # Output fields produced by a get_<name>(row) method
+    computed = ()
+    # Output field -> values() lookup, where it is not the field's source
+    sources = {}
+    # Extra values() lookups the get_<name>() methods need
+    extra_values = ()
+
+    def __init__(self, context=None):
+        self.context = context or {}
+
+    @classmethod
+    def compile(cls):
+        """
+        ([(name, lookup, convert, guards, missing)], lookups). ``guards`` are
+        the lookups of the relations on the source path; when one is null
+        the field becomes ``missing``, or is left out if that is _SKIP.
+        """
+        reference = cls.serializer_class()
+        fields, lookups = [], set(cls.extra_values)
+        for name, field in reference.fields.items():
+            if field.write_only:
+                continue
+            if name in cls.computed:
+                # Read from get_<name>() when serializing
+                fields.append((name, None, None, (), None))
+                continue
+            if isinstance(field, serializers.ManyRelatedField) or (
+                    not isinstance(field, serializers.SerializerMethodField) and field.source.startswith('get_')):
+                raise ImproperlyConfigured(f'{cls.__name__} must compute {name!r} with get_{name}()')
+            guards = ()
+            if isinstance(field, serializers.SerializerMethodField):
+                # Only valid for values annotated on the queryset
+                lookup, convert = cls.sources.get(name, name), None
+            else:
+                lookup = cls.sources.get(name, field.source.replace('.', '__'))
+                convert = None if type(field) in IDENTITY_FIELDS or (
+                    isinstance(field, serializers.PrimaryKeyRelatedField) and field.pk_field is None
+                ) else field.to_representation
+                path = field.source_attrs
+                guards = tuple('__'.join(path[:depth]) for depth in range(1, len(path)))
+            lookups.add(lookup)
+            lookups.update(guards)
+            fields.append((name, lookup, convert, guards, missing_relation_value(field) if guards else None))
+        return fields, sorted(lookups)
+
+    @classmethod
+    def compiled(cls):
+        if '_compiled' not in cls.__dict__:
+            cls._compiled = cls.compile()
+        return cls._compiled
+
+    def values(self, queryset):
+        """``queryset`` as the values() rows serialize() expects."""
+        return queryset.prefetch_related(None).values(*self.compiled()[1])
+
+    def prepare(self, rows):
+        """Load whatever the get_<name>() methods need for ``rows``."""
+
+    def serialize(self, rows):
+        rows = list(rows)
+        self.prepare(rows)
+        fields = [
+            (name, lookup, convert, guards, missing, getattr(self, f'get_{name}') if lookup is None else None)
+            for name, lookup, convert, guards, missing in self.compiled()[0]
+        ]
+        data = []
+        for row in rows:
+            item = {}
+            for name, lookup, convert, guards, missing, method in fields:
+                if method:
+                    item[name] = method(row)
+                    continue
+                if guards and any(row[guard] is None for guard in guards):
+                    if missing is not _SKIP:
+                        item[name] = missing
+                    continue
+                value = row[lookup]
+                item[name] = value if convert is None or value is None else convert(value)
+            data.append(item)
+        return data
+
+
+class FastListMixin(ListModelMixin):
+    """Lists with ``fast_serializer_class``; every other action keeps ``serializer_class``."""
+    fast_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        serializer = self.fast_serializer_class(context=self.get_serializer_context())
+        rows = serializer.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(serializer.serialize(page))
+        return Response(serializer.serialize(rows))
+
+
+class SchoolValuesSerializer(ValuesSerializer):
+    """SchoolSerializer for SchoolViewSet's queryset, which annotates the counts."""
+    serializer_class = SchoolSerializer
+
+
+class ZoneValuesSerializer(ValuesSerializer):
+    """ZoneSerializer for ZoneViewSet's queryset, which annotates the officer count."""
+    serializer_class = ZoneSerializer
+
+
+class UserValuesSerializer(ValuesSerializer):
+    serializer_class = UserSerializer
+    computed = ('full_name', 'role_display', 'assigned_zones', 'assigned_zones_count')
+
+    ROLE_LABELS = {value: str(label) for value, label in User.ROLE_CHOICES}
+
+    def prepare(self, rows):
+        # Zone ids in the order of Zone.Meta.ordering, as the prefetch gives them
+        self.zones = {row['id']: [] for row in rows}
+        through = User.assigned_zones.through
+        for user_id, zone_id in (
+            through.objects.filter(user_id__in=list(self.zones))
+            .order_by('zone__school_id', 'zone__name').values_list('user_id', 'zone_id')
+        ):
+            self.zones[user_id].append(zone_id)
+
+    def get_full_name(self, row):
+        # AbstractUser.get_full_name()
+        return f"{row['first_name']} {row['last_name']}".strip()
+
+    def get_role_display(self, row):
+        return self.ROLE_LABELS.get(row['role'], row['role'])
+
+    def get_assigned_zones(self, row):
+        return self.zones[row['id']]
+
+    def get_assigned_zones_count(self, row):
+        return len(self.zones[row['id']])
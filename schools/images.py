@@ -0,0 +1,123 @@
+"""
+Image compression stage shared by uploaded photos.
+
+render_variants() decodes an upload once and applies its EXIF orientation.
+It then re-encodes one image per requested size as WebP (JPEG when Pillow
+lacks WebP support) without any metadata, so camera EXIF, including GPS
+positions, never reaches /media/. Each variant is stored under a name
+derived from its content hash, which means a URL always refers to the same
+bytes and can be cached by browsers forever (see the /media/ rules in
+nginx.conf). Identical uploads share the same files.
+
+Processing is CPU-heavy, so callers run it off the request with
+run_in_background() or from a management command.
+"""
+import hashlib
+import io
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connections
+from PIL import Image, ImageOps, UnidentifiedImageError, features
+
+IMAGE_FORMAT = getattr(settings, 'IMAGE_FORMAT', 'WEBP')
+IMAGE_QUALITY = getattr(settings, 'IMAGE_QUALITY', 80)
+IMAGE_WORKERS = getattr(settings, 'IMAGE_WORKERS', 1)
+# Larger images are rejected before decoding
+IMAGE_MAX_PIXELS = getattr(settings, 'IMAGE_MAX_PIXELS', 50_000_000)
+
+EXTENSIONS = {'WEBP': 'webp', 'JPEG': 'jpg'}
+
+logger = logging.getLogger('attendance_system')
+
+_executor = None
+
+
+class ImageError(ValueError):
+    """The upload is not an image Pillow can decode, or is too large."""
+
+
+def output_format():
+    if IMAGE_FORMAT == 'WEBP' and not features.check('webp'):
+        return 'JPEG'
+    return IMAGE_FORMAT
+
+
+def load_image(file):
+    """Decode ``file`` upright and in RGB, ready to resize."""
+    try:
+        image = Image.open(file)
+        if image.width * image.height > IMAGE_MAX_PIXELS:
+            raise ImageError(f'Image is {image.width}x{image.height}, larger than allowed')
+        image = ImageOps.exif_transpose(image)
+        if image.mode in ('RGBA', 'LA', 'P'):
+            image = image.convert('RGBA')
+            background = Image.new('RGB', image.size, 'white')
+            background.paste(image, mask=image.getchannel('A'))
+            return background
+        return image.convert('RGB')
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError) as exc:
+        raise ImageError(str(exc)) from exc
+
+
+def encode(image, max_side, image_format=None):
+    """``image`` scaled to fit ``max_side`` pixels, encoded without metadata."""
+    image_format = image_format or output_format()
+    resized = image.copy()
+    resized.thumbnail((max_side, max_side), Image.LANCZOS)
+    buffer = io.BytesIO()
+    if image_format == 'WEBP':
+        resized.save(buffer, 'WEBP', quality=IMAGE_QUALITY, method=4)
+    else:
+        resized.save(buffer, 'JPEG', quality=IMAGE_QUALITY, optimize=True, progressive=True)
+    return buffer.getvalue()
+
+
+def store(prefix, data, extension):
+    """Save ``data`` under ``prefix`` named by its content hash; returns the name."""
+    name = f'{prefix}/{hashlib.sha256(data).hexdigest()[:20]}.{extension}'
+    if not default_storage.exists(name):
+        saved = default_storage.save(name, ContentFile(data))
+        if saved != name:
+            # Another process stored the same bytes meanwhile
+            default_storage.delete(saved)
+    return name
+
+
+def render_variants(file, variants, prefix):
+    """
+    Store one re-encoded copy of ``file`` per entry of ``variants`` (name to
+    longest side in pixels) as ``<prefix>/<name>/<hash>.<ext>``. Returns
+    {name: stored name}; raises ImageError if ``file`` is not an image.
+    """
+    image = load_image(file)
+    image_format = output_format()
+    extension = EXTENSIONS[image_format]
+    return {
+        variant: store(f'{prefix}/{variant}', encode(image, max_side, image_format), extension)
+        for variant, max_side in variants.items()
+    }
+
+
+def run_in_background(func, *args):
+    """
+    Run ``func(*args)`` on this process's image worker thread. Jobs lost to
+    a restart must be picked up by a management command, so ``func`` should
+    work from state saved in the database.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=IMAGE_WORKERS, thread_name_prefix='images')
+
+    def job():
+        try:
+            func(*args)
+        except Exception:
+            logger.exception('Background image job %s failed', getattr(func, '__name__', func))
+        finally:
+            connections.close_all()
+
+    return _executor.submit(job)
@@ -0,0 +1,46 @@
+import glob
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from schools.fixture_loader import FixtureLoadError, load_fixture_set
+
+DEFAULT_FIXTURES = os.path.join(settings.BASE_DIR, 'fixtures', '*.json')
+
+
+class Command(BaseCommand):
+    help = (
+        'Load an ordered set of JSON fixtures in one process and one transaction with bulk '
+        'upserts, skipping the load when the same contents were already loaded'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('fixtures', nargs='*',
+                            help='Fixture files or globs, loaded in name order (default: fixtures/*.json)')
+        parser.add_argument('--name', default='default', help='Name the load is recorded under')
+        parser.add_argument('--force', action='store_true', help='Load even if this content was already loaded')
+        parser.add_argument('--database', default='default', help='Database alias to load into')
+
+    def handle(self, *args, **options):
+        paths = []
+        for pattern in options['fixtures'] or [DEFAULT_FIXTURES]:
+            matches = sorted(glob.glob(pattern))
+            if not matches:
+                raise CommandError(f'No fixture files match {pattern}')
+            paths += [path for path in matches if path not in paths]
+
+        try:
+            result = load_fixture_set(paths, name=options['name'], force=options['force'],
+                                      using=options['database'])
+        except FixtureLoadError as e:
+            raise CommandError(str(e))
+
+        if result.skipped:
+            self.stdout.write(f'Fixture set "{options["name"]}" unchanged ({result.content_hash[:12]}), skipped')
+            return
+        for label, count in result.counts.items():
+            self.stdout.write(f'  {label}: {count}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Loaded {result.total} objects from {len(paths)} file(s) in {result.duration_ms} ms'
+        ))
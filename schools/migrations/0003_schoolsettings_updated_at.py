@@ -0,0 +1,18 @@
+# Generated by Django 4.2.17 on 2026-10-19 13:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schools', '0002_alter_user_employee_number'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='schoolsettings',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.17 on 2026-10-19 13:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schools', '0003_schoolsettings_updated_at'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='user',
+            options={'ordering': ['school_id', 'last_name', 'first_name']},
+        ),
+        migrations.AlterModelOptions(
+            name='zone',
+            options={'ordering': ['school_id', 'name']},
+        ),
+        migrations.RemoveIndex(
+            model_name='user',
+            name='schools_use_school__486ddc_idx',
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['school', 'last_name', 'first_name'], name='schools_use_school__b651e7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['school', 'role', 'last_name', 'first_name'], name='schools_use_school__958a92_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='zone',
+            index=models.Index(fields=['school', 'name'], name='schools_zon_school__04f4a1_idx'),
+        ),
+    ]
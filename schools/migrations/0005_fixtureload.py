@@ -0,0 +1,28 @@
+# Generated by Django 4.2.17 on 2026-10-19 13:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schools', '0004_ordering_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FixtureLoad',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('content_hash', models.CharField(max_length=64)),
+                ('object_count', models.PositiveIntegerField(default=0)),
+                ('duration_ms', models.PositiveIntegerField(default=0)),
+                ('loaded_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-loaded_at'],
+                'indexes': [models.Index(fields=['name', 'content_hash'], name='schools_fix_name_c257d8_idx')],
+            },
+        ),
+    ]
@@ -74,7 +74,10 @@ class Zone(models.Model):
     
     class Meta:
         unique_together = ['name', 'school']
-        ordering = ['school', 'name']
+        ordering = ['school_id', 'name']
+        indexes = [
+            models.Index(fields=['school', 'name']),
+        ]
     
     def __str__(self):
         return f"{self.school.code} - {self.name}"
@@ -131,11 +134,13 @@ class User(AbstractUser):
     )
     
     class Meta:
-        ordering = ['school', 'last_name', 'first_name']
+        ordering = ['school_id', 'last_name', 'first_name']
         indexes = [
             models.Index(fields=['employee_number']),
             models.Index(fields=['role']),
-            models.Index(fields=['school', 'role']),
+            # Tenant-first indexes ending in Meta.ordering
+            models.Index(fields=['school', 'last_name', 'first_name']),
+            models.Index(fields=['school', 'role', 'last_name', 'first_name']),
         ]
     
     def __str__(self):
@@ -220,9 +225,32 @@ class SchoolSettings(models.Model):
     term_start_date = models.DateField(null=True, blank=True)
     term_end_date = models.DateField(null=True, blank=True)
     
+    updated_at = models.DateTimeField(auto_now=True)
+    
     class Meta:
         verbose_name = "School Settings"
         verbose_name_plural = "School Settings"
     
     def __str__(self):
-        return f"Settings for {self.school.name}"
\ No newline at end of file
+        return f"Settings for {self.school.name}"
+
+
+class FixtureLoad(models.Model):
+    """
+    Record of a fixture set loaded by the load_fixture_set command, keyed
+    by a hash of the fixture files so an unchanged set is not reloaded.
+    """
+    name = models.CharField(max_length=100)
+    content_hash = models.CharField(max_length=64)
+    object_count = models.PositiveIntegerField(default=0)
+    duration_ms = models.PositiveIntegerField(default=0)
+    loaded_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['-loaded_at']
+        indexes = [
+            models.Index(fields=['name', 'content_hash']),
+        ]
+    
+    def __str__(self):
+        return f"{self.name} ({self.content_hash[:12]})"
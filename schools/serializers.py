@@ -20,13 +20,21 @@ class SchoolSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['created_at', 'updated_at']
     
+    # SchoolViewSet annotates these counts; the queries are the fallback
+    # for instances that were not loaded through it
     def get_total_students(self, obj):
+        if hasattr(obj, 'total_students'):
+            return obj.total_students
         return obj.students.filter(is_active=True).count() if hasattr(obj, 'students') else 0
     
     def get_total_teachers(self, obj):
+        if hasattr(obj, 'total_teachers'):
+            return obj.total_teachers
         return obj.users.filter(role='TEACHER', is_active=True).count()
     
     def get_total_zones(self, obj):
+        if hasattr(obj, 'total_zones'):
+            return obj.total_zones
         return obj.zones.count()
 
 
@@ -45,6 +53,8 @@ class ZoneSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at']
     
     def get_assigned_officers_count(self, obj):
+        if hasattr(obj, 'assigned_officers_count'):
+            return obj.assigned_officers_count
         return obj.assigned_officers.count()
 
 
@@ -74,7 +84,8 @@ class UserSerializer(serializers.ModelSerializer):
         return obj.get_full_name()
     
     def get_assigned_zones_count(self, obj):
-        return obj.assigned_zones.count()
+        # len() uses the prefetched zones when UserViewSet loaded them
+        return len(obj.assigned_zones.all())
     
     def create(self, validated_data):
         password = validated_data.pop('password', None)
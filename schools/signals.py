@@ -0,0 +1,32 @@
+"""
+Cache invalidation for school data.
+
+Saving or deleting a school's zones, staff or settings drops that school's
+cached entries (see schools.cache); saving a school also drops the
+cross-school reference data. Bulk writes bypass these signals and call
+schools.cache.invalidate_schools() themselves.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import REFERENCE, invalidate, invalidate_schools, school_namespace
+from .models import School, SchoolSettings, User, Zone
+
+
+@receiver([post_save, post_delete], sender=School)
+def school_changed(sender, instance, **kwargs):
+    invalidate(REFERENCE, school_namespace(instance.pk))
+
+
+@receiver([post_save, post_delete], sender=Zone)
+@receiver([post_save, post_delete], sender=SchoolSettings)
+def school_data_changed(sender, instance, **kwargs):
+    invalidate_schools([instance.school_id])
+
+
+@receiver([post_save, post_delete], sender=User)
+def user_changed(sender, instance, update_fields=None, **kwargs):
+    # Every login saves last_login, which no cached value depends on
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    invalidate_schools([instance.school_id])
@@ -0,0 +1,79 @@
+from django.conf import settings
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from students.models import AttendanceRecord, Student
+from visits.models import HomeVisit
+from .cache import REFERENCE, get_or_compute, school_namespace
+from .models import School, User, Zone
+
+# Short, as today's attendance keeps changing and is not invalidated
+NETWORK_STATISTICS_TIMEOUT = getattr(settings, 'NETWORK_STATISTICS_TIMEOUT', 60)
+
+NETWORK_COUNTS = ['active_students', 'teachers', 'field_officers', 'marked_today', 'attended_today', 'open_flags']
+
+
+def count_per_school(queryset, school_field='school'):
+    """Correlated COUNT of ``queryset`` rows for the outer school."""
+    counts = (
+        queryset.filter(**{school_field: OuterRef('pk')})
+        .order_by().values(school_field).annotate(total=Count('pk')).values('total')
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def compute_school_statistics(school_id):
+    staff = dict(
+        User.objects.filter(school_id=school_id, is_active=True, role__in=['TEACHER', 'FIELD_OFFICER'])
+        .values('role').annotate(total=Count('id')).order_by().values_list('role', 'total')
+    )
+    return {
+        'total_students': Student.objects.filter(school_id=school_id, is_active=True).count(),
+        'total_teachers': staff.get('TEACHER', 0),
+        'total_field_officers': staff.get('FIELD_OFFICER', 0),
+        'total_zones': Zone.objects.filter(school_id=school_id).count(),
+    }
+
+
+def school_statistics(school_id):
+    """Head counts of a school for the dashboard and the statistics API, cached."""
+    return get_or_compute(school_namespace(school_id), 'statistics', lambda: compute_school_statistics(school_id))
+
+
+def attendance_rate(attended, marked):
+    return round(100 * attended / marked, 1) if marked else None
+
+
+def compute_network_statistics(date):
+    """
+    Head counts, attendance on ``date`` and open absence-flag visits of
+    every school, from one query with a counting subquery per figure.
+    """
+    schools = list(
+        School.objects.annotate(
+            active_students=count_per_school(Student.objects.filter(is_active=True)),
+            teachers=count_per_school(User.objects.filter(role='TEACHER', is_active=True)),
+            field_officers=count_per_school(User.objects.filter(role='FIELD_OFFICER', is_active=True)),
+            marked_today=count_per_school(AttendanceRecord.objects.filter(date=date), 'student__school'),
+            attended_today=count_per_school(
+                AttendanceRecord.objects.filter(date=date, status__in=['PRESENT', 'LATE']), 'student__school'
+            ),
+            open_flags=count_per_school(HomeVisit.objects.filter(
+                status__in=HomeVisit.OPEN_STATUSES, flag_window_start__isnull=False
+            )),
+        ).order_by('name').values('id', 'name', 'code', *NETWORK_COUNTS)
+    )
+    totals = {name: sum(school[name] for school in schools) for name in NETWORK_COUNTS}
+    for row in [*schools, totals]:
+        row['attendance_rate'] = attendance_rate(row['attended_today'], row['marked_today'])
+    return {'date': date.isoformat(), 'school_count': len(schools), 'totals': totals, 'schools': schools}
+
+
+def network_statistics(date=None):
+    """Per-school and total figures of all schools for super admins, cached briefly."""
+    date = date or timezone.localdate()
+    return get_or_compute(
+        REFERENCE, f'network-statistics:{date}', lambda: compute_network_statistics(date),
+        timeout=NETWORK_STATISTICS_TIMEOUT,
+    )
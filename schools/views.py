@@ -3,10 +3,11 @@ from django.contrib.auth import login, logout, authenticate
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.db.models import Count, Q
-from django.utils import timezone
 from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
 from .models import School, User, Zone
+from .statistics import network_statistics, school_statistics
+from .zone_assignments import apply_zone_assignments
 
 
 def index(request):
@@ -78,15 +79,10 @@ def dashboard(request):
     
     if current_school:
         # School-specific statistics
-        today = timezone.now().date()
-        
-        # Get counts from related models (will be available after creating other apps)
-        context.update({
-            'total_students': current_school.students.filter(is_active=True).count() if hasattr(current_school, 'students') else 0,
-            'total_teachers': current_school.users.filter(role='TEACHER', is_active=True).count(),
-            'total_field_officers': current_school.users.filter(role='FIELD_OFFICER', is_active=True).count(),
-            'total_zones': current_school.zones.count(),
-        })
+        context.update(school_statistics(current_school.id))
+    elif user.role == 'SUPER_ADMIN':
+        # Network-wide overview of every school
+        context['network'] = network_statistics()
     
     return render(request, 'schools/dashboard.html', context)
 
@@ -207,12 +203,9 @@ def assign_field_officer(request):
             school=request.user.school
         )
         
-        # Clear existing assignments
-        officer.assigned_zones.clear()
-        
-        # Add new assignments
-        zones = Zone.objects.filter(id__in=zone_ids, school=request.user.school)
-        officer.assigned_zones.set(zones)
+        # Apply only the added and removed assignments
+        zones = Zone.objects.filter(id__in=zone_ids, school=request.user.school).values_list('id', flat=True)
+        apply_zone_assignments(request.user.school, {officer.id: zones}, validate=False)
         
         return JsonResponse({
             'success': True,
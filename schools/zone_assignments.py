@@ -0,0 +1,114 @@
+"""
+Diff-based zone assignment for field officers.
+
+Assignments are applied as the minimal set of inserts and deletes against
+the ``User.assigned_zones`` through table, instead of clearing and
+re-adding every row.
+"""
+from dataclasses import dataclass, field
+
+from django.db import transaction
+from django.db.models import CharField, Value
+
+from .models import User, Zone
+
+Assignment = User.assigned_zones.through
+
+
+class ZoneAssignmentError(Exception):
+    """Raised when officers or zones do not belong to the school."""
+
+    def __init__(self, message, invalid_officers=(), invalid_zones=()):
+        super().__init__(message)
+        self.invalid_officers = sorted(invalid_officers)
+        self.invalid_zones = sorted(invalid_zones)
+
+
+@dataclass
+class ZoneAssignmentResult:
+    added: int = 0
+    removed: int = 0
+    zones_by_officer: dict = field(default_factory=dict)
+
+
+def parse_assignments(raw):
+    """Turn {"officer id": [zone ids]} input into {int: set of int}."""
+    if not isinstance(raw, dict):
+        raise ValueError('assignments must be an object mapping officer ids to zone id lists')
+    parsed = {}
+    for officer_id, zone_ids in raw.items():
+        if not isinstance(zone_ids, (list, tuple)):
+            raise ValueError(f'zones for officer {officer_id} must be a list')
+        parsed[int(officer_id)] = {int(zone_id) for zone_id in zone_ids}
+    return parsed
+
+
+def validate_ownership(school, officer_ids, zone_ids):
+    """
+    Check in a single query that every officer is a field officer of
+    ``school`` and every zone belongs to it.
+    """
+    officers = User.objects.filter(
+        id__in=officer_ids, school=school, role='FIELD_OFFICER'
+    ).values_list('id', Value('officer', output_field=CharField()))
+    zones = Zone.objects.filter(id__in=zone_ids, school=school).values_list(
+        'id', Value('zone', output_field=CharField())
+    )
+    found = {'officer': set(), 'zone': set()}
+    for object_id, kind in officers.order_by().union(zones.order_by(), all=True):
+        found[kind].add(object_id)
+
+    invalid_officers = set(officer_ids) - found['officer']
+    invalid_zones = set(zone_ids) - found['zone']
+    if invalid_officers or invalid_zones:
+        raise ZoneAssignmentError(
+            'Some officers or zones do not belong to this school',
+            invalid_officers=invalid_officers,
+            invalid_zones=invalid_zones,
+        )
+
+
+def apply_zone_assignments(school, assignments, validate=True):
+    """
+    Make each officer's zones exactly the given set.
+
+    ``assignments`` maps officer id to an iterable of zone ids. Officers not
+    in the mapping are left untouched. Runs one validation query (skipped
+    with ``validate=False`` when the caller has already checked ownership),
+    one read of the current rows, and at most one delete and one bulk insert
+    inside a transaction.
+    """
+    assignments = {officer_id: set(zone_ids) for officer_id, zone_ids in assignments.items()}
+    result = ZoneAssignmentResult(zones_by_officer=assignments)
+    if not assignments:
+        return result
+
+    if validate:
+        all_zones = set().union(*assignments.values())
+        validate_ownership(school, set(assignments), all_zones)
+
+    with transaction.atomic():
+        current = {}
+        for row_id, officer_id, zone_id in Assignment.objects.select_for_update().filter(
+                user_id__in=list(assignments)).values_list('id', 'user_id', 'zone_id'):
+            current[(officer_id, zone_id)] = row_id
+
+        wanted = {
+            (officer_id, zone_id)
+            for officer_id, zone_ids in assignments.items()
+            for zone_id in zone_ids
+        }
+        to_delete = [row_id for key, row_id in current.items() if key not in wanted]
+        to_add = [
+            Assignment(user_id=officer_id, zone_id=zone_id)
+            for officer_id, zone_id in sorted(wanted - set(current))
+        ]
+
+        if to_delete:
+            Assignment.objects.filter(id__in=to_delete).delete()
+        if to_add:
+            Assignment.objects.bulk_create(to_add, batch_size=1000)
+
+    result.added = len(to_add)
+    result.removed = len(to_delete)
+    return result
@@ -1,5 +1,7 @@
 from django.contrib import admin
+from schools.paginators import EstimatedCountPaginator
 from .models import Student, Guardian, GuardianStudent
+from .search import guardian_search_q, student_search_q
 
 
 @admin.register(Student)
@@ -7,6 +9,16 @@ class StudentAdmin(admin.ModelAdmin):
     list_display = ['student_id', 'first_name', 'last_name', 'school', 'grade', 'class_name', 'is_active']
     list_filter = ['school', 'grade', 'gender', 'is_active']
     search_fields = ['student_id', 'first_name', 'last_name']
+    list_select_related = ['school']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    
+    def get_search_results(self, request, queryset, search_term):
+        # Use the indexed search columns instead of icontains scans
+        if not search_term.strip():
+            return queryset, False
+        queryset = queryset.filter(id__in=Student.objects.filter(student_search_q(search_term)).values('id'))
+        return queryset, False
     
     def get_queryset(self, request):
         qs = super().get_queryset(request)
@@ -21,8 +33,28 @@ class StudentAdmin(admin.ModelAdmin):
 class GuardianAdmin(admin.ModelAdmin):
     list_display = ['first_name', 'last_name', 'relationship', 'phone_number']
     search_fields = ['first_name', 'last_name', 'phone_number']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    
+    def get_search_results(self, request, queryset, search_term):
+        # Use the indexed search columns instead of icontains scans
+        if not search_term.strip():
+            return queryset, False
+        return queryset.filter(guardian_search_q(search_term)), False
 
 
 @admin.register(GuardianStudent)
 class GuardianStudentAdmin(admin.ModelAdmin):
-    list_display = ['guardian', 'student', 'is_primary', 'can_receive_calls']
\ No newline at end of file
+    list_display = ['guardian', 'student', 'is_primary', 'can_receive_calls']
+    list_select_related = ['guardian', 'student']
+    autocomplete_fields = ['guardian', 'student']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        if request.user.role == 'SUPER_ADMIN':
+            return qs
+        if request.user.school:
+            return qs.filter(student__school=request.user.school)
+        return qs.none()
\ No newline at end of file
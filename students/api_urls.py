@@ -1,9 +1,11 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from . import api_views
 
 router = DefaultRouter()
 # Will add viewsets when implementing
 
 urlpatterns = [
     path('', include(router.urls)),
-]
\ No newline at end of file
+    path('search/', api_views.StudentSearchView.as_view(), name='student_search'),
+]
@@ -0,0 +1,46 @@
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from .models import Student
+from .search import search_students
+
+MAX_SEARCH_RESULTS = 25
+
+
+class StudentSearchView(APIView):
+    """
+    Type-ahead search over student names, student IDs, classes and
+    guardian phone numbers, scoped to the user's school.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        """Students the user may search, or None for an invalid ``?school=``."""
+        user = self.request.user
+        queryset = Student.objects.filter(is_active=True)
+        if user.role == 'SUPER_ADMIN':
+            school_id = self.request.query_params.get('school')
+            if not school_id:
+                return queryset
+            try:
+                return queryset.filter(school_id=int(school_id))
+            except ValueError:
+                return None
+        if user.school_id:
+            return queryset.filter(school_id=user.school_id)
+        return queryset.none()
+
+    def get(self, request):
+        query = request.query_params.get('q', '')
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', 10)), MAX_SEARCH_RESULTS))
+        except ValueError:
+            return Response({'error': 'limit must be an integer'}, status=400)
+
+        queryset = self.get_queryset()
+        if queryset is None:
+            return Response({'error': 'A valid school is required'}, status=400)
+        results = search_students(queryset, query, limit=limit).values(
+            'id', 'student_id', 'first_name', 'last_name', 'grade', 'class_name', 'school_id'
+        )
+        return Response({'query': query, 'results': list(results)})
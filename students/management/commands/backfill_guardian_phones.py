@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+
+from students.models import Guardian
+from students.phone import normalize_phone
+
+
+class Command(BaseCommand):
+    help = 'Populate the normalized E.164 phone columns for existing guardians in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        queryset = Guardian.objects.order_by('pk').only(
+            'pk', 'phone_number', 'alternative_phone', 'phone_e164', 'alternative_phone_e164'
+        )
+        last_pk = 0
+        scanned = updated = 0
+        while True:
+            batch = list(queryset.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                break
+            changed = []
+            for guardian in batch:
+                phone = normalize_phone(guardian.phone_number)
+                alternative = normalize_phone(guardian.alternative_phone)
+                if (phone, alternative) != (guardian.phone_e164, guardian.alternative_phone_e164):
+                    guardian.phone_e164, guardian.alternative_phone_e164 = phone, alternative
+                    changed.append(guardian)
+            if changed:
+                Guardian.objects.bulk_update(changed, ['phone_e164', 'alternative_phone_e164'])
+            scanned += len(batch)
+            updated += len(changed)
+            last_pk = batch[-1].pk
+
+        self.stdout.write(self.style.SUCCESS(f'Normalized {updated} of {scanned} guardian(s)'))
@@ -0,0 +1,98 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from notifications.models import SmsMessage
+from schools.cache import invalidate_schools
+from students.models import Guardian, GuardianStudent, Student
+from visits.models import HomeVisit
+
+# Blank fields on the kept guardian are filled from its duplicates
+MERGED_FIELDS = ['alternative_phone', 'alternative_phone_e164', 'email', 'address']
+
+
+class Command(BaseCommand):
+    help = 'Merge guardians sharing a normalized phone number into the oldest record'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Report the duplicates without changing anything')
+
+    def handle(self, *args, **options):
+        numbers = (
+            Guardian.objects.exclude(phone_e164='')
+            .values('phone_e164')
+            .annotate(total=Count('id'))
+            .filter(total__gt=1)
+            .order_by()
+            .values('phone_e164')
+        )
+        guardians = list(Guardian.objects.filter(phone_e164__in=numbers).order_by('phone_e164', 'id'))
+        if not guardians:
+            self.stdout.write('No duplicate guardians found')
+            return
+
+        # The oldest guardian for each number is kept
+        keep = {}
+        canonical = {}
+        for guardian in guardians:
+            kept = keep.setdefault(guardian.phone_e164, guardian)
+            if kept is not guardian:
+                canonical[guardian.pk] = kept
+                for field in MERGED_FIELDS:
+                    if not getattr(kept, field) and getattr(guardian, field):
+                        setattr(kept, field, getattr(guardian, field))
+
+        links = list(GuardianStudent.objects.filter(
+            guardian_id__in=[g.pk for g in guardians]
+        ).order_by('id'))
+        existing = {
+            (link.guardian_id, link.student_id): link
+            for link in links if link.guardian_id not in canonical
+        }
+        repointed, dropped, promoted = [], [], []
+        for link in links:
+            if link.guardian_id not in canonical:
+                continue
+            kept = canonical[link.guardian_id]
+            current = existing.get((kept.pk, link.student_id))
+            if current is None:
+                link.guardian_id = kept.pk
+                existing[(kept.pk, link.student_id)] = link
+                repointed.append(link)
+            else:
+                if link.is_primary and not current.is_primary:
+                    current.is_primary = True
+                    promoted.append(current)
+                dropped.append(link.pk)
+
+        self.stdout.write(
+            f'{len(canonical)} duplicate guardian(s) across {len(keep)} number(s): '
+            f'{len(repointed)} link(s) re-pointed, {len(dropped)} redundant link(s) removed'
+        )
+        if options['dry_run']:
+            return
+
+        with transaction.atomic():
+            GuardianStudent.objects.filter(pk__in=dropped).delete()
+            # A re-pointed link may also have been promoted by a later duplicate
+            GuardianStudent.objects.bulk_update(repointed, ['guardian', 'is_primary'], batch_size=1000)
+            GuardianStudent.objects.bulk_update(
+                [link for link in promoted if link not in repointed], ['is_primary'], batch_size=1000
+            )
+            Guardian.objects.bulk_update(list(keep.values()), MERGED_FIELDS, batch_size=1000)
+            # Visits and SMS history would lose their guardian (SET_NULL) on delete
+            duplicates_of = {}
+            for duplicate_id, kept in canonical.items():
+                duplicates_of.setdefault(kept.pk, []).append(duplicate_id)
+            for kept_id, duplicate_ids in duplicates_of.items():
+                for model in (HomeVisit, SmsMessage):
+                    model.objects.filter(guardian_id__in=duplicate_ids).update(guardian_id=kept_id)
+            Guardian.objects.filter(pk__in=list(canonical)).delete()
+            # Bulk updates send no signals; drop the affected schools' cached rosters
+            invalidate_schools(
+                Student.objects.filter(id__in={link.student_id for link in links})
+                .values_list('school_id', flat=True).distinct()
+            )
+
+        self.stdout.write(self.style.SUCCESS(f'Merged {len(canonical)} duplicate guardian(s)'))
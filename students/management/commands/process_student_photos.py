@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from students.photos import process_pending
+
+
+class Command(BaseCommand):
+    help = 'Re-encode pending student photos and render their thumbnails, in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--limit', type=int, help='Stop after this many photos')
+        parser.add_argument('--watch', action='store_true',
+                            help='Keep running and process new uploads as they appear')
+        parser.add_argument('--interval', type=int, default=30,
+                            help='Seconds between checks with --watch')
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.monotonic()
+            processed, skipped = process_pending(batch_size=options['batch_size'], limit=options['limit'])
+            if processed or skipped or not options['watch']:
+                self.stdout.write(self.style.SUCCESS(
+                    f'Processed {processed} photo(s), skipped {skipped} in {time.monotonic() - started:.1f}s'
+                ))
+            if not options['watch']:
+                return
+            time.sleep(max(options['interval'], 1))
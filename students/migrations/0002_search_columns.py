@@ -0,0 +1,104 @@
+# Generated by Django 4.2.17 on 2026-10-19 13:11
+
+from django.db import migrations, models
+
+BACKFILL_BATCH_SIZE = 2000
+
+TRIGRAM_INDEXES = [
+    ('students_student', 'students_st_search_name_trgm'),
+    ('students_guardian', 'students_gu_search_name_trgm'),
+]
+
+
+def normalize(value):
+    import re
+    import unicodedata
+
+    value = unicodedata.normalize('NFKD', value or '')
+    value = ''.join(ch for ch in value if not unicodedata.combining(ch))
+    return re.sub(r'\s+', ' ', value).strip().lower()
+
+
+def backfill_search_columns(apps, schema_editor):
+    for model_name in ('Student', 'Guardian'):
+        model = apps.get_model('students', model_name)
+        queryset = model.objects.order_by('pk').only('pk', 'first_name', 'last_name')
+        last_pk = 0
+        while True:
+            batch = list(queryset.filter(pk__gt=last_pk)[:BACKFILL_BATCH_SIZE])
+            if not batch:
+                break
+            for obj in batch:
+                obj.search_name = normalize(f'{obj.first_name} {obj.last_name}')
+                obj.search_name_reversed = normalize(f'{obj.last_name} {obj.first_name}')
+            model.objects.bulk_update(batch, ['search_name', 'search_name_reversed'])
+            last_pk = batch[-1].pk
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for table, index in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {index} ON {table} USING gin (search_name gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for _, index in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {index}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='guardian',
+            name='search_name',
+            field=models.CharField(blank=True, editable=False, max_length=201),
+        ),
+        migrations.AddField(
+            model_name='guardian',
+            name='search_name_reversed',
+            field=models.CharField(blank=True, editable=False, max_length=201),
+        ),
+        migrations.AddField(
+            model_name='student',
+            name='search_name',
+            field=models.CharField(blank=True, editable=False, max_length=201),
+        ),
+        migrations.AddField(
+            model_name='student',
+            name='search_name_reversed',
+            field=models.CharField(blank=True, editable=False, max_length=201),
+        ),
+        migrations.AddIndex(
+            model_name='guardian',
+            index=models.Index(fields=['search_name'], name='students_gu_search__f5c09e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='guardian',
+            index=models.Index(fields=['search_name_reversed'], name='students_gu_search__be52a0_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['school', 'class_name'], name='students_st_school__7e2434_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['school', 'search_name'], name='students_st_school__5175f8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['school', 'search_name_reversed'], name='students_st_school__5a3d79_idx'),
+        ),
+        migrations.RunPython(backfill_search_columns, migrations.RunPython.noop),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
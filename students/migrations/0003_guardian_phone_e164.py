@@ -0,0 +1,31 @@
+# Generated by Django 4.2.17 on 2026-10-19 13:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0002_search_columns'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='guardian',
+            name='alternative_phone_e164',
+            field=models.CharField(blank=True, editable=False, max_length=16),
+        ),
+        migrations.AddField(
+            model_name='guardian',
+            name='phone_e164',
+            field=models.CharField(blank=True, editable=False, max_length=16),
+        ),
+        migrations.AddIndex(
+            model_name='guardian',
+            index=models.Index(fields=['phone_e164'], name='students_gu_phone_e_c13bb4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='guardian',
+            index=models.Index(fields=['alternative_phone_e164'], name='students_gu_alterna_fde278_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.17 on 2026-10-19 13:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0003_guardian_phone_e164'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='student',
+            options={'ordering': ['school_id', 'grade', 'class_name', 'last_name', 'first_name']},
+        ),
+        migrations.RemoveIndex(
+            model_name='student',
+            name='students_st_school__dcfdb2_idx',
+        ),
+        migrations.AddIndex(
+            model_name='attendancerecord',
+            index=models.Index(fields=['date', 'status'], name='students_at_date_905340_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['school', 'grade', 'class_name', 'last_name', 'first_name'], name='students_st_school__28c4ab_idx'),
+        ),
+    ]
@@ -1,6 +1,17 @@
 from django.db import models
 from django.core.validators import RegexValidator
 from schools.models import School
+from .phone import normalize_phone
+from .search import name_search_columns
+
+
+class GuardianQuerySet(models.QuerySet):
+    def by_phone(self, raw_number):
+        """Guardians whose main or alternative number matches, via the E.164 indexes."""
+        number = normalize_phone(raw_number)
+        if not number:
+            return self.none()
+        return self.filter(models.Q(phone_e164=number) | models.Q(alternative_phone_e164=number))
 
 
 class Guardian(models.Model):
@@ -26,6 +37,10 @@ class Guardian(models.Model):
     alternative_phone = models.CharField(max_length=20, blank=True)
     email = models.EmailField(blank=True)
     
+    # E.164 forms of the numbers above (maintained in save())
+    phone_e164 = models.CharField(max_length=16, blank=True, editable=False)
+    alternative_phone_e164 = models.CharField(max_length=16, blank=True, editable=False)
+    
     # Address
     address = models.TextField(blank=True)
     
@@ -37,19 +52,39 @@ class Guardian(models.Model):
         default='EN'
     )
     
+    # Normalized names for indexed search (maintained in save())
+    search_name = models.CharField(max_length=201, blank=True, editable=False)
+    search_name_reversed = models.CharField(max_length=201, blank=True, editable=False)
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = GuardianQuerySet.as_manager()
+    
     class Meta:
         ordering = ['last_name', 'first_name']
         indexes = [
             models.Index(fields=['phone_number']),
             models.Index(fields=['last_name', 'first_name']),
+            models.Index(fields=['search_name']),
+            models.Index(fields=['search_name_reversed']),
+            models.Index(fields=['phone_e164']),
+            models.Index(fields=['alternative_phone_e164']),
         ]
     
     def __str__(self):
         return f"{self.first_name} {self.last_name} ({self.get_relationship_display()})"
     
+    def save(self, *args, **kwargs):
+        self.refresh_derived_fields()
+        super().save(*args, **kwargs)
+    
+    def refresh_derived_fields(self):
+        """Recompute the search and E.164 columns (also used by bulk loaders)."""
+        self.search_name, self.search_name_reversed = name_search_columns(self.first_name, self.last_name)
+        self.phone_e164 = normalize_phone(self.phone_number)
+        self.alternative_phone_e164 = normalize_phone(self.alternative_phone)
+    
     def get_full_name(self):
         return f"{self.first_name} {self.last_name}"
 
@@ -103,28 +138,58 @@ class Student(models.Model):
     # Guardian relationships
     guardians = models.ManyToManyField(Guardian, through='GuardianStudent', related_name='students')
     
-    # Photos
+    # Photos: the upload is replaced by a re-encoded copy in the background
+    # (see students/photos.py); photo_source records which upload the
+    # derived images were made from
     photo = models.ImageField(upload_to='students/photos/', blank=True)
+    photo_detail = models.ImageField(blank=True, editable=False)
+    photo_thumbnail = models.ImageField(blank=True, editable=False)
+    photo_source = models.CharField(max_length=100, blank=True, editable=False)
     
     # Enrollment information
     enrollment_date = models.DateField()
     is_active = models.BooleanField(default=True)
     
+    # Normalized names for indexed search (maintained in save())
+    search_name = models.CharField(max_length=201, blank=True, editable=False)
+    search_name_reversed = models.CharField(max_length=201, blank=True, editable=False)
+    
     # Tracking fields
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
-        ordering = ['school', 'grade', 'class_name', 'last_name', 'first_name']
+        ordering = ['school_id', 'grade', 'class_name', 'last_name', 'first_name']
         indexes = [
             models.Index(fields=['student_id']),
-            models.Index(fields=['school', 'grade', 'class_name']),
+            # Matches Meta.ordering, so school and class listings need no sort
+            models.Index(fields=['school', 'grade', 'class_name', 'last_name', 'first_name']),
             models.Index(fields=['school', 'is_active']),
+            models.Index(fields=['school', 'class_name']),
+            models.Index(fields=['school', 'search_name']),
+            models.Index(fields=['school', 'search_name_reversed']),
         ]
     
     def __str__(self):
         return f"{self.first_name} {self.last_name} ({self.student_id})"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # The school it was loaded with, so moving it invalidates both schools
+        instance.loaded_school_id = instance.__dict__.get('school_id')
+        return instance
+    
+    def save(self, *args, **kwargs):
+        self.refresh_derived_fields()
+        super().save(*args, **kwargs)
+    
+    def refresh_derived_fields(self):
+        """Recompute the search columns (also used by bulk loaders)."""
+        self.search_name, self.search_name_reversed = name_search_columns(self.first_name, self.last_name)
+        if not self.photo:
+            self.photo_detail = self.photo_thumbnail = self.photo_source = ''
+    
     def get_full_name(self):
         return f"{self.first_name} {self.last_name}"
     
@@ -172,4 +237,7 @@ class AttendanceRecord(models.Model):
     
     class Meta:
         unique_together = ['student', 'date']
-        ordering = ['-date']
\ No newline at end of file
+        ordering = ['-date']
+        indexes = [
+            models.Index(fields=['date', 'status']),
+        ]
\ No newline at end of file
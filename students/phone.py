@@ -0,0 +1,57 @@
+"""
+Phone number normalization.
+
+Guardian phone numbers are entered free-form ("0977 123456",
+"+260977123456", "977123456"). They are normalized to E.164 so the same
+number always has the same indexed value.
+"""
+import re
+
+from django.conf import settings
+
+DEFAULT_COUNTRY_CODE = getattr(settings, 'PHONE_DEFAULT_COUNTRY_CODE', '260')
+# Length of a national subscriber number without the trunk prefix
+NATIONAL_NUMBER_LENGTH = getattr(settings, 'PHONE_NATIONAL_NUMBER_LENGTH', 9)
+
+_non_digits = re.compile(r'\D')
+
+
+def _to_international_digits(raw, country_code, partial=False):
+    """Convert a raw number to country code + national digits, without '+'."""
+    value = (raw or '').strip()
+    digits = _non_digits.sub('', value)
+    if not digits:
+        return ''
+    if value.startswith('+'):
+        return digits
+    if digits.startswith('00'):
+        return digits[2:]
+    if digits.startswith(country_code) and (partial or len(digits) > NATIONAL_NUMBER_LENGTH):
+        return digits
+    if digits.startswith('0'):
+        return country_code + digits[1:]
+    return country_code + digits
+
+
+def normalize_phone(raw, country_code=DEFAULT_COUNTRY_CODE):
+    """
+    Return the E.164 form of a phone number, or '' if it is not valid.
+
+    Numbers without a country code are assumed to be in ``country_code``.
+    """
+    digits = _to_international_digits(raw, country_code)
+    if not 8 <= len(digits) <= 15:
+        return ''
+    if digits.startswith(country_code) and len(digits) != len(country_code) + NATIONAL_NUMBER_LENGTH:
+        return ''
+    return '+' + digits
+
+
+def normalize_phone_prefix(raw, country_code=DEFAULT_COUNTRY_CODE):
+    """
+    Normalize a partially typed number for prefix lookups against E.164 values.
+
+    Unlike normalize_phone() no length validation is applied.
+    """
+    digits = _to_international_digits(raw, country_code, partial=True)
+    return '+' + digits if digits else ''
@@ -0,0 +1,109 @@
+"""
+Background processing of student photos.
+
+An uploaded ``Student.photo`` is stored as-is, and saving the student
+queues it for processing once the transaction commits. The worker renders
+three variants (see schools.images):
+
+- ``full``, which replaces the upload. The original, with its EXIF data,
+  is deleted.
+- ``detail``, for the student page.
+- ``thumbnail``, for rosters, a few kilobytes each.
+
+``photo_source`` is then set to the new ``photo`` name. Any student whose
+``photo`` differs from ``photo_source`` is still pending, so uploads
+missed by a restart, and photos that existed before this pipeline, are
+processed by ``manage.py process_student_photos``.
+"""
+import logging
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db.models import F, Q
+
+from schools.cache import invalidate_schools
+from schools.images import ImageError, render_variants, run_in_background
+from .models import Student
+
+PHOTO_VARIANTS = getattr(settings, 'STUDENT_PHOTO_VARIANTS', {'full': 1024, 'detail': 320, 'thumbnail': 96})
+PHOTO_PREFIX = 'students/photos'
+
+logger = logging.getLogger('attendance_system')
+
+
+def pending_photos():
+    return Student.objects.exclude(photo='').exclude(photo=F('photo_source'))
+
+
+def process_student_photo(student_id):
+    """
+    Render the variants of a student's current photo. Returns False if
+    there was nothing to do or the photo changed while processing.
+    """
+    student = pending_photos().filter(pk=student_id).only(
+        'id', 'school_id', 'photo', 'photo_detail', 'photo_thumbnail', 'photo_source'
+    ).first()
+    if student is None:
+        return False
+    upload = student.photo.name
+    try:
+        with default_storage.open(upload, 'rb') as file:
+            names = render_variants(file, PHOTO_VARIANTS, PHOTO_PREFIX)
+    except FileNotFoundError:
+        # Another worker processed and removed it first
+        return False
+    except ImageError as exc:
+        # Keep the upload but stop retrying it
+        logger.warning('Student %s photo %s could not be processed: %s', student_id, upload, exc)
+        Student.objects.filter(pk=student_id, photo=upload).update(photo_source=upload)
+        return False
+
+    previous = {student.photo_detail.name, student.photo_thumbnail.name}
+    # Conditional on the photo, so a newer upload during processing is kept
+    updated = Student.objects.filter(pk=student_id, photo=upload).update(
+        photo=names['full'],
+        photo_detail=names['detail'],
+        photo_thumbnail=names['thumbnail'],
+        photo_source=names['full'],
+    )
+    if not updated:
+        return False
+    # update() sends no signal; cached rosters hold the old thumbnail URL
+    invalidate_schools([student.school_id])
+    if upload not in names.values():
+        default_storage.delete(upload)
+    delete_unused(previous - set(names.values()))
+    return True
+
+
+def delete_unused(names):
+    """Delete derived images no student refers to any more (variants are shared by content)."""
+    for name in filter(None, names):
+        if not Student.objects.filter(
+                Q(photo=name) | Q(photo_detail=name) | Q(photo_thumbnail=name)).exists():
+            default_storage.delete(name)
+
+
+def queue_photo(student_id):
+    run_in_background(process_student_photo, student_id)
+
+
+def process_pending(batch_size=100, limit=None):
+    """Process pending photos in id order, ``batch_size`` ids per query. Returns (processed, skipped)."""
+    processed = skipped = 0
+    last_id = 0
+    while limit is None or processed + skipped < limit:
+        batch = list(
+            pending_photos().filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:batch_size]
+        )
+        if not batch:
+            break
+        for student_id in batch:
+            if limit is not None and processed + skipped >= limit:
+                break
+            if process_student_photo(student_id):
+                processed += 1
+            else:
+                skipped += 1
+        last_id = batch[-1]
+    return processed, skipped
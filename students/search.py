@@ -0,0 +1,113 @@
+"""
+Indexed student and guardian search.
+
+Names are stored pre-normalized in ``search_name`` (first last) and
+``search_name_reversed`` (last first) so type-ahead lookups can use an
+index. On PostgreSQL the normalized columns carry pg_trgm GIN indexes and
+queries match anywhere in the name; on other databases queries fall back
+to prefix matching expressed as a range, which a B-tree index serves
+directly.
+"""
+import re
+import unicodedata
+
+from django.db import connection
+from django.db.models import Q
+
+from .phone import normalize_phone_prefix
+
+# Upper bound for prefix range scans: sorts after any character used in names
+PREFIX_SENTINEL = '\U0010ffff'
+MIN_QUERY_LENGTH = 2
+
+_whitespace = re.compile(r'\s+')
+_phone_query = re.compile(r'^\+?[\d\s\-()]{4,}$')
+_student_id_query = re.compile(r'^[A-Za-z]*\d[A-Za-z0-9]*$')
+_class_query = re.compile(r'^\d{1,2}[A-Za-z]$')
+
+
+def normalize_search_text(value):
+    """Lowercase, strip accents and collapse whitespace for search columns."""
+    value = unicodedata.normalize('NFKD', value or '')
+    value = ''.join(ch for ch in value if not unicodedata.combining(ch))
+    return _whitespace.sub(' ', value).strip().lower()
+
+
+def name_search_columns(first_name, last_name):
+    """Values for the (search_name, search_name_reversed) columns."""
+    return (
+        normalize_search_text(f'{first_name} {last_name}'),
+        normalize_search_text(f'{last_name} {first_name}'),
+    )
+
+
+def uses_trigram_index():
+    return connection.vendor == 'postgresql'
+
+
+def prefix_q(field, prefix):
+    """Index-friendly ``field`` starts-with ``prefix`` condition."""
+    return Q(**{f'{field}__gte': prefix, f'{field}__lt': prefix + PREFIX_SENTINEL})
+
+
+def name_q(query):
+    """Condition matching normalized names against a normalized query."""
+    if uses_trigram_index():
+        return Q(search_name__contains=query)
+    return prefix_q('search_name', query) | prefix_q('search_name_reversed', query)
+
+
+def student_search_q(query):
+    """
+    Build the filter for a student type-ahead query.
+
+    Covers names, ``student_id`` prefixes, class names (e.g. "7A") and the
+    phone numbers of the student's guardians.
+    """
+    raw = query.strip()
+    normalized = normalize_search_text(raw)
+    condition = name_q(normalized)
+    if _student_id_query.match(raw):
+        condition |= prefix_q('student_id', raw.upper())
+    if _class_query.match(raw):
+        condition |= Q(class_name=raw.upper())
+    if _phone_query.match(raw):
+        condition |= Q(guardians__in=guardian_phone_queryset(raw))
+    return condition
+
+
+def phone_q(query):
+    """Condition matching guardians whose normalized numbers start with the query."""
+    prefix = normalize_phone_prefix(query)
+    return prefix_q('phone_e164', prefix) | prefix_q('alternative_phone_e164', prefix)
+
+
+def guardian_phone_queryset(query):
+    """Guardian ids whose normalized phone numbers start with the query."""
+    from .models import Guardian
+
+    return Guardian.objects.filter(phone_q(query)).values('id')
+
+
+def search_students(queryset, query, limit=10):
+    """
+    Apply a type-ahead search to an already school-scoped student queryset.
+
+    Returns an empty queryset for queries shorter than MIN_QUERY_LENGTH.
+    """
+    if len(query.strip()) < MIN_QUERY_LENGTH:
+        return queryset.none()
+    matches = queryset.filter(student_search_q(query))
+    if _phone_query.match(query.strip()):
+        # The guardian join can repeat students
+        matches = queryset.filter(id__in=matches.values('id'))
+    return matches.order_by('search_name', 'id')[:limit]
+
+
+def guardian_search_q(query):
+    """Build the filter for a guardian search by name or phone number."""
+    raw = query.strip()
+    condition = name_q(normalize_search_text(raw))
+    if _phone_query.match(raw):
+        condition |= phone_q(raw)
+    return condition
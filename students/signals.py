@@ -0,0 +1,42 @@
+"""
+Cache invalidation for student data: saving or deleting a student, or a
+guardian or guardian link of one, drops the cached entries of the
+student's school, and of the school it was loaded with when it moved
+(see schools.cache). Saving a student with a new photo
+also queues it for processing (see students.photos).
+"""
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from schools.cache import invalidate_schools
+from .models import Guardian, GuardianStudent, Student
+from .photos import queue_photo
+
+STUDENT_PHOTO_PROCESS_ON_SAVE = getattr(settings, 'STUDENT_PHOTO_PROCESS_ON_SAVE', True)
+
+
+@receiver([post_save, post_delete], sender=Student)
+def student_changed(sender, instance, **kwargs):
+    # A student moved to another school changes the old school's data too
+    invalidate_schools([instance.school_id, getattr(instance, 'loaded_school_id', None)])
+    instance.loaded_school_id = instance.school_id
+
+
+# Before deletion, while the guardian's links still exist
+@receiver([post_save, pre_delete], sender=Guardian)
+def guardian_changed(sender, instance, **kwargs):
+    invalidate_schools(Student.objects.filter(guardians=instance).values_list('school_id', flat=True))
+
+
+@receiver([post_save, post_delete], sender=GuardianStudent)
+def guardian_link_changed(sender, instance, **kwargs):
+    invalidate_schools(Student.objects.filter(id=instance.student_id).values_list('school_id', flat=True))
+
+
+@receiver(post_save, sender=Student)
+def student_photo_changed(sender, instance, **kwargs):
+    if STUDENT_PHOTO_PROCESS_ON_SAVE and instance.photo and instance.photo.name != instance.photo_source:
+        student_id = instance.pk
+        transaction.on_commit(lambda: queue_photo(student_id))
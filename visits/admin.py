@@ -1,2 +1,57 @@
 from django.contrib import admin
-# Placeholder - will be implemented in later phases
\ No newline at end of file
+from .models import HomeVisit, PhotoUpload, VisitGenerationRun, VisitPhoto
+
+
+@admin.register(HomeVisit)
+class HomeVisitAdmin(admin.ModelAdmin):
+    list_display = ['student', 'school', 'zone', 'assigned_to', 'priority', 'status', 'scheduled_date']
+    list_filter = ['status', 'priority', 'school']
+    search_fields = ['student__student_id', 'student__first_name', 'student__last_name']
+    raw_id_fields = ['student', 'guardian', 'assigned_to', 'household_students']
+    list_select_related = ['student', 'school', 'zone', 'assigned_to']
+
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        if request.user.role == 'SUPER_ADMIN':
+            return qs
+        if request.user.school:
+            return qs.filter(school=request.user.school)
+        return qs.none()
+
+
+@admin.register(VisitGenerationRun)
+class VisitGenerationRunAdmin(admin.ModelAdmin):
+    list_display = ['as_of', 'started_at', 'schools_processed', 'students_flagged',
+                    'visits_created', 'visits_updated', 'skipped_open', 'duration_ms']
+    readonly_fields = [field.name for field in VisitGenerationRun._meta.fields]
+
+
+@admin.register(VisitPhoto)
+class VisitPhotoAdmin(admin.ModelAdmin):
+    list_display = ['id', 'visit', 'uploaded_by', 'created_at']
+    raw_id_fields = ['visit', 'uploaded_by']
+    list_select_related = ['visit__student', 'uploaded_by']
+
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        if request.user.role == 'SUPER_ADMIN':
+            return qs
+        if request.user.school:
+            return qs.filter(visit__school=request.user.school)
+        return qs.none()
+
+
+@admin.register(PhotoUpload)
+class PhotoUploadAdmin(admin.ModelAdmin):
+    list_display = ['id', 'visit_id', 'uploaded_by', 'offset', 'size', 'status', 'updated_at']
+    list_filter = ['status']
+    list_select_related = ['uploaded_by']
+    readonly_fields = [field.name for field in PhotoUpload._meta.fields]
+
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        if request.user.role == 'SUPER_ADMIN':
+            return qs
+        if request.user.school:
+            return qs.filter(visit__school=request.user.school)
+        return qs.none()
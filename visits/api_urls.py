@@ -1,9 +1,12 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from . import api_views
 
 router = DefaultRouter()
 # Will add viewsets when implementing
 
 urlpatterns = [
     path('', include(router.urls)),
-]
\ No newline at end of file
+    path('<int:visit_id>/photos/uploads/', api_views.PhotoUploadStartView.as_view(), name='visit_photo_upload_start'),
+    path('uploads/<uuid:upload_id>/', api_views.PhotoUploadView.as_view(), name='visit_photo_upload'),
+]
@@ -0,0 +1,131 @@
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .models import HomeVisit, PhotoUpload
+from .uploads import (
+    VISIT_UPLOAD_CHUNK_BYTES, VISIT_UPLOAD_MAX_CHUNK_BYTES, UploadError, remove_part, start_upload, write_chunk,
+)
+
+
+def visible_visits(user):
+    """Visits a user may attach photos to: their school's, or their own for field officers."""
+    if user.role == 'SUPER_ADMIN':
+        return HomeVisit.objects.all()
+    if user.role == 'SCHOOL_ADMIN' and user.school_id:
+        return HomeVisit.objects.filter(school_id=user.school_id)
+    if user.role == 'FIELD_OFFICER':
+        return HomeVisit.objects.filter(assigned_to=user)
+    return HomeVisit.objects.none()
+
+
+def upload_state(request, upload):
+    state = {
+        'id': str(upload.id),
+        'visit': upload.visit_id,
+        'size': upload.size,
+        'offset': upload.offset,
+        'status': upload.status,
+        'chunk_size': VISIT_UPLOAD_CHUNK_BYTES,
+        'max_chunk_size': VISIT_UPLOAD_MAX_CHUNK_BYTES,
+    }
+    if upload.error:
+        state['error'] = upload.error
+    if upload.photo_id:
+        state['photo'] = {
+            'id': upload.photo_id,
+            'url': request.build_absolute_uri(upload.photo.photo.url),
+            'thumbnail_url': request.build_absolute_uri(upload.photo.thumbnail.url),
+        }
+    return state
+
+
+def upload_response(request, upload, status=200):
+    response = Response(upload_state(request, upload), status=status)
+    response['Upload-Offset'] = str(upload.offset)
+    return response
+
+
+class PhotoUploadStartView(APIView):
+    """
+    Begin a resumable photo upload for a visit:
+    {"size": <bytes>, "sha256": "<hex digest of the whole file>", "filename": "..."}.
+    Send the file with PATCH requests to the returned upload (see PhotoUploadView).
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, visit_id):
+        visit = visible_visits(request.user).filter(id=visit_id).first()
+        if visit is None:
+            return Response({'error': 'Visit not found'}, status=404)
+        try:
+            size = int(request.data.get('size'))
+        except (TypeError, ValueError):
+            return Response({'error': 'size must be the file size in bytes'}, status=400)
+        try:
+            upload = start_upload(visit, request.user, size, request.data.get('sha256'),
+                                  filename=str(request.data.get('filename') or ''))
+        except UploadError as e:
+            return Response({'error': str(e)}, status=e.status)
+        return upload_response(request, upload, status=201)
+
+
+class PhotoUploadView(APIView):
+    """
+    One resumable upload.
+
+    GET (or HEAD) returns the bytes received so far as ``offset`` and in
+    the ``Upload-Offset`` header. PATCH sends the next chunk as the raw
+    request body, with ``Upload-Offset`` set to that offset and optionally
+    ``Upload-Checksum: sha256 <hex>`` for the chunk. A mismatched offset is
+    answered with 409 and the current offset. After the last chunk the
+    status moves to PROCESSING, then COMPLETE with the photo's URLs once
+    the image is processed. DELETE abandons the upload.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_upload(self, request, upload_id):
+        uploads = PhotoUpload.objects.select_related('photo')
+        if request.user.role != 'SUPER_ADMIN':
+            uploads = uploads.filter(uploaded_by=request.user)
+        return uploads.filter(id=upload_id).first()
+
+    def get(self, request, upload_id):
+        upload = self.get_upload(request, upload_id)
+        if upload is None:
+            return Response({'error': 'Upload not found'}, status=404)
+        return upload_response(request, upload)
+
+    def patch(self, request, upload_id):
+        upload = self.get_upload(request, upload_id)
+        if upload is None:
+            return Response({'error': 'Upload not found'}, status=404)
+        try:
+            offset = int(request.headers.get('Upload-Offset', ''))
+            length = int(request.headers.get('Content-Length') or 0)
+        except ValueError:
+            return Response({'error': 'Upload-Offset must be the byte offset of the chunk'}, status=400)
+        checksum = request.headers.get('Upload-Checksum')
+        if checksum is not None:
+            algorithm, _, checksum = checksum.partition(' ')
+            if algorithm.lower() != 'sha256':
+                return Response({'error': 'Upload-Checksum must be "sha256 <hex digest>"'}, status=400)
+
+        try:
+            # The raw body is read in blocks straight into the part file
+            write_chunk(upload, offset, request.stream, length, chunk_sha256=checksum)
+        except UploadError as e:
+            response = upload_response(request, upload, status=e.status)
+            response.data['error'] = str(e)
+            return response
+        return upload_response(request, upload)
+
+    def delete(self, request, upload_id):
+        upload = self.get_upload(request, upload_id)
+        if upload is None:
+            return Response({'error': 'Upload not found'}, status=404)
+        if upload.status == 'COMPLETE':
+            return Response({'error': 'Upload is complete; delete the photo instead'}, status=409)
+        remove_part(upload.id)
+        upload.delete()
+        return Response(status=204)
@@ -0,0 +1,195 @@
+"""
+Workload-balanced assignment of pending home visits to field officers.
+
+Each run plans one day for every school in a single batch. Visits are
+processed in priority order and each one goes to the eligible officer with
+the lowest estimated workload (existing open visits plus estimated travel).
+Visits that already have an eligible officer keep it, so re-running the
+scheduler for the same day does not churn assignments.
+"""
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from schools.models import SchoolSettings, User, Zone
+from .models import HomeVisit
+from .utils import centroid, haversine_km, locate_zone, parse_gps, zone_polygon
+
+# Estimated minutes spent at a household, excluding travel
+VISIT_BASE_MINUTES = getattr(settings, 'VISIT_BASE_MINUTES', 30)
+# Average travel speed used to turn distance into minutes
+VISIT_TRAVEL_KMH = getattr(settings, 'VISIT_TRAVEL_KMH', 15)
+# Normal-priority visits are held back once an officer's planned work exceeds this
+VISIT_OFFICER_DAILY_MINUTES = getattr(settings, 'VISIT_OFFICER_DAILY_MINUTES', 360)
+# Default SchoolSettings.visit_priority_threshold for schools without settings
+DEFAULT_PRIORITY_THRESHOLD = 3
+
+
+@dataclass
+class AssignmentResult:
+    """Summary of one scheduler run."""
+    assigned: int = 0
+    kept: int = 0
+    deferred: int = 0
+    unassignable: int = 0
+    officer_load: dict = field(default_factory=dict)
+
+
+def _travel_minutes(origin, home):
+    if origin is None or home is None:
+        return 0.0
+    return haversine_km(origin, home) / VISIT_TRAVEL_KMH * 60
+
+
+def plan_school(visits, officers, threshold, school_origin=None):
+    """
+    Assign visits for one school. Pure function over plain data.
+
+    ``visits`` is a list of dicts with ``id``, ``zone_id``, ``home``,
+    ``priority``, ``absence_count`` and ``assigned_to_id``.
+    ``officers`` maps officer id to a dict with ``zones`` (set of zone ids)
+    and ``origin`` (a (lat, lng) point or None).
+
+    Returns ({visit_id: officer_id or None}, AssignmentResult).
+    """
+    result = AssignmentResult()
+    load = {officer_id: 0.0 for officer_id in officers}
+    plan = {}
+
+    def is_high(visit):
+        return visit['priority'] == 'HIGH' or visit['absence_count'] >= threshold
+
+    def eligible(visit):
+        covering = [oid for oid, o in officers.items() if visit['zone_id'] in o['zones']]
+        return covering or list(officers)
+
+    def cost(visit, officer_id):
+        origin = officers[officer_id]['origin'] or school_origin
+        return VISIT_BASE_MINUTES + _travel_minutes(origin, visit['home'])
+
+    # Keep existing assignments to eligible officers; they count towards load
+    to_assign = []
+    for visit in visits:
+        officer_id = visit['assigned_to_id']
+        if officer_id in officers and officer_id in eligible(visit):
+            load[officer_id] += cost(visit, officer_id)
+            plan[visit['id']] = officer_id
+            result.kept += 1
+        else:
+            to_assign.append(visit)
+
+    # High priority first, then by absences, then oldest visit first
+    to_assign.sort(key=lambda v: (not is_high(v), -v['absence_count'], v['id']))
+
+    for visit in to_assign:
+        if not officers:
+            plan[visit['id']] = None
+            result.unassignable += 1
+            continue
+        candidates = sorted(
+            (load[oid] + cost(visit, oid), oid) for oid in eligible(visit)
+        )
+        projected, officer_id = candidates[0]
+        if not is_high(visit) and projected > VISIT_OFFICER_DAILY_MINUTES:
+            plan[visit['id']] = None
+            result.deferred += 1
+            continue
+        load[officer_id] = projected
+        plan[visit['id']] = officer_id
+        result.assigned += 1
+
+    result.officer_load = {oid: round(minutes) for oid, minutes in load.items()}
+    return plan, result
+
+
+def assign_visits(schools=None, date=None):
+    """
+    Balance open visits across field officers for every school in one batch.
+
+    Returns a dict mapping school id to its AssignmentResult.
+    """
+    date = date or timezone.localdate()
+
+    visit_qs = HomeVisit.objects.filter(status__in=HomeVisit.OPEN_STATUSES)
+    officer_qs = User.objects.filter(role='FIELD_OFFICER', is_active=True)
+    zone_qs = Zone.objects.all()
+    settings_qs = SchoolSettings.objects.all()
+    if schools is not None:
+        visit_qs = visit_qs.filter(school__in=schools)
+        officer_qs = officer_qs.filter(school__in=schools)
+        zone_qs = zone_qs.filter(school__in=schools)
+        settings_qs = settings_qs.filter(school__in=schools)
+
+    thresholds = dict(settings_qs.values_list('school_id', 'visit_priority_threshold'))
+
+    zones_by_school = defaultdict(list)
+    zone_centres = {}
+    for zone_id, school_id, boundary in zone_qs.order_by('id').values_list(
+            'id', 'school_id', 'boundary_coordinates'):
+        polygon = zone_polygon(boundary)
+        zones_by_school[school_id].append((zone_id, polygon))
+        zone_centres[zone_id] = centroid(polygon)
+
+    officers_by_school = defaultdict(dict)
+    for officer_id, school_id in officer_qs.order_by('id').values_list('id', 'school_id'):
+        officers_by_school[school_id][officer_id] = {'zones': set(), 'origin': None}
+    Through = User.assigned_zones.through
+    officer_zones = Through.objects.filter(
+        user__in=officer_qs.values('id')
+    ).values_list('user_id', 'zone_id', 'user__school_id')
+    for officer_id, zone_id, school_id in officer_zones:
+        officers_by_school[school_id][officer_id]['zones'].add(zone_id)
+    for officers in officers_by_school.values():
+        for officer in officers.values():
+            centres = [zone_centres[z] for z in sorted(officer['zones']) if zone_centres.get(z)]
+            officer['origin'] = centroid(centres)
+
+    visits_by_school = defaultdict(list)
+    rows = visit_qs.order_by('id').values(
+        'id', 'school_id', 'zone_id', 'assigned_to_id', 'priority',
+        'absence_count', 'scheduled_date', 'student__gps_coordinates',
+        'school__latitude', 'school__longitude',
+    )
+    school_origins = {}
+    for row in rows:
+        home = parse_gps(row.pop('student__gps_coordinates'))
+        lat, lng = row.pop('school__latitude'), row.pop('school__longitude')
+        if lat is not None and lng is not None:
+            school_origins[row['school_id']] = (float(lat), float(lng))
+        row['home'] = home
+        if row['zone_id'] is None:
+            row['resolved_zone_id'] = locate_zone(home, zones_by_school[row['school_id']])
+            row['zone_id'] = row['resolved_zone_id']
+        visits_by_school[row['school_id']].append(row)
+
+    results = {}
+    changes = defaultdict(list)
+    for school_id, visits in visits_by_school.items():
+        plan, result = plan_school(
+            visits,
+            officers_by_school.get(school_id, {}),
+            thresholds.get(school_id, DEFAULT_PRIORITY_THRESHOLD),
+            school_origin=school_origins.get(school_id),
+        )
+        results[school_id] = result
+        for visit in visits:
+            officer_id = plan[visit['id']]
+            update = {}
+            if visit.get('resolved_zone_id'):
+                update['zone_id'] = visit['resolved_zone_id']
+            if officer_id != visit['assigned_to_id']:
+                update['assigned_to_id'] = officer_id
+                update['scheduled_date'] = date if officer_id else None
+            elif officer_id and visit['scheduled_date'] is None:
+                update['scheduled_date'] = date
+            if update:
+                changes[tuple(sorted(update))].append(HomeVisit(id=visit['id'], **update))
+
+    # Only rows whose assignment actually changed are written
+    with transaction.atomic():
+        for update_fields, batch in changes.items():
+            HomeVisit.objects.bulk_update(batch, list(update_fields), batch_size=500)
+    return results
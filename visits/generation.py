@@ -0,0 +1,150 @@
+"""
+Visit generation from absence flags.
+
+Flagged students are grouped into households first, so siblings sharing a
+guardian produce one visit with their absences combined. The pipeline
+covers every school with ``auto_generate_visits`` enabled using a handful
+of set-based queries and a single bulk upsert keyed on
+(student, flag_window_start), so running it twice for the same day
+changes nothing.
+"""
+import time
+
+from django.db import transaction
+from django.utils import timezone
+
+from attendance.services import flagged_students_by_school, monitoring_window
+from schools.models import SchoolSettings
+from .households import build_household_graph, group_flagged_students
+from .models import HomeVisit, VisitGenerationRun
+
+UPSERT_FIELDS = ['guardian', 'absence_count', 'priority', 'flag_window_end']
+
+
+def visit_priority(absence_count, threshold):
+    """Priority for a household visit given its combined absences."""
+    return 'HIGH' if absence_count >= threshold else 'NORMAL'
+
+
+def open_visit_windows(school_ids):
+    """
+    Map each student covered by an open visit, as lead or sibling, to the
+    (lead student id, flag window start) of that visit.
+    """
+    open_visits = HomeVisit.objects.filter(
+        school_id__in=school_ids, status__in=HomeVisit.OPEN_STATUSES
+    ).order_by()
+    covered = {
+        student_id: (student_id, window_start)
+        for student_id, window_start in open_visits.values_list('student_id', 'flag_window_start')
+    }
+    siblings = HomeVisit.household_students.through.objects.filter(
+        homevisit__in=open_visits
+    ).values_list('student_id', 'homevisit__student_id', 'homevisit__flag_window_start')
+    for student_id, lead_id, window_start in siblings:
+        covered.setdefault(student_id, (lead_id, window_start))
+    return covered
+
+
+def existing_visit_values(visits):
+    """Current upsert field values of stored visits matching the given keys."""
+    rows = HomeVisit.objects.filter(
+        student_id__in={visit.student_id for visit in visits},
+        flag_window_start__in={visit.flag_window_start for visit in visits},
+    ).order_by().values_list(
+        'id', 'student_id', 'flag_window_start', 'guardian_id',
+        'absence_count', 'priority', 'flag_window_end',
+    )
+    return {(row[1], row[2]): (row[0], row[3:]) for row in rows}
+
+
+def run_visit_generation(as_of=None, schools=None):
+    """
+    Create or update household visits for every auto-generating school.
+
+    Households whose students already have an open visit from an earlier
+    flag window are skipped; visits for the current window are updated in
+    place. Only rows whose values change are written. Returns the saved
+    VisitGenerationRun.
+    """
+    started = time.monotonic()
+    as_of = as_of or timezone.localdate()
+    run = VisitGenerationRun(as_of=as_of)
+
+    settings_qs = SchoolSettings.objects.filter(
+        auto_generate_visits=True, school__is_active=True
+    ).order_by('school_id')
+    if schools is not None:
+        settings_qs = settings_qs.filter(school__in=schools)
+    settings_list = list(settings_qs)
+    school_ids = [settings.school_id for settings in settings_list]
+    run.schools_processed = len(settings_list)
+
+    flags = flagged_students_by_school(settings_list, as_of)
+    run.students_flagged = sum(len(school_flags) for school_flags in flags.values())
+
+    candidates = []
+    if run.students_flagged:
+        graph = build_household_graph(school_ids)
+        covered = open_visit_windows(school_ids)
+        for settings in settings_list:
+            window_start, window_end = monitoring_window(settings.absence_monitoring_period, as_of)
+            for household in group_flagged_students(flags[settings.school_id], graph):
+                run.households_flagged += 1
+                open_windows = {covered[sid] for sid in household.student_ids if sid in covered}
+                if any(window != window_start for _, window in open_windows):
+                    run.skipped_open += 1
+                    continue
+                # Keep the lead of a visit already raised in this window
+                lead_id = min(lead for lead, _ in open_windows) if open_windows else household.lead_student_id
+                visit = HomeVisit(
+                    school_id=settings.school_id,
+                    student_id=lead_id,
+                    guardian_id=household.guardian_id,
+                    absence_count=household.absence_count,
+                    priority=visit_priority(household.absence_count, settings.visit_priority_threshold),
+                    flag_window_start=window_start,
+                    flag_window_end=window_end,
+                )
+                candidates.append((visit, household.student_ids))
+
+    changed = []
+    if candidates:
+        existing = existing_visit_values([visit for visit, _ in candidates])
+        for visit, student_ids in candidates:
+            key = (visit.student_id, visit.flag_window_start)
+            values = (visit.guardian_id, visit.absence_count, visit.priority, visit.flag_window_end)
+            if key not in existing:
+                run.visits_created += 1
+            elif existing[key][1] != values:
+                run.visits_updated += 1
+            else:
+                continue
+            changed.append((visit, student_ids))
+
+    with transaction.atomic():
+        if changed:
+            HomeVisit.objects.bulk_create(
+                [visit for visit, _ in changed],
+                update_conflicts=True,
+                unique_fields=['student', 'flag_window_start'],
+                update_fields=UPSERT_FIELDS,
+                batch_size=500,
+            )
+            ids = existing_visit_values([visit for visit, _ in changed])
+            Through = HomeVisit.household_students.through
+            Through.objects.bulk_create(
+                [
+                    Through(
+                        homevisit_id=ids[(visit.student_id, visit.flag_window_start)][0],
+                        student_id=student_id,
+                    )
+                    for visit, student_ids in changed
+                    for student_id in student_ids
+                ],
+                ignore_conflicts=True,
+                batch_size=1000,
+            )
+        run.duration_ms = int((time.monotonic() - started) * 1000)
+        run.save()
+    return run
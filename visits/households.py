@@ -0,0 +1,123 @@
+"""
+Household grouping for home visits.
+
+Students who share a guardian live in the same household, so flagged
+siblings should be covered by one visit. The guardian-student graph is
+loaded with a single query and collapsed with union-find.
+"""
+from dataclasses import dataclass, field
+
+from students.models import GuardianStudent
+
+
+class UnionFind:
+    """Disjoint-set forest with path halving and union by size."""
+
+    def __init__(self):
+        self.parent = {}
+        self.size = {}
+
+    def find(self, item):
+        parent = self.parent
+        if item not in parent:
+            parent[item] = item
+            self.size[item] = 1
+            return item
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, a, b):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return root_a
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size[root_b]
+        return root_a
+
+
+@dataclass
+class HouseholdGraph:
+    """Household membership and primary guardians for a set of students."""
+    households: dict = field(default_factory=dict)
+    primary_guardians: dict = field(default_factory=dict)
+
+    def household_of(self, student_id):
+        # Students without guardians form a household of their own
+        return self.households.get(student_id, ('student', student_id))
+
+
+def build_household_graph(school_ids):
+    """
+    Load every guardian link for the given schools' students and group them.
+
+    Guardian and student ids are kept in separate namespaces inside the
+    union-find so a guardian id never collides with a student id.
+    """
+    links = (
+        GuardianStudent.objects
+        .filter(student__school_id__in=school_ids)
+        .order_by('student_id', '-is_primary', 'id')
+        .values_list('guardian_id', 'student_id', 'is_primary')
+    )
+    forest = UnionFind()
+    graph = HouseholdGraph()
+    students = set()
+    for guardian_id, student_id, is_primary in links:
+        forest.union(('student', student_id), ('guardian', guardian_id))
+        students.add(student_id)
+        if is_primary:
+            graph.primary_guardians.setdefault(student_id, guardian_id)
+
+    # Use the smallest student id in each household as its stable key
+    roots = {}
+    for student_id in sorted(students):
+        root = forest.find(('student', student_id))
+        roots.setdefault(root, ('student', student_id))
+        graph.households[student_id] = roots[root]
+    return graph
+
+
+@dataclass
+class HouseholdFlag:
+    """Flagged students of one household, merged into a single visit."""
+    lead_student_id: int
+    student_ids: list
+    absence_count: int
+    max_absences: int
+    guardian_id: int = None
+
+
+def group_flagged_students(flags, graph):
+    """
+    Merge flagged students by household.
+
+    ``flags`` maps student id to absence count. The lead student is the most
+    absent sibling (lowest id on ties); the combined absence count is the
+    sum over all flagged siblings.
+    """
+    grouped = {}
+    for student_id in sorted(flags):
+        grouped.setdefault(graph.household_of(student_id), []).append(student_id)
+
+    result = []
+    for student_ids in grouped.values():
+        lead = min(student_ids, key=lambda sid: (-flags[sid], sid))
+        guardian_id = graph.primary_guardians.get(lead)
+        if guardian_id is None:
+            guardian_id = next(
+                (graph.primary_guardians[s] for s in student_ids if s in graph.primary_guardians),
+                None,
+            )
+        result.append(HouseholdFlag(
+            lead_student_id=lead,
+            student_ids=student_ids,
+            absence_count=sum(flags[sid] for sid in student_ids),
+            max_absences=max(flags[sid] for sid in student_ids),
+            guardian_id=guardian_id,
+        ))
+    result.sort(key=lambda flag: flag.lead_student_id)
+    return result
@@ -0,0 +1,45 @@
+import datetime
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from schools.models import School
+from visits.assignment import assign_visits
+
+
+class Command(BaseCommand):
+    help = 'Balance open home visits across field officers for one day (all schools by default)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--school', action='append', dest='schools', metavar='CODE',
+                            help='Only plan the given school code (repeatable)')
+        parser.add_argument('--date', help='Planning date as YYYY-MM-DD (default: today)')
+
+    def handle(self, *args, **options):
+        date = None
+        if options['date']:
+            try:
+                date = datetime.date.fromisoformat(options['date'])
+            except ValueError:
+                raise CommandError('--date must be in YYYY-MM-DD format')
+
+        schools = None
+        if options['schools']:
+            schools = School.objects.filter(code__in=options['schools'])
+            missing = set(options['schools']) - set(schools.values_list('code', flat=True))
+            if missing:
+                raise CommandError(f"Unknown school code(s): {', '.join(sorted(missing))}")
+
+        started = time.monotonic()
+        results = assign_visits(schools=schools, date=date)
+        elapsed = time.monotonic() - started
+
+        codes = dict(School.objects.filter(id__in=results).values_list('id', 'code'))
+        for school_id, result in sorted(results.items(), key=lambda item: codes.get(item[0], '')):
+            self.stdout.write(
+                f"{codes.get(school_id, school_id)}: {result.assigned} assigned, {result.kept} kept, "
+                f"{result.deferred} deferred, {result.unassignable} without an officer"
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'Planned visits for {len(results)} school(s) in {elapsed:.2f}s'
+        ))
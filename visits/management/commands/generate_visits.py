@@ -0,0 +1,39 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from schools.models import School
+from visits.generation import run_visit_generation
+
+
+class Command(BaseCommand):
+    help = 'Generate household home visits from absence flags for schools with auto-generation enabled'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--school', action='append', dest='schools', metavar='CODE',
+                            help='Only process the given school code (repeatable)')
+        parser.add_argument('--date', help='Date to evaluate absence flags for, as YYYY-MM-DD (default: today)')
+
+    def handle(self, *args, **options):
+        as_of = None
+        if options['date']:
+            try:
+                as_of = datetime.date.fromisoformat(options['date'])
+            except ValueError:
+                raise CommandError('--date must be in YYYY-MM-DD format')
+
+        schools = None
+        if options['schools']:
+            schools = School.objects.filter(code__in=options['schools'])
+            missing = set(options['schools']) - set(schools.values_list('code', flat=True))
+            if missing:
+                raise CommandError(f"Unknown school code(s): {', '.join(sorted(missing))}")
+
+        run = run_visit_generation(as_of=as_of, schools=schools)
+        self.stdout.write(
+            f'{run.schools_processed} school(s), {run.students_flagged} flagged student(s) in '
+            f'{run.households_flagged} household(s); {run.skipped_open} skipped with open visits'
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'{run.visits_created} visit(s) created, {run.visits_updated} updated in {run.duration_ms} ms'
+        ))
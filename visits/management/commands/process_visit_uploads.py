@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from visits.uploads import process_stale, purge_expired
+
+
+class Command(BaseCommand):
+    help = 'Finish visit photo uploads whose processing was interrupted and delete abandoned ones'
+
+    def handle(self, *args, **options):
+        processed = process_stale()
+        purged = purge_expired()
+        self.stdout.write(self.style.SUCCESS(
+            f'Processed {processed} interrupted upload(s), deleted {purged} abandoned upload(s)'
+        ))
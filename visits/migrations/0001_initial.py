@@ -0,0 +1,39 @@
+# Generated by Django 4.2.17 on 2026-10-19 13:08
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('students', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('schools', '0002_alter_user_employee_number'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HomeVisit',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scheduled_date', models.DateField(blank=True, null=True)),
+                ('priority', models.CharField(choices=[('HIGH', 'High'), ('NORMAL', 'Normal')], default='NORMAL', max_length=10)),
+                ('absence_count', models.PositiveIntegerField(default=0, help_text='Absences in the monitoring period when the visit was raised')),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('COMPLETED', 'Completed'), ('RESCHEDULED', 'Rescheduled'), ('CANCELLED', 'Cancelled')], default='PENDING', max_length=15)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('assigned_to', models.ForeignKey(blank=True, limit_choices_to={'role': 'FIELD_OFFICER'}, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='assigned_visits', to=settings.AUTH_USER_MODEL)),
+                ('school', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='home_visits', to='schools.school')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='home_visits', to='students.student')),
+                ('zone', models.ForeignKey(blank=True, help_text="Zone containing the student's home, if known", null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='home_visits', to='schools.zone')),
+            ],
+            options={
+                'ordering': ['school', '-scheduled_date', 'priority'],
+                'indexes': [models.Index(fields=['school', 'status'], name='visits_home_school__f3f93d_idx'), models.Index(fields=['assigned_to', 'status'], name='visits_home_assigne_03cdd9_idx'), models.Index(fields=['student', 'status'], name='visits_home_student_ead39d_idx')],
+            },
+        ),
+    ]
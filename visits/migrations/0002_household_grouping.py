@@ -0,0 +1,30 @@
+# Generated by Django 4.2.17 on 2026-10-19 13:09
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0001_initial'),
+        ('visits', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='homevisit',
+            name='guardian',
+            field=models.ForeignKey(blank=True, help_text='Primary guardian to meet during the visit', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='home_visits', to='students.guardian'),
+        ),
+        migrations.AddField(
+            model_name='homevisit',
+            name='household_students',
+            field=models.ManyToManyField(blank=True, help_text='Flagged students from the same household covered by this visit', related_name='household_visits', to='students.student'),
+        ),
+        migrations.AlterField(
+            model_name='homevisit',
+            name='absence_count',
+            field=models.PositiveIntegerField(default=0, help_text='Combined absences of the household in the monitoring period'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.17 on 2026-10-19 13:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('visits', '0002_household_grouping'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VisitGenerationRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('as_of', models.DateField()),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('duration_ms', models.PositiveIntegerField(default=0)),
+                ('schools_processed', models.PositiveIntegerField(default=0)),
+                ('students_flagged', models.PositiveIntegerField(default=0)),
+                ('households_flagged', models.PositiveIntegerField(default=0)),
+                ('skipped_open', models.PositiveIntegerField(default=0, help_text='Households skipped because a student already has an open visit')),
+                ('visits_created', models.PositiveIntegerField(default=0)),
+                ('visits_updated', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-started_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='homevisit',
+            name='flag_window_end',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='homevisit',
+            name='flag_window_start',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='homevisit',
+            constraint=models.UniqueConstraint(fields=('student', 'flag_window_start'), name='unique_visit_per_flag_window'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.17 on 2026-10-19 13:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('visits', '0003_generation_pipeline'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='homevisit',
+            options={'ordering': ['school_id', '-scheduled_date', 'priority']},
+        ),
+        migrations.AddIndex(
+            model_name='homevisit',
+            index=models.Index(fields=['school', '-scheduled_date', 'priority'], name='visits_home_school__5ba7de_idx'),
+        ),
+    ]
@@ -1,2 +1,189 @@
+import uuid
+
 from django.db import models
-# Placeholder - will be implemented in later phases
\ No newline at end of file
+from schools.models import School, Zone, User
+from students.models import Guardian, Student
+
+
+class HomeVisit(models.Model):
+    """
+    A home visit to follow up on a flagged student.
+    Visits are assigned to field officers working the student's zone.
+    """
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('COMPLETED', 'Completed'),
+        ('RESCHEDULED', 'Rescheduled'),
+        ('CANCELLED', 'Cancelled'),
+    ]
+    PRIORITY_CHOICES = [
+        ('HIGH', 'High'),
+        ('NORMAL', 'Normal'),
+    ]
+    OPEN_STATUSES = ['PENDING', 'RESCHEDULED']
+
+    school = models.ForeignKey(School, on_delete=models.CASCADE, related_name='home_visits')
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='home_visits')
+    zone = models.ForeignKey(
+        Zone,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='home_visits',
+        help_text="Zone containing the student's home, if known"
+    )
+    assigned_to = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='assigned_visits',
+        limit_choices_to={'role': 'FIELD_OFFICER'}
+    )
+
+    # Household grouping: one visit covers all flagged siblings
+    household_students = models.ManyToManyField(
+        Student,
+        blank=True,
+        related_name='household_visits',
+        help_text='Flagged students from the same household covered by this visit'
+    )
+    guardian = models.ForeignKey(
+        Guardian,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='home_visits',
+        help_text='Primary guardian to meet during the visit'
+    )
+
+    # Scheduling
+    scheduled_date = models.DateField(null=True, blank=True)
+    priority = models.CharField(max_length=10, choices=PRIORITY_CHOICES, default='NORMAL')
+    absence_count = models.PositiveIntegerField(
+        default=0,
+        help_text='Combined absences of the household in the monitoring period'
+    )
+    status = models.CharField(max_length=15, choices=STATUS_CHOICES, default='PENDING')
+
+    # Absence monitoring window that raised the visit (empty for manual visits)
+    flag_window_start = models.DateField(null=True, blank=True)
+    flag_window_end = models.DateField(null=True, blank=True)
+
+    # Tracking fields
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['school_id', '-scheduled_date', 'priority']
+        indexes = [
+            models.Index(fields=['school', '-scheduled_date', 'priority']),
+            models.Index(fields=['school', 'status']),
+            models.Index(fields=['assigned_to', 'status']),
+            models.Index(fields=['student', 'status']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['student', 'flag_window_start'],
+                name='unique_visit_per_flag_window',
+            ),
+        ]
+
+    def __str__(self):
+        return f"Visit to {self.student.get_full_name()} ({self.get_status_display()})"
+
+    @property
+    def is_open(self):
+        return self.status in self.OPEN_STATUSES
+
+
+class VisitGenerationRun(models.Model):
+    """
+    Metrics for one run of the visit generation pipeline.
+    """
+    as_of = models.DateField()
+    started_at = models.DateTimeField(auto_now_add=True)
+    duration_ms = models.PositiveIntegerField(default=0)
+
+    schools_processed = models.PositiveIntegerField(default=0)
+    students_flagged = models.PositiveIntegerField(default=0)
+    households_flagged = models.PositiveIntegerField(default=0)
+    skipped_open = models.PositiveIntegerField(
+        default=0,
+        help_text='Households skipped because a student already has an open visit'
+    )
+    visits_created = models.PositiveIntegerField(default=0)
+    visits_updated = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['-started_at']
+
+    def __str__(self):
+        return f"Visit generation for {self.as_of} ({self.visits_created} created)"
+
+
+class VisitPhoto(models.Model):
+    """
+    An evidence photo attached to a home visit. ``photo`` and ``thumbnail``
+    are re-encoded, content-hashed copies of the upload (see schools.images).
+    """
+    visit = models.ForeignKey(HomeVisit, on_delete=models.CASCADE, related_name='photos')
+    uploaded_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='visit_photos'
+    )
+    photo = models.ImageField()
+    thumbnail = models.ImageField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['visit_id', 'id']
+
+    def __str__(self):
+        return f"Photo {self.id} for visit {self.visit_id}"
+
+
+class PhotoUpload(models.Model):
+    """
+    A resumable upload of one visit photo. Chunks are written to a part
+    file at ``offset`` until ``size`` bytes have arrived; the whole file is
+    then checked against ``sha256`` and handed to the image stage, which
+    creates the VisitPhoto (see visits/uploads.py).
+    """
+    STATUS_CHOICES = [
+        ('RECEIVING', 'Receiving'),
+        ('PROCESSING', 'Processing'),
+        ('COMPLETE', 'Complete'),
+        ('FAILED', 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    visit = models.ForeignKey(HomeVisit, on_delete=models.CASCADE, related_name='photo_uploads')
+    uploaded_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='photo_uploads')
+    filename = models.CharField(max_length=255, blank=True)
+    size = models.PositiveBigIntegerField(help_text='Total bytes the client will send')
+    sha256 = models.CharField(max_length=64, help_text='Hex SHA-256 of the complete file')
+    offset = models.PositiveBigIntegerField(default=0, help_text='Bytes received so far')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='RECEIVING')
+    error = models.TextField(blank=True)
+    photo = models.OneToOneField(
+        VisitPhoto,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='upload'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'updated_at']),
+        ]
+
+    def __str__(self):
+        return f"Upload {self.id} ({self.offset}/{self.size} bytes, {self.get_status_display()})"
@@ -0,0 +1,213 @@
+"""
+Resumable uploads of visit evidence photos.
+
+Connections in the field drop often, so a photo is sent as a series of
+chunks rather than one multipart POST:
+
+1. ``start_upload()`` records the total size and the SHA-256 of the file
+   and creates an empty part file under VISIT_UPLOAD_DIR.
+2. ``write_chunk()`` streams each chunk straight into the part file at the
+   client's offset, which must equal the bytes received so far. A chunk
+   cut short by a dropped connection still counts for the bytes that
+   arrived, so the client asks for the offset and continues from there.
+3. Once the last byte arrives, the part file is hashed in blocks and
+   compared with the declared SHA-256. The upload then moves to
+   PROCESSING and is handed to the image stage in the background. That
+   stage creates the VisitPhoto and removes the part file.
+
+No step reads a whole file into memory. ``process_stale()`` retries
+processing lost to a restart, and ``purge_expired()`` removes uploads
+abandoned for VISIT_UPLOAD_EXPIRY_HOURS. Both run from
+``manage.py process_visit_uploads``.
+"""
+import datetime
+import hashlib
+import logging
+import os
+import re
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from schools.images import ImageError, render_variants, run_in_background
+from .models import PhotoUpload, VisitPhoto
+
+VISIT_UPLOAD_DIR = getattr(settings, 'VISIT_UPLOAD_DIR', os.path.join(settings.BASE_DIR, 'upload_parts'))
+VISIT_PHOTO_MAX_BYTES = getattr(settings, 'VISIT_PHOTO_MAX_BYTES', 25 * 1024 * 1024)
+# Largest chunk accepted per request (below nginx's client_max_body_size),
+# and the size suggested to clients: small enough to finish between drops
+VISIT_UPLOAD_MAX_CHUNK_BYTES = getattr(settings, 'VISIT_UPLOAD_MAX_CHUNK_BYTES', 4 * 1024 * 1024)
+VISIT_UPLOAD_CHUNK_BYTES = getattr(settings, 'VISIT_UPLOAD_CHUNK_BYTES', 256 * 1024)
+VISIT_UPLOAD_EXPIRY_HOURS = getattr(settings, 'VISIT_UPLOAD_EXPIRY_HOURS', 48)
+VISIT_PHOTO_VARIANTS = getattr(settings, 'VISIT_PHOTO_VARIANTS', {'full': 1600, 'thumbnail': 160})
+VISIT_PHOTO_PREFIX = 'visits/photos'
+# Processing that has not finished after this long is assumed lost
+PROCESSING_TIMEOUT = datetime.timedelta(minutes=10)
+BLOCK_SIZE = 64 * 1024
+
+_sha256 = re.compile(r'^[0-9a-f]{64}$')
+
+logger = logging.getLogger('attendance_system')
+
+
+class UploadError(Exception):
+    """Raised when a chunk or upload is rejected; ``status`` is the HTTP status to answer with."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def part_path(upload_id):
+    return os.path.join(VISIT_UPLOAD_DIR, f'{upload_id}.part')
+
+
+def remove_part(upload_id):
+    try:
+        os.remove(part_path(upload_id))
+    except FileNotFoundError:
+        pass
+
+
+def start_upload(visit, user, size, sha256, filename=''):
+    sha256 = (sha256 or '').lower()
+    if not _sha256.match(sha256):
+        raise UploadError('sha256 must be the hex SHA-256 of the file')
+    if not 0 < size <= VISIT_PHOTO_MAX_BYTES:
+        raise UploadError(f'size must be between 1 and {VISIT_PHOTO_MAX_BYTES} bytes', status=413)
+    upload = PhotoUpload.objects.create(
+        visit=visit, uploaded_by=user, size=size, sha256=sha256, filename=filename[:255]
+    )
+    os.makedirs(VISIT_UPLOAD_DIR, exist_ok=True)
+    open(part_path(upload.id), 'wb').close()
+    return upload
+
+
+def write_chunk(upload, offset, stream, length, chunk_sha256=None):
+    """
+    Write ``length`` bytes from ``stream`` at ``offset`` and return the new
+    offset. With ``chunk_sha256`` the chunk only counts if it arrives whole
+    and matches; without it, whatever arrived before a disconnect counts.
+    """
+    if upload.status != 'RECEIVING':
+        raise UploadError(f'Upload is {upload.get_status_display().lower()}', status=409)
+    if offset != upload.offset:
+        raise UploadError(f'Expected offset {upload.offset}', status=409)
+    if length > VISIT_UPLOAD_MAX_CHUNK_BYTES:
+        raise UploadError(f'Chunks may be at most {VISIT_UPLOAD_MAX_CHUNK_BYTES} bytes', status=413)
+    if offset + length > upload.size:
+        raise UploadError(f'Chunk ends past the declared size of {upload.size} bytes')
+
+    digest = hashlib.sha256()
+    written = 0
+    try:
+        with open(part_path(upload.id), 'r+b') as part:
+            part.seek(offset)
+            while written < length:
+                try:
+                    block = stream.read(min(BLOCK_SIZE, length - written))
+                except OSError:
+                    # The client went away mid-chunk; keep what arrived
+                    block = b''
+                if not block:
+                    break
+                part.write(block)
+                digest.update(block)
+                written += len(block)
+    except FileNotFoundError:
+        raise UploadError('Upload has expired', status=410)
+
+    if chunk_sha256 is not None and (written < length or digest.hexdigest() != chunk_sha256.lower()):
+        raise UploadError('Chunk checksum mismatch; resend it', status=422)
+
+    new_offset = offset + written
+    # A duplicate request for the same chunk may race this one; only one
+    # moves the offset on
+    if written and not PhotoUpload.objects.filter(pk=upload.pk, status='RECEIVING', offset=offset).update(
+            offset=new_offset, updated_at=timezone.now()):
+        upload.refresh_from_db(fields=['offset', 'status'])
+        raise UploadError(f'Expected offset {upload.offset}', status=409)
+    upload.offset = new_offset
+    if new_offset == upload.size:
+        finish_upload(upload)
+    return new_offset
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def finish_upload(upload):
+    if file_sha256(part_path(upload.id)) != upload.sha256:
+        PhotoUpload.objects.filter(pk=upload.pk).update(
+            status='FAILED', error='Checksum mismatch', updated_at=timezone.now()
+        )
+        upload.status = 'FAILED'
+        remove_part(upload.id)
+        raise UploadError('The file does not match its sha256; start a new upload', status=422)
+    PhotoUpload.objects.filter(pk=upload.pk).update(status='PROCESSING', updated_at=timezone.now())
+    upload.status = 'PROCESSING'
+    upload_id = upload.pk
+    transaction.on_commit(lambda: run_in_background(process_upload, upload_id))
+
+
+def process_upload(upload_id):
+    """Run the image stage for a received upload and attach the photo to its visit."""
+    upload = PhotoUpload.objects.filter(pk=upload_id, status='PROCESSING').first()
+    if upload is None:
+        return None
+    try:
+        with open(part_path(upload_id), 'rb') as file:
+            names = render_variants(file, VISIT_PHOTO_VARIANTS, VISIT_PHOTO_PREFIX)
+    except FileNotFoundError:
+        # Processed and removed by another worker meanwhile
+        return None
+    except ImageError as exc:
+        logger.warning('Visit photo upload %s could not be processed: %s', upload_id, exc)
+        PhotoUpload.objects.filter(pk=upload_id).update(
+            status='FAILED', error='The file is not a usable image', updated_at=timezone.now()
+        )
+        remove_part(upload_id)
+        return None
+
+    with transaction.atomic():
+        if not PhotoUpload.objects.select_for_update().filter(pk=upload_id, status='PROCESSING').exists():
+            return None
+        photo = VisitPhoto.objects.create(
+            visit_id=upload.visit_id, uploaded_by_id=upload.uploaded_by_id,
+            photo=names['full'], thumbnail=names['thumbnail'],
+        )
+        PhotoUpload.objects.filter(pk=upload_id).update(
+            status='COMPLETE', photo=photo, updated_at=timezone.now()
+        )
+    remove_part(upload_id)
+    return photo
+
+
+def process_stale(now=None):
+    """Process uploads whose background processing never finished. Returns the count."""
+    cutoff = (now or timezone.now()) - PROCESSING_TIMEOUT
+    processed = 0
+    for upload_id in PhotoUpload.objects.filter(status='PROCESSING', updated_at__lt=cutoff).values_list('id', flat=True):
+        # Claim it, so two sweepers do not both render it
+        if PhotoUpload.objects.filter(pk=upload_id, updated_at__lt=cutoff).update(updated_at=timezone.now()):
+            if process_upload(upload_id) is not None:
+                processed += 1
+    return processed
+
+
+def purge_expired(now=None):
+    """Delete uploads left incomplete or failed for VISIT_UPLOAD_EXPIRY_HOURS. Returns the count."""
+    cutoff = (now or timezone.now()) - datetime.timedelta(hours=VISIT_UPLOAD_EXPIRY_HOURS)
+    expired = list(
+        PhotoUpload.objects.filter(status__in=['RECEIVING', 'FAILED'], updated_at__lt=cutoff).values_list('id', flat=True)
+    )
+    for upload_id in expired:
+        remove_part(upload_id)
+    PhotoUpload.objects.filter(id__in=expired).delete()
+    return len(expired)
@@ -0,0 +1,87 @@
+"""
+Geographic helpers for visit planning.
+
+Coordinates in this project are stored as (latitude, longitude) pairs:
+``Student.gps_coordinates`` is a "lat,lng" string and ``Zone.boundary_coordinates``
+holds a polygon as ``{"type": "polygon", "coordinates": [[lat, lng], ...]}``.
+"""
+import math
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def parse_gps(value):
+    """Parse a "lat,lng" string into a (lat, lng) tuple, or None if invalid."""
+    if not value:
+        return None
+    try:
+        lat, lng = (float(part) for part in value.split(','))
+    except (TypeError, ValueError):
+        return None
+    return lat, lng
+
+
+def zone_polygon(boundary):
+    """Return the list of (lat, lng) vertices for a zone boundary."""
+    if isinstance(boundary, dict):
+        boundary = boundary.get('coordinates') or []
+    points = []
+    for point in boundary or []:
+        try:
+            points.append((float(point[0]), float(point[1])))
+        except (TypeError, ValueError, IndexError):
+            continue
+    return points
+
+
+def point_in_polygon(point, polygon):
+    """Ray-casting test for whether a (lat, lng) point lies inside a polygon."""
+    if len(polygon) < 3:
+        return False
+    lat, lng = point
+    inside = False
+    j = len(polygon) - 1
+    for i in range(len(polygon)):
+        lat_i, lng_i = polygon[i]
+        lat_j, lng_j = polygon[j]
+        if (lng_i > lng) != (lng_j > lng):
+            crossing = (lat_j - lat_i) * (lng - lng_i) / (lng_j - lng_i) + lat_i
+            if lat < crossing:
+                inside = not inside
+        j = i
+    return inside
+
+
+def centroid(points):
+    """Average of a list of (lat, lng) points, or None for an empty list."""
+    if not points:
+        return None
+    return (
+        sum(p[0] for p in points) / len(points),
+        sum(p[1] for p in points) / len(points),
+    )
+
+
+def haversine_km(a, b):
+    """Great-circle distance in kilometres between two (lat, lng) points."""
+    lat1, lng1 = map(math.radians, a)
+    lat2, lng2 = map(math.radians, b)
+    h = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(h))
+
+
+def locate_zone(point, zones):
+    """
+    Return the id of the first zone whose polygon contains ``point``.
+
+    ``zones`` is an iterable of (zone_id, polygon) pairs, checked in order.
+    """
+    if point is None:
+        return None
+    for zone_id, polygon in zones:
+        if point_in_polygon(point, polygon):
+            return zone_id
+    return None